@@ -0,0 +1,331 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+from urllib.parse import quote
+
+SERVER_START_TIMEOUT = 10  # Seconds to wait for the server to accept connections
+
+
+async def send_requests(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    host: str,
+    targets: list[str],
+) -> int:
+    """
+    Pipeline a batch of GET requests on one keep-alive connection.
+
+    All requests are written at once and the responses are read back in order.
+
+    Args:
+        reader (asyncio.StreamReader): The connection's stream reader.
+        writer (asyncio.StreamWriter): The connection's stream writer.
+        host (str): The value for the Host header.
+        targets (list[str]): Request targets (path with query string).
+
+    Returns:
+        int: The number of responses with a 2xx status code.
+    """
+    writer.write(
+        b"".join(
+            f"GET {target} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode("latin-1")
+            for target in targets
+        )
+    )
+    await writer.drain()
+
+    ok = 0
+    for _ in targets:
+        head = await reader.readuntil(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        length = 0
+        for line in lines[1:]:
+            key, _, value = line.partition(":")
+            if key.strip().lower() == "content-length":
+                length = int(value.strip())
+        await reader.readexactly(length)
+        if lines[0].split(" ")[1].startswith("2"):
+            ok += 1
+    return ok
+
+
+async def worker(
+    host: str, port: int, targets: list[str], depth: int, deadline: float
+) -> tuple[int, int]:
+    """
+    Keep one connection busy with pipelined requests until the deadline.
+
+    Args:
+        host (str): The server host.
+        port (int): The server port.
+        targets (list[str]): Request targets to pick from at random.
+        depth (int): Number of requests pipelined per batch.
+        deadline (float): `time.perf_counter()` value at which to stop.
+
+    Returns:
+        tuple[int, int]: Total and successful request counts.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    total = ok = 0
+    try:
+        while time.perf_counter() < deadline:
+            batch = [random.choice(targets) for _ in range(depth)]
+            ok += await send_requests(reader, writer, host, batch)
+            total += len(batch)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+    return total, ok
+
+
+async def request_json(host: str, port: int, method: str, path: str, payload=None):
+    """
+    Send a single request on a fresh connection and decode the JSON response.
+
+    Args:
+        host (str): The server host.
+        port (int): The server port.
+        method (str): The HTTP method.
+        path (str): The request target.
+        payload (optional): A JSON-serializable request body.
+
+    Returns:
+        tuple[int, object]: The status code and the decoded body (None if empty).
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+    writer.write(
+        (
+            f"{method} {path} HTTP/1.1\r\nHost: {host}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+            f"Connection: close\r\n\r\n"
+        ).encode("latin-1")
+        + body
+    )
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, data = raw.partition(b"\r\n\r\n")
+    status = int(head.split(b" ")[1])
+    return status, json.loads(data) if data else None
+
+
+async def seed_contacts(
+    host: str, port: int, count: int
+) -> tuple[list[dict], list[str]]:
+    """
+    Create synthetic contacts through the API so lookups have something to hit.
+
+    Args:
+        host (str): The server host.
+        port (int): The server port.
+        count (int): Number of contacts to create.
+
+    Returns:
+        tuple[list[dict], list[str]]: The contacts created (or already present)
+                                      on the server, and the names of the ones
+                                      this run created.
+    """
+    contacts, created = [], []
+    for i in range(count):
+        contact = {
+            "name": f"Loadtest User{i}",
+            "phones": [f"067{i:07d}"],
+            "emails": [f"user{i}@example.com"],
+        }
+        status, _ = await request_json(host, port, "POST", "/contacts", contact)
+        if status in (201, 409):
+            contacts.append(contact)
+        if status == 201:
+            created.append(contact["name"])
+    return contacts, created
+
+
+async def remove_contacts(host: str, port: int, names: list[str]) -> None:
+    """
+    Delete contacts through the API, e.g. the ones `seed_contacts` created.
+
+    Args:
+        host (str): The server host.
+        port (int): The server port.
+        names (list[str]): The names of the contacts to delete.
+    """
+    for name in names:
+        await request_json(host, port, "DELETE", f"/contacts/{quote(name)}")
+
+
+async def wait_for_server(host: str, port: int, timeout: float) -> None:
+    """
+    Wait until the server accepts connections.
+
+    Args:
+        host (str): The server host.
+        port (int): The server port.
+        timeout (float): Seconds to wait.
+
+    Raises:
+        ConnectionError: If the server doesn't accept connections in time.
+    """
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise ConnectionError(f"No API server on {host}:{port}")
+            await asyncio.sleep(0.1)
+            continue
+        writer.close()
+        await writer.wait_closed()
+        return
+
+
+@contextmanager
+def throwaway_server(host: str, port: int) -> Iterator[None]:
+    """
+    Run an API server on an empty temporary data directory.
+
+    The seeded contacts are saved there, never to the user's data files, and
+    the directory is removed when the server stops.
+
+    Args:
+        host (str): The interface to bind to.
+        port (int): The TCP port to listen on.
+
+    Yields:
+        None
+    """
+    with tempfile.TemporaryDirectory() as data_dir:
+        server = subprocess.Popen(
+            [sys.executable, "-m", "api.server", "--host", host, "--port", str(port)],
+            cwd=Path(__file__).parent.parent,
+            env={**os.environ, "CLIPYBOT_DATA_DIR": data_dir},
+            stdout=subprocess.DEVNULL,
+        )
+        try:
+            yield
+        finally:
+            server.terminate()
+            server.wait()
+
+
+async def run_scenario(
+    name: str,
+    host: str,
+    port: int,
+    targets: list[str],
+    connections: int,
+    depth: int,
+    duration: float,
+) -> None:
+    """
+    Run one load scenario and print its throughput.
+
+    Args:
+        name (str): Scenario name shown in the report.
+        host (str): The server host.
+        port (int): The server port.
+        targets (list[str]): Request targets to pick from at random.
+        connections (int): Number of concurrent keep-alive connections.
+        depth (int): Number of requests pipelined per batch.
+        duration (float): Scenario duration in seconds.
+    """
+    start = time.perf_counter()
+    deadline = start + duration
+    results = await asyncio.gather(
+        *(worker(host, port, targets, depth, deadline) for _ in range(connections))
+    )
+    elapsed = time.perf_counter() - start
+    total = sum(t for t, _ in results)
+    ok = sum(o for _, o in results)
+    print(
+        f"{name:<16} {total:>9} requests  {ok:>9} ok  "
+        f"{total / elapsed:>10.0f} req/s  ({connections} conns, depth {depth})"
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    """
+    Seed the server and run the lookup-by-name and lookup-by-phone scenarios.
+
+    The contacts seeded into a running server (`--external`) are deleted
+    again at the end.
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments.
+    """
+    await wait_for_server(args.host, args.port, SERVER_START_TIMEOUT)
+    contacts, created = await seed_contacts(args.host, args.port, args.seed)
+    try:
+        await run_scenarios(args, contacts)
+    finally:
+        if args.external:
+            await remove_contacts(args.host, args.port, created)
+
+
+async def run_scenarios(args: argparse.Namespace, contacts: list[dict]) -> None:
+    """
+    Run the lookup-by-name and lookup-by-phone scenarios.
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments.
+        contacts (list[dict]): The contacts on the server to look up.
+    """
+    if not contacts:
+        print("No contacts available for the load test.")
+        return
+
+    by_name = [f"/contacts?name={quote(c['name'])}" for c in contacts]
+    by_phone = [f"/contacts?phone={c['phones'][0][-7:]}" for c in contacts]
+
+    for name, targets in (("lookup by name", by_name), ("lookup by phone", by_phone)):
+        await run_scenario(
+            name,
+            args.host,
+            args.port,
+            targets,
+            args.connections,
+            args.depth,
+            args.duration,
+        )
+
+
+def main() -> None:
+    """
+    Parse command line arguments and run the load test.
+
+    By default the test starts its own server on a temporary data directory;
+    with `--external` it runs against a server that is already running.
+    """
+    parser = argparse.ArgumentParser(description="Load test for the CliPyBot API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--seed", type=int, default=200, help="contacts to create")
+    parser.add_argument("--connections", type=int, default=10)
+    parser.add_argument("--depth", type=int, default=8, help="pipelined requests")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds")
+    parser.add_argument(
+        "--external",
+        action="store_true",
+        help="test a server that is already running instead of starting one; "
+        "the seeded contacts are deleted at the end",
+    )
+    args = parser.parse_args()
+    if args.external:
+        asyncio.run(run(args))
+        return
+    with throwaway_server(args.host, args.port):
+        asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,704 @@
+import argparse
+import asyncio
+import copy
+import json
+from datetime import datetime as dtdt
+from urllib.parse import urlsplit, parse_qs, unquote
+
+from data.state import book, notes, wait_for_data
+from decorators.decorators import raise_errors
+from helpers.export import contact_to_dict, note_to_dict
+from helpers.helpers import save_contacts, save_notes
+from helpers.paging import take_page
+from helpers.validators import (
+    validate_and_normalize_phone,
+    validate_email_str,
+    standardize_name,
+)
+from models.contact import Record, RecordExistsError
+from models.note import Note
+
+MAX_HEADER_SIZE = 16 * 1024  # Upper bound for the request line plus headers
+MAX_BODY_SIZE = 1024 * 1024  # Upper bound for JSON request bodies
+KEEP_ALIVE_TIMEOUT = 15  # Seconds an idle keep-alive connection is kept open
+SORT_KEYS = {
+    "name": lambda record: record.name.value.casefold(),
+    "title": lambda note: note.title.value.casefold(),
+}
+
+REASONS = {
+    200: "OK",
+    201: "Created",
+    204: "No Content",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    501: "Not Implemented",
+}
+
+
+class HttpError(Exception):
+    """
+    Exception carrying an HTTP status code and an error message for the client.
+    """
+
+    def __init__(self, status: int, message: str) -> None:
+        """
+        Initialize an HttpError object.
+
+        Args:
+            status (int): The HTTP status code to respond with.
+            message (str): The error message returned in the JSON body.
+        """
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Request:
+    """
+    Class representing a parsed HTTP/1.1 request.
+    """
+
+    def __init__(self, method: str, target: str, version: str, headers: dict) -> None:
+        """
+        Initialize a Request object.
+
+        Args:
+            method (str): The HTTP method (GET, POST, PUT, DELETE).
+            target (str): The raw request target (path with query string).
+            version (str): The HTTP version string, e.g. "HTTP/1.1".
+            headers (dict): Request headers with lower-cased names.
+        """
+        url = urlsplit(target)
+        self.method = method
+        self.path = [unquote(part) for part in url.path.split("/") if part]
+        self.query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        self.version = version
+        self.headers = headers
+        self.body = b""
+
+    @property
+    def keep_alive(self) -> bool:
+        """
+        Check whether the connection should stay open after this request.
+
+        Returns:
+            bool: True for HTTP/1.1 unless "Connection: close" was sent,
+                  or for HTTP/1.0 with an explicit "Connection: keep-alive".
+        """
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+    def json(self) -> dict:
+        """
+        Decode the request body as a JSON object.
+
+        Returns:
+            dict: The decoded JSON object.
+
+        Raises:
+            HttpError: If the body is not a valid JSON object.
+        """
+        try:
+            payload = json.loads(self.body or b"{}")
+        except ValueError:
+            raise HttpError(400, "Request body must be valid JSON")
+        if not isinstance(payload, dict):
+            raise HttpError(400, "Request body must be a JSON object")
+        return payload
+
+
+# ===============
+# === HELPERS ===
+# ===============
+
+
+def validate_contact_fields(payload: dict) -> dict:
+    """
+    Validate contact fields from a request body with the shared validators.
+
+    Only the keys present in the payload are validated and returned, so the
+    same function serves both creation and partial updates.
+
+    Args:
+        payload (dict): The decoded request body.
+
+    Returns:
+        dict: The validated fields (phones and emails normalized).
+
+    Raises:
+        HttpError: If any field is invalid.
+    """
+    fields = {}
+    if "phones" in payload:
+        phones = payload["phones"] or []
+        if not isinstance(phones, list):
+            raise HttpError(400, "phones must be a list")
+        for phone in phones:
+            if not validate_and_normalize_phone(str(phone)):
+                raise HttpError(400, f"Invalid phone number: {phone}")
+        fields["phones"] = [str(phone) for phone in phones]
+    if "emails" in payload:
+        emails = payload["emails"] or []
+        if not isinstance(emails, list):
+            raise HttpError(400, "emails must be a list")
+        for email in emails:
+            if not validate_email_str(str(email)):
+                raise HttpError(400, f"Invalid email format: {email}")
+        fields["emails"] = [str(email) for email in emails]
+    if "birthday" in payload:
+        birthday = payload["birthday"]
+        if birthday:
+            try:
+                dtdt.strptime(str(birthday), "%d.%m.%Y")
+            except ValueError:
+                raise HttpError(400, "Invalid date format. Use DD.MM.YYYY")
+        fields["birthday"] = birthday or None
+    if "address" in payload:
+        fields["address"] = payload["address"] or None
+    return fields
+
+
+def apply_contact_fields(record: Record, fields: dict) -> None:
+    """
+    Apply validated contact fields to a record, replacing existing values.
+
+    Args:
+        record (Record): The record to update.
+        fields (dict): Fields returned by `validate_contact_fields`.
+    """
+    if "phones" in fields:
+        record.phones = []
+        for phone in fields["phones"]:
+            record.add_phone(phone)
+    if "emails" in fields:
+        record.emails = []
+        for email in fields["emails"]:
+            record.add_email(email)
+    if "birthday" in fields:
+        if fields["birthday"]:
+            record.add_birthday(fields["birthday"])
+        else:
+            record.birthday = None
+    if "address" in fields:
+        if fields["address"]:
+            record.add_address(fields["address"])
+        else:
+            record.address = None
+
+
+def validate_note_fields(payload: dict) -> dict:
+    """
+    Validate note fields from a request body using the limits enforced by `Note`.
+
+    Args:
+        payload (dict): The decoded request body.
+
+    Returns:
+        dict: The validated fields.
+
+    Raises:
+        HttpError: If any field is invalid.
+    """
+    fields = {}
+    if "content" in payload:
+        content = payload["content"] or ""
+        if len(content) > 20000:
+            raise HttpError(400, "Content length should not exceed 20000 characters.")
+        fields["content"] = content
+    if "tags" in payload:
+        tags = payload["tags"] or []
+        if not isinstance(tags, list):
+            raise HttpError(400, "tags must be a list")
+        if len(tags) > 10 or any(len(str(tag)) > 25 for tag in tags):
+            raise HttpError(
+                400, "Maximum tags limit exceeded or tag length is invalid."
+            )
+        fields["tags"] = [str(tag) for tag in tags if str(tag).strip()]
+    return fields
+
+
+def apply_note_fields(note: Note, fields: dict) -> None:
+    """
+    Apply validated note fields to a note, replacing existing values.
+
+    Args:
+        note (Note): The note to update.
+        fields (dict): Fields returned by `validate_note_fields`.
+    """
+    if "content" in fields:
+        note.add_content(fields["content"])
+    if "tags" in fields:
+        note.clear_tags()
+        for tag in fields["tags"]:
+            note.add_tag(tag)
+
+
+def commit_note(note: Note, previous: Note | None) -> None:
+    """
+    Store a new or edited note and save the notes.
+
+    Edits are made on a copy of the note, so like a contact transaction
+    nothing is visible until the note is stored, and a failed save restores
+    the previous version.
+
+    Args:
+        note (Note): The note to store.
+        previous (Note or None): The version it replaces, or None for a new note.
+
+    Raises:
+        HttpError: 409 if a new note's title was taken by another request meanwhile.
+    """
+    with notes.write_lock():
+        if previous is None and notes.find_note(note.title.value):
+            raise HttpError(409, f'Note "{note.title.value}" already exists')
+        notes.add_note(note)
+    try:
+        save_notes(notes)
+    except Exception:
+        if previous is None:
+            notes.delete_note(note.title.value)
+        else:
+            notes.add_note(previous)
+        raise
+
+
+def page_params(request: Request, sort_field: str) -> dict:
+    """
+    Read the paging parameters of a list or search request.
+
+    `?limit=<n>&offset=<n>` selects a page; `?sort=<field>` orders the results
+    before paging (only by the name of contacts or the title of notes).
+
+    Args:
+        request (Request): The parsed request.
+        sort_field (str): The field results can be sorted by, "name" or "title".
+
+    Returns:
+        dict: The `limit`, `offset` and `sort_key` arguments of a search.
+
+    Raises:
+        HttpError: 400 if a parameter is invalid.
+    """
+    try:
+        limit = int(request.query["limit"]) if "limit" in request.query else None
+        offset = int(request.query.get("offset", 0))
+    except ValueError:
+        raise HttpError(400, "limit and offset must be integers")
+    if (limit is not None and limit < 0) or offset < 0:
+        raise HttpError(400, "limit and offset must not be negative")
+    sort = request.query.get("sort")
+    if sort not in (None, sort_field):
+        raise HttpError(400, f"Results can only be sorted by {sort_field}")
+    return {"limit": limit, "offset": offset, "sort_key": SORT_KEYS.get(sort)}
+
+
+def get_contact_or_404(name: str) -> Record:
+    """
+    Look up a contact by name, standardizing it the same way `Name` does.
+
+    Args:
+        name (str): The contact name from the URL.
+
+    Returns:
+        Record: The matching record.
+
+    Raises:
+        HttpError: If the contact does not exist.
+    """
+    record = book.find_by_name(standardize_name(name) or name)
+    if record is None:
+        raise HttpError(404, f'Contact "{name}" not found')
+    return record
+
+
+def get_note_or_404(title: str) -> Note:
+    """
+    Look up a note by title.
+
+    Args:
+        title (str): The note title from the URL.
+
+    Returns:
+        Note: The matching note.
+
+    Raises:
+        HttpError: If the note does not exist.
+    """
+    note = notes.find_note(title)
+    if not note:
+        raise HttpError(404, f'Note "{title}" not found')
+    return note
+
+
+# ================
+# === CONTACTS ===
+# ================
+
+
+def handle_contacts(request: Request) -> tuple[int, object]:
+    """
+    Handle requests to /contacts and /contacts/<name>.
+
+    Supported operations:
+        GET    /contacts                 list all contacts
+        GET    /contacts?<field>=<query> search by name, phone, email, birthday or address
+                                         (both take limit, offset and sort=name)
+        GET    /contacts/<name>          show a single contact
+        POST   /contacts                 create a contact
+        PUT    /contacts/<name>          replace the given fields of a contact
+        DELETE /contacts/<name>          delete a contact
+
+    Args:
+        request (Request): The parsed request.
+
+    Returns:
+        tuple[int, object]: The status code and the JSON-serializable payload.
+    """
+    if len(request.path) == 1:
+        if request.method == "GET":
+            page = page_params(request, "name")
+            for field in ("name", "phone", "email", "birthday", "address"):
+                if field in request.query:
+                    records = book.find(
+                        request.query[field], **{f"by_{field}": True}, **page
+                    )
+                    return 200, [contact_to_dict(record) for record in records or []]
+            records = take_page(book.snapshot(), **page)
+            return 200, [contact_to_dict(record) for record in records]
+
+        if request.method == "POST":
+            payload = request.json()
+            name = standardize_name(str(payload.get("name", "")))
+            if not name:
+                raise HttpError(400, "Invalid name format")
+            if book.find_by_name(name):
+                raise HttpError(409, f'Contact "{name}" already exists')
+            fields = validate_contact_fields(payload)
+            try:
+                with book.transaction(persist=save_contacts) as tx:
+                    record = tx.record(name)
+                    apply_contact_fields(record, fields)
+            except RecordExistsError:  # created by another request meanwhile
+                raise HttpError(409, f'Contact "{name}" already exists')
+            return 201, contact_to_dict(record)
+
+        raise HttpError(405, f"Method {request.method} not allowed")
+
+    if len(request.path) == 2:
+        record = get_contact_or_404(request.path[1])
+
+        if request.method == "GET":
+            return 200, contact_to_dict(record)
+
+        if request.method == "PUT":
+            fields = validate_contact_fields(request.json())
+            with book.transaction(persist=save_contacts) as tx:
+                record = tx.record(record.name.value)
+                apply_contact_fields(record, fields)
+            return 200, contact_to_dict(record)
+
+        if request.method == "DELETE":
+            with book.transaction(persist=save_contacts) as tx:
+                tx.delete(record.name.value)
+            return 204, None
+
+        raise HttpError(405, f"Method {request.method} not allowed")
+
+    raise HttpError(404, "Not found")
+
+
+# =============
+# === NOTES ===
+# =============
+
+
+def handle_notes(request: Request) -> tuple[int, object]:
+    """
+    Handle requests to /notes and /notes/<title>.
+
+    Supported operations:
+        GET    /notes                  list all notes
+        GET    /notes?<field>=<query>  search by title, content or tag
+                                       (both take limit, offset and sort=title)
+        GET    /notes/<title>          show a single note
+        POST   /notes                  create a note
+        PUT    /notes/<title>          replace the given fields of a note
+        DELETE /notes/<title>          delete a note
+
+    Args:
+        request (Request): The parsed request.
+
+    Returns:
+        tuple[int, object]: The status code and the JSON-serializable payload.
+    """
+    if len(request.path) == 1:
+        if request.method == "GET":
+            page = page_params(request, "title")
+            for field in ("title", "content", "tag"):
+                if field in request.query:
+                    found = notes.search(
+                        request.query[field], **{f"by_{field}": True}, **page
+                    )
+                    return 200, [note_to_dict(note) for note in found or []]
+            found = take_page(notes.snapshot(), **page)
+            return 200, [note_to_dict(note) for note in found]
+
+        if request.method == "POST":
+            payload = request.json()
+            title = str(payload.get("title", "")).strip()
+            if not title or len(title) > 1000:
+                raise HttpError(400, "Title is required and must be under 1000 characters")
+            if notes.find_note(title):
+                raise HttpError(409, f'Note "{title}" already exists')
+            fields = validate_note_fields(payload)
+            note = Note(title)
+            apply_note_fields(note, fields)
+            commit_note(note, None)
+            return 201, note_to_dict(note)
+
+        raise HttpError(405, f"Method {request.method} not allowed")
+
+    if len(request.path) == 2:
+        note = get_note_or_404(request.path[1])
+
+        if request.method == "GET":
+            return 200, note_to_dict(note)
+
+        if request.method == "PUT":
+            fields = validate_note_fields(request.json())
+            edited = copy.deepcopy(note)
+            apply_note_fields(edited, fields)
+            commit_note(edited, note)
+            return 200, note_to_dict(edited)
+
+        if request.method == "DELETE":
+            notes.delete_note(note.title.value)
+            save_notes(notes)
+            return 204, None
+
+        raise HttpError(405, f"Method {request.method} not allowed")
+
+    raise HttpError(404, "Not found")
+
+
+ROUTES = {
+    "contacts": handle_contacts,
+    "notes": handle_notes,
+}
+
+
+def dispatch(request: Request) -> tuple[int, object]:
+    """
+    Route a request to its handler and convert errors to JSON responses.
+
+    The handlers run inside `raise_errors()`, so a model method that fails
+    raises instead of typing its error out on the server console; a
+    ValueError is reported as a 400.
+
+    Args:
+        request (Request): The parsed request.
+
+    Returns:
+        tuple[int, object]: The status code and the JSON-serializable payload.
+    """
+    try:
+        if not request.path or request.path[0] not in ROUTES:
+            raise HttpError(404, "Not found")
+        with raise_errors():
+            return ROUTES[request.path[0]](request)
+    except HttpError as e:
+        return e.status, {"error": e.message}
+    except ValueError as e:
+        return 400, {"error": str(e)}
+    except Exception as e:
+        return 500, {"error": str(e)}
+
+
+# ==============
+# === SERVER ===
+# ==============
+
+
+async def read_request(reader: asyncio.StreamReader) -> Request | None:
+    """
+    Read one HTTP/1.1 request (headers and body) from the stream.
+
+    Args:
+        reader (asyncio.StreamReader): The connection's stream reader.
+
+    Returns:
+        Request | None: The parsed request, or None if the client closed the connection.
+
+    Raises:
+        HttpError: If the request is malformed or too large.
+    """
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as e:
+        if not e.partial.strip():
+            return None
+        raise HttpError(400, "Incomplete request")
+    except asyncio.LimitOverrunError:
+        raise HttpError(413, "Request headers too large")
+
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, version = lines[0].split(" ")
+    except ValueError:
+        raise HttpError(400, "Malformed request line")
+
+    headers = {}
+    for line in lines[1:]:
+        if not line:
+            continue
+        key, _, value = line.partition(":")
+        headers[key.strip().lower()] = value.strip()
+
+    request = Request(method.upper(), target, version, headers)
+
+    # A chunked body would otherwise be parsed as the next request
+    if "transfer-encoding" in headers:
+        raise HttpError(
+            501, "Transfer-Encoding is not supported, send a Content-Length"
+        )
+    length = headers.get("content-length") or "0"
+    if not (length.isascii() and length.isdigit()):
+        raise HttpError(400, "Invalid Content-Length")
+    length = int(length)
+    if length > MAX_BODY_SIZE:
+        raise HttpError(413, "Request body too large")
+    if length:
+        request.body = await reader.readexactly(length)
+    return request
+
+
+def build_response(status: int, payload: object, keep_alive: bool) -> bytes:
+    """
+    Serialize a status code and payload to a complete HTTP/1.1 response.
+
+    Args:
+        status (int): The HTTP status code.
+        payload (object): The JSON-serializable payload, or None for an empty body.
+        keep_alive (bool): Whether to keep the connection open.
+
+    Returns:
+        bytes: The raw response bytes.
+    """
+    body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        f"\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+async def handle_connection(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    limit: asyncio.Semaphore,
+) -> None:
+    """
+    Serve requests on one connection until the client closes it or goes idle.
+
+    Requests are read and answered strictly in order, so pipelined requests
+    get their responses in the order they were sent. Responses are only
+    flushed with `drain()`, which lets several pipelined responses share one
+    write when the client is sending faster than we reply. Requests are
+    dispatched in the default executor: searches and saves (a full pickle of
+    the book) would otherwise block the event loop and every other
+    connection with it.
+
+    Args:
+        reader (asyncio.StreamReader): The connection's stream reader.
+        writer (asyncio.StreamWriter): The connection's stream writer.
+        limit (asyncio.Semaphore): Bounds the number of connections served at once.
+    """
+    loop = asyncio.get_running_loop()
+    async with limit:
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(
+                        read_request(reader), KEEP_ALIVE_TIMEOUT
+                    )
+                except HttpError as e:
+                    writer.write(build_response(e.status, {"error": e.message}, False))
+                    break
+                if request is None:
+                    break
+
+                status, payload = await loop.run_in_executor(
+                    None, dispatch, request
+                )
+                keep_alive = request.keep_alive
+                writer.write(build_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            try:
+                await writer.drain()
+                writer.close()
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+
+async def serve(host: str, port: int, max_connections: int) -> None:
+    """
+    Start the HTTP/JSON API server and run it forever.
+
+    Args:
+        host (str): The interface to bind to.
+        port (int): The TCP port to listen on.
+        max_connections (int): The maximum number of connections served concurrently;
+                               further clients wait in the accept queue.
+    """
+    limit = asyncio.Semaphore(max_connections)
+    server = await asyncio.start_server(
+        lambda r, w: handle_connection(r, w, limit),
+        host,
+        port,
+        limit=MAX_HEADER_SIZE,
+    )
+    address = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+    print(f"Serving CliPyBot API on {address}")
+    async with server:
+        await server.serve_forever()
+
+
+def main() -> None:
+    """
+    Parse command line arguments and run the API server.
+    """
+    parser = argparse.ArgumentParser(description="CliPyBot HTTP/JSON API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument(
+        "--max-connections",
+        type=int,
+        default=100,
+        help="maximum number of connections served concurrently",
+    )
+    args = parser.parse_args()
+    wait_for_data()
+    try:
+        asyncio.run(serve(args.host, args.port, args.max_connections))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import random
+import datetime as dt
+
+from models.contact import AddressBook, Record
+from models.note import NotesBook, Note
+
+FIRST_NAMES = (
+    "Ivan Olena Petro Oksana Andrii Iryna Taras Nataliia Dmytro Kateryna Serhii "
+    "Yuliia Oleksandr Viktoriia Mykola Sofiia Bohdan Anastasiia Yurii Mariia "
+    "Maksym Daryna Volodymyr Khrystyna Roman Alina Vasyl Tetiana Artem Halyna"
+).split()
+LAST_NAMES = (
+    "Petrenko Kovalenko Bondarenko Tkachenko Shevchenko Kravchenko Oliinyk "
+    "Shevchuk Koval Polishchuk Bondar Tkachuk Moroz Marchenko Lysenko Rudenko "
+    "Savchenko Melnyk Boiko Kovalchuk Sorochynskyi Matiushko Badun Bolma "
+    "Hnatiuk Kuzmenko Pavlenko"
+).split()
+OPERATOR_CODES = "50 63 66 67 68 73 91 93 95 96 97 98 99".split()
+EMAIL_DOMAINS = "gmail.com ukr.net example.com i.ua outlook.com meta.ua".split()
+CITIES = "Kyiv Lviv Odesa Kharkiv Dnipro Zaporizhzhia Vinnytsia Poltava".split()
+STREETS = "Khreshchatyk Shevchenka Franka Sadova Naukova Hrushevskoho Bandery".split()
+WORDS = (
+    "project meeting call budget report review deadline release contract invoice "
+    "client design draft plan idea todo follow up update sprint retro backlog "
+    "bug fix feature deploy server database migration test benchmark latency "
+    "birthday gift travel ticket hotel family doctor appointment recipe book "
+    "movie music course lecture homework exam payment subscription renewal"
+).split()
+
+
+def generate_record(rng: random.Random, index: int) -> Record:
+    """
+    Build one realistic contact record through the model's validating methods.
+
+    Args:
+        rng (random.Random): The random generator to draw values from.
+        index (int): Sequence number used to keep names unique.
+
+    Returns:
+        Record: The generated contact.
+    """
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    record = Record(f"{first} {last} {index}")
+
+    for _ in range(rng.choice((1, 1, 1, 2, 2, 3))):
+        record.add_phone(f"0{rng.choice(OPERATOR_CODES)}{rng.randrange(10**7):07d}")
+
+    for _ in range(rng.choice((0, 1, 1, 1, 2))):
+        domain = rng.choice(EMAIL_DOMAINS)
+        record.add_email(f"{first.lower()}.{last.lower()}{index}@{domain}")
+
+    if rng.random() < 0.8:
+        birthday = dt.date(1950, 1, 1) + dt.timedelta(days=rng.randrange(365 * 55))
+        record.add_birthday(birthday.strftime("%d.%m.%Y"))
+
+    if rng.random() < 0.7:
+        record.add_address(
+            f"{rng.choice(CITIES)}, {rng.choice(STREETS)} {rng.randrange(1, 200)}, "
+            f"{rng.randrange(1000, 99999):05d}"
+        )
+    return record
+
+
+def generate_note(
+    rng: random.Random, index: int, content_words: int, max_tags: int
+) -> Note:
+    """
+    Build one note with long content and many tags through the model's methods.
+
+    Args:
+        rng (random.Random): The random generator to draw values from.
+        index (int): Sequence number used to keep titles unique.
+        content_words (int): Approximate number of words of content.
+        max_tags (int): Maximum number of tags (the model allows at most 10).
+
+    Returns:
+        Note: The generated note.
+    """
+    note = Note(f"{rng.choice(WORDS).capitalize()} {rng.choice(WORDS)} {index}")
+    words = rng.randint(content_words // 2, content_words)
+    content = " ".join(rng.choice(WORDS) for _ in range(words))
+    note.add_content(content[:20000])
+    for tag in rng.sample(WORDS, rng.randint(1, min(max_tags, 10))):
+        note.add_tag(tag)
+    return note
+
+
+def generate_address_book(size: int, seed: int = 42) -> AddressBook:
+    """
+    Generate an address book with `size` synthetic contacts.
+
+    Args:
+        size (int): Number of contacts.
+        seed (int, optional): Random seed, so runs are reproducible. Defaults to 42.
+
+    Returns:
+        AddressBook: The generated address book.
+    """
+    rng = random.Random(seed)
+    book = AddressBook()
+    for index in range(size):
+        book.add_record(generate_record(rng, index))
+    return book
+
+
+def generate_notes_book(
+    size: int, seed: int = 42, content_words: int = 400, max_tags: int = 10
+) -> NotesBook:
+    """
+    Generate a notes book with `size` synthetic notes.
+
+    Args:
+        size (int): Number of notes.
+        seed (int, optional): Random seed, so runs are reproducible. Defaults to 42.
+        content_words (int, optional): Approximate words of content per note. Defaults to 400.
+        max_tags (int, optional): Maximum tags per note. Defaults to 10.
+
+    Returns:
+        NotesBook: The generated notes book.
+    """
+    rng = random.Random(seed)
+    notes = NotesBook()
+    for index in range(size):
+        notes.add_note(generate_note(rng, index, content_words, max_tags))
+    return notes
@@ -0,0 +1,203 @@
+import argparse
+import json
+import platform
+import statistics
+import tempfile
+import time
+from datetime import datetime as dtdt
+from pathlib import Path
+
+from benchmarks.generator import generate_address_book, generate_notes_book
+from helpers import data_helper
+from helpers.export import write_contacts_csv, write_notes_csv
+from helpers.helpers import load_contacts, save_contacts, load_notes, save_notes
+
+SIZES = {
+    "small": 1_000,
+    "medium": 10_000,
+    "large": 100_000,
+    "huge": 1_000_000,
+}
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def measure(func, repeat: int) -> dict:
+    """
+    Time a function several times.
+
+    Args:
+        func (function): A callable without arguments.
+        repeat (int): Number of timed runs.
+
+    Returns:
+        dict: Minimum, median and maximum run time in seconds, and the number of runs.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "max": max(timings),
+        "runs": repeat,
+    }
+
+
+def run_benchmarks(contacts: int, notes_count: int, repeat: int, seed: int) -> dict:
+    """
+    Generate the datasets and time storage, search and export operations.
+
+    Args:
+        contacts (int): Number of contacts to generate.
+        notes_count (int): Number of notes to generate.
+        repeat (int): Number of timed runs per operation.
+        seed (int): Random seed for the data generator.
+
+    Returns:
+        dict: Benchmark results keyed by operation name.
+    """
+    results = {}
+
+    start = time.perf_counter()
+    book = generate_address_book(contacts, seed)
+    notes = generate_notes_book(notes_count, seed)
+    print(f"Generated data in {time.perf_counter() - start:.1f}s")
+
+    # Pick queries that exist in the data so searches return results
+    sample = book.snapshot()[len(book.snapshot()) // 2]
+    name_query = sample.name.value.split()[1]
+    phone_query = sample.phones[0].value[-7:]
+    email_query = sample.emails[0].value.split("@")[1] if sample.emails else "gmail"
+    birthday_query = sample.birthday.value[-4:] if sample.birthday else "1990"
+    address_query = "Kyiv"
+    note_sample = notes.snapshot()[len(notes.snapshot()) // 2]
+    title_query = note_sample.title.value.split()[0]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Redirect load_contacts/save_contacts to a scratch directory
+        data_helper.DATA_DIR = Path(tmp)
+
+        results["save_contacts"] = measure(lambda: save_contacts(book), repeat)
+        results["load_contacts"] = measure(load_contacts, repeat)
+        results["save_notes"] = measure(lambda: save_notes(notes), repeat)
+        results["load_notes"] = measure(load_notes, repeat)
+        results["contacts_pickle_bytes"] = (Path(tmp) / "contacts.pkl").stat().st_size
+
+        csv_path = Path(tmp) / "contacts.csv"
+        results["export_contacts_csv"] = measure(
+            lambda: write_contacts_csv(book.snapshot(), csv_path), repeat
+        )
+        notes_csv_path = Path(tmp) / "notes.csv"
+        results["export_notes_csv"] = measure(
+            lambda: write_notes_csv(notes.snapshot(), notes_csv_path), repeat
+        )
+
+    for field, query in (
+        ("name", name_query),
+        ("phone", phone_query),
+        ("email", email_query),
+        ("birthday", birthday_query),
+        ("address", address_query),
+    ):
+        results[f"find_by_{field}"] = measure(
+            lambda: book.find(query, **{f"by_{field}": True}), repeat
+        )
+
+    for days in (7, 30):
+        results[f"birthdays_in_{days}_days"] = measure(
+            lambda: book.get_birthday_in_days(days), repeat
+        )
+
+    for field, query in (
+        ("title", title_query),
+        ("content", "deadline"),
+        ("tag", "#budget"),
+    ):
+        results[f"notes_search_by_{field}"] = measure(
+            lambda: notes.search(query, **{f"by_{field}": True}), repeat
+        )
+
+    return results
+
+
+def compare(current: dict, baseline_path: Path) -> None:
+    """
+    Print the change of each operation's median time relative to a previous run.
+
+    Args:
+        current (dict): The results of this run.
+        baseline_path (Path): Path to a JSON file written by an earlier run.
+    """
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))["results"]
+    print(f"\nCompared to {baseline_path}:")
+    print(f"{'operation':<26} {'before':>12} {'after':>12} {'change':>9}")
+    for name, result in current.items():
+        before = baseline.get(name)
+        if not isinstance(result, dict) or not isinstance(before, dict):
+            continue
+        ratio = result["median"] / before["median"] if before["median"] else 0
+        print(
+            f"{name:<26} {before['median'] * 1000:>10.2f}ms "
+            f"{result['median'] * 1000:>10.2f}ms {ratio:>8.2f}x"
+        )
+
+
+def main() -> None:
+    """
+    Parse command line arguments, run the benchmarks and write a JSON report.
+    """
+    parser = argparse.ArgumentParser(description="CliPyBot benchmarks")
+    parser.add_argument(
+        "--size",
+        choices=SIZES,
+        default="small",
+        help="preset number of contacts and notes (1k, 10k, 100k or 1M)",
+    )
+    parser.add_argument("--contacts", type=int, help="number of contacts")
+    parser.add_argument("--notes", type=int, help="number of notes")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per operation")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, help="path of the JSON report")
+    parser.add_argument("--compare", type=Path, help="earlier JSON report to compare")
+    args = parser.parse_args()
+
+    contacts = args.contacts or SIZES[args.size]
+    notes_count = args.notes or min(SIZES[args.size], 100_000)
+    results = run_benchmarks(contacts, notes_count, args.repeat, args.seed)
+
+    report = {
+        "meta": {
+            "timestamp": dtdt.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "contacts": contacts,
+            "notes": notes_count,
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+    output = args.output or RESULTS_DIR / (
+        f"bench_{contacts}_{dtdt.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    print(f"{'operation':<26} {'median':>12} {'min':>12}")
+    for name, result in results.items():
+        if isinstance(result, dict):
+            print(
+                f"{name:<26} {result['median'] * 1000:>10.2f}ms "
+                f"{result['min'] * 1000:>10.2f}ms"
+            )
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
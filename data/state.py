@@ -1,9 +1,73 @@
+import threading
+from helpers.console import console
 from helpers.helpers import load_contacts, load_notes
+from helpers.mentions import MentionIndex
+from helpers.persistence import register_store
+from models.contact import AddressBook
+from models.note import NotesBook
 
-# Load the contact book data
-book = load_contacts()  # Initializes the contact book by loading saved data.
+# The books start empty and are filled in place by background threads, so the
+# greeting runs while the pickles load and `from data.state import book` works
+# right away. Call `wait_for_data()` before using them.
+book = AddressBook()  # The contact book, filled from 'contacts.pkl'.
+notes = NotesBook()  # The notes book, filled from 'notes.pkl'.
+mentions = MentionIndex(book, notes)  # Contacts named in notes, built on first use
 
-# Load the notes data
-notes = load_notes()  # Initializes the notes book by loading saved data.
+_errors = []  # (filename, error) of the books that failed to load, not reported yet
 
-# Logic for notes - initialize notes here, then import where you need it (no conflict).
+
+def _load_into(target, loader, filename: str) -> None:
+    """
+    Load a book from disk and move its contents into the shared object.
+
+    Runs in a loader thread. The book is registered for saving on close only
+    after it has been loaded, so an early exit can't overwrite the file with an
+    empty book. A book that fails to load is left empty and not registered
+    either: the file is only replaced if the user changes the book.
+
+    Args:
+        target: The shared AddressBook or NotesBook to fill.
+        loader (function): `load_contacts` or `load_notes`.
+        filename (str): The data file of the book.
+    """
+    try:
+        target.__setstate__(loader().__getstate__())
+        register_store(filename, target)
+    except Exception as e:
+        target.__setstate__(type(target)().__getstate__())
+        _errors.append((filename, e))
+
+
+_loaders = [
+    threading.Thread(
+        target=_load_into,
+        args=(target, loader, filename),
+        name=f"load-{filename}",
+        daemon=True,
+    )
+    for target, loader, filename in (
+        (book, load_contacts, "contacts.pkl"),
+        (notes, load_notes, "notes.pkl"),
+    )
+]
+for loader_thread in _loaders:
+    loader_thread.start()
+
+
+def wait_for_data() -> None:
+    """
+    Block until the contacts and notes have been loaded.
+
+    Returns immediately once loading has finished. A book that failed to load
+    is reported on the first call only, and the commands then work on an
+    empty book.
+    """
+    for loader_thread in _loaders:
+        loader_thread.join()
+    while _errors:
+        filename, error = _errors.pop(0)
+        console.print(
+            f"Could not load {filename}: {error!r} ⚠️ Starting with an empty "
+            "book; changing it will replace the file.",
+            style="red bold",
+        )
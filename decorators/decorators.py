@@ -1,8 +1,31 @@
-from rich.console import Console
+from helpers.console import console
 from helpers.typing_effect import typing_output
-from typing import Literal
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Literal, Iterator
 
-console = Console()  # Initialize Console for rich output
+# When set, `exception_handler` re-raises instead of printing and swallowing errors
+_raise_errors = ContextVar("raise_errors", default=False)
+
+
+@contextmanager
+def raise_errors() -> Iterator[None]:
+    """
+    Make methods wrapped with `exception_handler` or `input_error` propagate
+    their errors.
+
+    Used by transactions, which must see validation failures in order to roll
+    back instead of leaving half-applied edits behind, and by the API, which
+    reports them to the client instead of typing them out on the console.
+
+    Yields:
+        None
+    """
+    token = _raise_errors.set(True)
+    try:
+        yield
+    finally:
+        _raise_errors.reset(token)
 
 
 # Exception handler for input errors
@@ -12,7 +35,8 @@ def input_error(func):
 
     Catches common exceptions such as KeyError, ValueError, IndexError,
     or general exceptions during the execution of a function.
-    Displays appropriate error messages using `typing_output`.
+    Displays appropriate error messages using `typing_output`, except inside
+    `raise_errors()` where the exception is propagated to the caller.
 
     Args:
         func (function): The function to wrap with the exception handler.
@@ -22,6 +46,8 @@ def input_error(func):
     """
 
     def inner(*args, **kwargs):
+        if _raise_errors.get():
+            return func(*args, **kwargs)
         try:
             return func(*args, **kwargs)
         except KeyError as e:
@@ -77,7 +103,8 @@ def exception_handler(func):
 
     Catches exceptions such as ValueError and displays an appropriate
     error message using `typing_output`. Ensures that any unhandled
-    exception does not disrupt execution.
+    exception does not disrupt execution, except inside `raise_errors()`
+    where the exception is propagated to the caller.
 
     Args:
         func (function): The class method to wrap with the exception handler.
@@ -90,6 +117,8 @@ def exception_handler(func):
         try:
             return func(*args, **kwargs)
         except ValueError as e:
+            if _raise_errors.get():
+                raise
             typing_output(f"Error: {e} 🚨", color="red")
             return None
 
@@ -0,0 +1,191 @@
+from collections import defaultdict
+from typing import Hashable, Iterable
+
+
+class WordAutomaton:
+    """
+    Aho–Corasick automaton over words: finds many word sequences in one pass.
+
+    The patterns are sequences of words (e.g. the words of contact names) and
+    the text is a sequence of words, so a match always covers whole words:
+    "Ann" is found in "met Ann today" but not in "annual". Scanning a text is
+    linear in its number of words, however many patterns there are.
+
+    The patterns given to the constructor are linked in one breadth-first
+    pass. Patterns added later are linked incrementally: the new trie node
+    gets its failure link right away, and the existing nodes whose failure
+    link should now point to it are found through the index of nodes by their
+    last word. Removing a pattern only drops its value; the nodes stay, as
+    they may be shared with other patterns.
+    """
+
+    def __init__(
+        self, patterns: Iterable[tuple[tuple[str, ...], Hashable]] = ()
+    ) -> None:
+        """
+        Initialize a WordAutomaton object.
+
+        Args:
+            patterns (iterable, optional): (words, value) pairs to add.
+        """
+        self._goto = {}  # (node, word) -> child node; node 0 is the root
+        self._fail = [0]  # node -> node of its longest proper suffix in the trie
+        self._depth = [0]  # node -> number of words on the path from the root
+        self._parent = [0]  # node -> parent node
+        self._word = [""]  # node -> word leading to it from its parent
+        self._by_word = defaultdict(set)  # word -> nodes reached by it
+        self._values = {}  # node -> values of the patterns ending there
+        for words, value in patterns:
+            node = 0
+            for word in words:
+                child = self._goto.get((node, word))
+                node = child if child is not None else self._add_node(node, word)
+            if node:
+                self._values.setdefault(node, set()).add(value)
+        for node in sorted(range(1, len(self._fail)), key=self._depth.__getitem__):
+            self._link(node)
+
+    def _add_node(self, parent: int, word: str) -> int:
+        """
+        Add a trie node, without its failure link.
+
+        Args:
+            parent (int): The parent node.
+            word (str): The word leading from the parent to the new node.
+
+        Returns:
+            int: The new node.
+        """
+        node = len(self._fail)
+        self._goto[parent, word] = node
+        self._fail.append(0)
+        self._depth.append(self._depth[parent] + 1)
+        self._parent.append(parent)
+        self._word.append(word)
+        self._by_word[word].add(node)
+        return node
+
+    def _follow(self, node: int, word: str) -> int:
+        """
+        Get the node reached from a node by a word, following failure links.
+
+        Args:
+            node (int): The current node.
+            word (str): The next word of the text.
+
+        Returns:
+            int: The next node; the root if no suffix continues with the word.
+        """
+        while node and (node, word) not in self._goto:
+            node = self._fail[node]
+        return self._goto.get((node, word), 0)
+
+    def _link(self, node: int) -> None:
+        """
+        Set the failure link of a node. All shallower nodes must be linked.
+
+        Args:
+            node (int): The node.
+        """
+        parent = self._parent[node]
+        if parent:
+            self._fail[node] = self._follow(self._fail[parent], self._word[node])
+
+    def _suffix_of(self, node: int, ancestor: int) -> bool:
+        """
+        Check whether a node's failure chain passes through another node.
+
+        Args:
+            node (int): The node whose chain is followed.
+            ancestor (int): The node looked for.
+
+        Returns:
+            bool: True if `ancestor` is `node` or one of its failure ancestors.
+        """
+        while node:
+            if node == ancestor:
+                return True
+            node = self._fail[node]
+        return ancestor == 0
+
+    def _relink(self, node: int) -> None:
+        """
+        Point the failure links of existing nodes to a new node where it's longer.
+
+        A node reached by the same word fails to the new node if the path of
+        its parent ends with the path of the new node's parent.
+
+        Args:
+            node (int): The new, linked node.
+        """
+        parent, depth = self._parent[node], self._depth[node]
+        for other in self._by_word[self._word[node]]:
+            if (
+                other != node
+                and self._depth[self._fail[other]] < depth
+                and self._suffix_of(self._parent[other], parent)
+            ):
+                self._fail[other] = node
+
+    def add(self, words: tuple[str, ...], value: Hashable) -> None:
+        """
+        Add a pattern.
+
+        Args:
+            words (tuple[str, ...]): The words, e.g. ("ivan", "petrenko").
+            value (Hashable): Reported when the pattern is found, e.g. a record ID.
+        """
+        if not words:
+            return
+        node = 0
+        for word in words:
+            child = self._goto.get((node, word))
+            if child is None:
+                child = self._add_node(node, word)
+                self._link(child)
+                self._relink(child)
+            node = child
+        self._values.setdefault(node, set()).add(value)
+
+    def remove(self, words: tuple[str, ...], value: Hashable) -> None:
+        """
+        Remove a pattern, if it was added with this value.
+
+        Args:
+            words (tuple[str, ...]): The words of the pattern.
+            value (Hashable): The value it was added with.
+        """
+        node = 0
+        for word in words:
+            node = self._goto.get((node, word))
+            if node is None:
+                return
+        values = self._values.get(node)
+        if values is not None:
+            values.discard(value)
+            if not values:
+                del self._values[node]
+
+    def find(self, words: Iterable[str]) -> set:
+        """
+        Find all patterns occurring in a text.
+
+        Args:
+            words (Iterable[str]): The words of the text, in order.
+
+        Returns:
+            set: The values of the patterns found.
+        """
+        found = set()
+        node = 0
+        for word in words:
+            if word not in self._by_word:  # not part of any pattern
+                node = 0
+                continue
+            node = self._follow(node, word)
+            match = node
+            while match:
+                if match in self._values:
+                    found |= self._values[match]
+                match = self._fail[match]
+        return found
@@ -0,0 +1,195 @@
+import csv
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator
+
+from decorators.decorators import raise_errors
+from helpers.export import CONTACT_COLUMNS
+from models.contact import AddressBook, Record
+
+CHUNK_SIZE = 5000  # Rows sent to a worker process at once
+
+
+def parse_contact_row(row: list[str]) -> Record:
+    """
+    Build a contact from one CSV row in the export format.
+
+    The name, phones and emails are checked by the model fields, which use
+    `standardize_name`, `validate_and_normalize_phone` and `validate_email_str`.
+
+    Args:
+        row (list[str]): Name, Phones, Emails, Birthday and Address columns;
+                         phones and emails are comma separated.
+
+    Returns:
+        Record: The validated contact.
+
+    Raises:
+        ValueError: If the row is malformed or any value is invalid.
+    """
+    if len(row) != len(CONTACT_COLUMNS):
+        raise ValueError(f"Expected {len(CONTACT_COLUMNS)} columns, got {len(row)}")
+    name, phones, emails, birthday, address = (value.strip() for value in row)
+
+    with raise_errors():
+        record = Record(name)
+        for phone in filter(None, (p.strip() for p in phones.split(","))):
+            record.add_phone(phone)
+        for email in filter(None, (e.strip() for e in emails.split(","))):
+            record.add_email(email)
+        if birthday:
+            record.add_birthday(birthday)
+        if address:
+            record.add_address(address)
+    return record
+
+
+def validate_chunk(rows: list[list[str]]) -> tuple[list[tuple], list[list[str]]]:
+    """
+    Validate a chunk of CSV rows. Runs in a worker process.
+
+    Valid rows are sent back as plain `get_display_data()` tuples, which are
+    much cheaper to pickle than `Record` objects.
+
+    Args:
+        rows (list[list[str]]): The raw rows.
+
+    Returns:
+        tuple[list[tuple], list[list[str]]]: The normalized values of the
+        valid rows, and the rejected rows with the reason as an extra column.
+    """
+    records, rejected = [], []
+    for row in rows:
+        try:
+            records.append(parse_contact_row(row).get_display_data())
+        except ValueError as e:
+            rejected.append(row + [str(e)])
+    return records, rejected
+
+
+def read_chunks(reader, chunk_size: int) -> Iterator[list[list[str]]]:
+    """
+    Stream CSV rows in chunks, skipping blank lines.
+
+    Args:
+        reader: A `csv.reader` positioned after the header.
+        chunk_size (int): Number of rows per chunk.
+
+    Yields:
+        list[list[str]]: The next chunk of rows.
+    """
+    chunk = []
+    for row in reader:
+        if not any(row):
+            continue
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def validate_chunks(executor, chunks, workers: int, merge) -> None:
+    """
+    Validate chunks in a process pool and merge the results in file order.
+
+    At most two chunks per worker are in flight, so the reader never runs far
+    ahead of the merge and memory use doesn't grow with the file.
+
+    Args:
+        executor (ProcessPoolExecutor): The pool to validate in.
+        chunks: An iterator of row chunks.
+        workers (int): Number of worker processes.
+        merge (function): Called with the records and rejected rows of each chunk.
+    """
+    pending = deque()
+    for chunk in chunks:
+        pending.append(executor.submit(validate_chunk, chunk))
+        if len(pending) >= workers * 2:
+            merge(*pending.popleft().result())
+    while pending:
+        merge(*pending.popleft().result())
+
+
+def import_contacts_csv(
+    book: AddressBook,
+    filepath: Path,
+    reject_path: Path,
+    chunk_size: int = CHUNK_SIZE,
+    workers: int | None = None,
+    persist=None,
+) -> dict:
+    """
+    Stream contacts from a CSV file into the address book.
+
+    Chunks are validated in a process pool of "spawn" workers, which don't
+    inherit the parent's threads and locks (the loader and autosave threads
+    may hold one when a "fork" happens). Valid records are merged chunk by
+    chunk in file order into one transaction, so the book is only changed if
+    the whole file was read; the workers' validation is trusted and not run
+    again on commit. Invalid rows are written to `reject_path` with the
+    reason; the file is removed if the import fails.
+
+    Args:
+        book (AddressBook): The address book to import into.
+        filepath (Path): The CSV file to read (same columns as the export).
+        reject_path (Path): Where to write rejected rows; removed if there are none.
+        chunk_size (int, optional): Rows per chunk. Defaults to CHUNK_SIZE.
+        workers (int, optional): Worker processes. Defaults to the CPU count.
+        persist (callable, optional): Saves the book once the import is
+                                      applied, e.g. `save_contacts`; if it
+                                      fails, the import is rolled back.
+
+    Returns:
+        dict: Counts of rows, added, updated and rejected records, the elapsed
+              seconds and rows per second.
+
+    Raises:
+        OSError: If a file cannot be read or written.
+        ValueError: If the CSV header doesn't match the export format.
+    """
+    workers = workers or os.cpu_count() or 1
+    stats = {"rows": 0, "added": 0, "updated": 0, "rejected": 0}
+    start = time.perf_counter()
+
+    def merge(records: list[tuple], rejected: list[list[str]]) -> None:
+        added = sum(tx.merge(Record.from_display_data(data)) for data in records)
+        stats["rows"] += len(records) + len(rejected)
+        stats["added"] += added
+        stats["updated"] += len(records) - added
+        stats["rejected"] += len(rejected)
+        reject_writer.writerows(rejected)
+
+    with filepath.open(newline="", encoding="utf-8-sig") as csvfile:
+        reader = csv.reader(csvfile)
+        header = next(reader, None)
+        if header is None or [column.strip() for column in header] != CONTACT_COLUMNS:
+            raise ValueError(f"Expected CSV header: {', '.join(CONTACT_COLUMNS)}")
+
+        try:
+            with (
+                reject_path.open("w", newline="", encoding="utf-8") as rejectfile,
+                ProcessPoolExecutor(
+                    max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+                ) as executor,
+                book.transaction(persist=persist) as tx,
+            ):
+                reject_writer = csv.writer(rejectfile)
+                reject_writer.writerow(CONTACT_COLUMNS + ["Error"])
+                validate_chunks(
+                    executor, read_chunks(reader, chunk_size), workers, merge
+                )
+        except BaseException:
+            reject_path.unlink(missing_ok=True)  # the rows weren't imported either
+            raise
+
+    if not stats["rejected"]:
+        reject_path.unlink()
+    stats["seconds"] = time.perf_counter() - start
+    stats["rows_per_sec"] = stats["rows"] / stats["seconds"] if stats["seconds"] else 0
+    return stats
@@ -8,6 +8,10 @@ all_available_commands = [
     "expand contact",
     "show contact",
     "export contacts",
+    "import contacts",
+    "dedupe contacts",
+    "email domains",
+    "contacts by city",
     "all notes",
     "add note",
     "find note",
@@ -15,6 +19,8 @@ all_available_commands = [
     "delete note",
     "export notes",
     "show note",
+    "export status",
+    "search",
 ]
 
 
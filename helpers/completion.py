@@ -0,0 +1,131 @@
+from helpers.metrics import timed
+
+COMPLETION_LIMIT = 20  # Most completions offered from each source
+
+
+class Completer:
+    """
+    Tab completion of commands, contact names, note titles and tags.
+
+    Every source is a sorted index searched by prefix. The ranges found for
+    the last prefix are kept, so typing more letters and pressing Tab again
+    only searches within the previous range instead of the whole book. A
+    range is reused only while its index is unchanged (same version).
+    """
+
+    def __init__(self, sources, commands=()) -> None:
+        """
+        Initialize a Completer object.
+
+        Args:
+            sources (list): (prefix_range, label_at, version) functions per
+                            source, e.g. `book.prefix_range`, a function
+                            returning the name at a position, and
+                            `book.order_version`.
+            commands (iterable, optional): The command names to complete.
+        """
+        self._sources = list(sources)
+        self._commands = sorted(commands)
+        self._prefix = None
+        self._ranges = [None] * len(self._sources)  # (version, range) per source
+        self._matches = []
+
+    @timed("Completer.candidates")
+    def candidates(self, prefix: str) -> list[str]:
+        """
+        Find the names, titles and tags starting with a prefix, ignoring case.
+
+        Args:
+            prefix (str): The text typed so far.
+
+        Returns:
+            list[str]: Up to COMPLETION_LIMIT matches per source, in
+                       alphabetical order.
+        """
+        folded = prefix.casefold()
+        narrowing = self._prefix is not None and folded.startswith(self._prefix)
+        matches = []
+        for number, (prefix_range, label_at, version) in enumerate(self._sources):
+            current = version()
+            previous = self._ranges[number]
+            within = None
+            if narrowing and previous and previous[0] == current:
+                within = previous[1]
+            found = prefix_range(prefix, within)
+            self._ranges[number] = (current, found)
+            matches.extend(label_at(position) for position in found[:COMPLETION_LIMIT])
+        self._prefix = folded
+        return sorted({match for match in matches if match}, key=str.casefold)
+
+    def complete(self, text: str, state: int) -> str | None:
+        """
+        Return the `state`-th completion of the line, as `readline` expects.
+
+        At the start of the line commands are completed too. After a command
+        and a space, the rest is completed with names, titles and tags, e.g.
+        "search Iv" -> "search Ivan Petrenko".
+
+        Args:
+            text (str): The line typed so far (there are no word delimiters).
+            state (int): The number of the completion asked for.
+
+        Returns:
+            str | None: The completion, or None when there are no more.
+        """
+        if state == 0:
+            lowered = text.lower()
+            command = next(
+                (cmd for cmd in self._commands if lowered.startswith(f"{cmd} ")), None
+            )
+            if command:
+                head = text[: len(command) + 1]
+                rest = text[len(command) + 1 :]
+                self._matches = [head + match for match in self.candidates(rest)]
+            else:
+                commands = [cmd for cmd in self._commands if cmd.startswith(lowered)]
+                self._matches = commands + self.candidates(text)
+        if state < len(self._matches):
+            return self._matches[state]
+        return None
+
+
+def install_completion(book, notes, commands=()) -> bool:
+    """
+    Turn on Tab completion of commands, contact names, note titles and tags.
+
+    Args:
+        book (AddressBook): The contacts.
+        notes (NotesBook): The notes.
+        commands (iterable, optional): The command names to complete.
+
+    Returns:
+        bool: False if `readline` is not available (e.g. on Windows).
+    """
+    try:
+        import readline
+    except ImportError:
+        return False
+
+    def name_at(position: int) -> str | None:
+        record = book.at(position)
+        return record.name.value if record else None
+
+    def title_at(position: int) -> str | None:
+        note = notes.at(position)
+        return note.title.value if note else None
+
+    completer = Completer(
+        [
+            (book.prefix_range, name_at, book.order_version),
+            (notes.prefix_range, title_at, notes.order_version),
+            (notes.tag_prefix_range, notes.tag_at, notes.tag_order_version),
+        ],
+        commands,
+    )
+    readline.set_completer(completer.complete)
+    readline.set_completer_delims("")  # complete whole names, spaces included
+    if "libedit" in (readline.__doc__ or ""):  # macOS
+        readline.parse_and_bind("bind ^I rl_complete")
+    else:
+        readline.parse_and_bind("tab: complete")
+    return True
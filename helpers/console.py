@@ -0,0 +1,5 @@
+from rich.console import Console
+
+# The single Console used for all rich output. Every module imports this one
+# instead of creating its own, so terminal detection runs once at startup.
+console = Console()
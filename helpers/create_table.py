@@ -1,13 +1,12 @@
-from rich.console import Console
+from helpers.console import console
 from rich.table import Table
 from rich import box
 from datetime import datetime as dtdt
-
-# Initialize Console for rich output
-console = Console()
+from helpers.metrics import timed
 
 
 # SHOW CONTACT
+@timed("render.show_contact_in_table")
 def show_contact_in_table(record) -> None:
     """
     Display details of a single contact in a formatted table.
@@ -46,6 +45,7 @@ def show_contact_in_table(record) -> None:
 
 
 # SHOW ALL CONTACTS
+@timed("render.show_all_contacts_table")
 def show_all_contacts_table(records) -> None:
     """
     Display all contacts in a single styled table.
@@ -86,6 +86,7 @@ def show_all_contacts_table(records) -> None:
 
 
 # SHOW BIRTHDAYS
+@timed("render.show_birthdays_table")
 def show_birthdays_table(birthdays) -> None:
     """
     Display upcoming birthdays in a styled table.
@@ -133,12 +134,232 @@ def show_birthdays_table(birthdays) -> None:
     console.print(table)
 
 
+# SHOW EMAIL DOMAINS
+@timed("render.show_email_domains_table")
+def show_email_domains_table(domains) -> None:
+    """
+    Display the number of contacts per email domain in a styled table.
+
+    Args:
+        domains: A list of (domain, count) tuples, most common first.
+
+    Returns:
+        None
+    """
+    if not domains:
+        console.print("[bold red]No email addresses to display.[/]")
+        return
+
+    table = Table(
+        show_header=True,
+        header_style="bold green",
+        box=box.ROUNDED,
+        title="Email Domains 📧",
+        title_justify="center",
+        title_style="bold sea_green3",
+    )
+    table.add_column("Domain", style="bold white on green", min_width=24)
+    table.add_column("Contacts", justify="right")
+
+    for domain, count in domains:
+        table.add_row(domain, str(count))
+
+    console.print(table)
+
+
+# SHOW CONTACTS BY CITY
+@timed("render.show_cities_table")
+def show_cities_table(groups, names_shown: int = 5) -> None:
+    """
+    Display the contacts of every city in a styled table.
+
+    Args:
+        groups: A list of (city, records) tuples, largest groups first.
+        names_shown (int, optional): Names listed per city. Defaults to 5.
+
+    Returns:
+        None
+    """
+    if not groups:
+        console.print("[bold red]No addresses to display.[/]")
+        return
+
+    table = Table(
+        show_header=True,
+        header_style="bold green",
+        box=box.ROUNDED,
+        title="Contacts by City 🏙️",
+        title_justify="center",
+        title_style="bold sea_green3",
+    )
+    table.add_column("City", style="bold white on green", width=20)
+    table.add_column("Contacts", justify="right")
+    table.add_column("Names", justify="left")
+
+    for city, records in groups:
+        names = ", ".join(record.name.value for record in records[:names_shown])
+        if len(records) > names_shown:
+            names += ", …"
+        table.add_row(city, str(len(records)), names)
+        table.add_section()
+
+    console.print(table)
+
+
+# SHOW SEARCH RESULTS
+@timed("render.show_search_results_table")
+def show_search_results_table(ranked, limit: int) -> None:
+    """
+    Display the ranked hits of a global search in one table, grouped by type.
+
+    Args:
+        ranked: A dict with the "contact" and "note" hits, best first, as
+                returned by `helpers.global_search.rank`.
+        limit (int): Hits shown per type.
+
+    Returns:
+        None
+    """
+    table = Table(
+        show_header=True,
+        header_style="bold green",
+        box=box.ROUNDED,
+        title="Search Results 🔎",
+        title_justify="center",
+        title_style="bold sea_green3",
+    )
+    table.add_column("Type", style="bold white on green", width=8)
+    table.add_column("Name / Title", style="sea_green3", width=18)
+    table.add_column("Details", justify="left", width=24)
+    table.add_column("Fields", justify="left")
+    table.add_column("Score", justify="right")
+
+    for kind, hits in ranked.items():
+        for hit in hits[:limit]:
+            if kind == "contact":
+                name, phones, emails, _, _ = hit.item.get_display_data()
+                details = ", ".join(phones + emails) or "-"
+            else:
+                name, content, tags = hit.item.get_display_data()
+                details = " ".join(tags) or (content or "-")[:80]
+            table.add_row(
+                f"{kind.title()}s", name, details, ", ".join(hit.fields), str(hit.score)
+            )
+        if len(hits) > limit:
+            table.add_row("", f"… {len(hits) - limit} more {kind}s", "", "", "")
+        if hits:
+            table.add_section()
+
+    console.print(table)
+
+
+# SHOW RELATED NOTES
+@timed("render.show_note_list_table")
+def show_note_list_table(heading: str, notes, limit: int) -> None:
+    """
+    Display a short list of notes related to a contact or note, by title and tags.
+
+    Args:
+        heading (str): The title of the table, e.g. "Linked from 🔗".
+        notes: The notes, in display order.
+        limit (int): Notes shown; the number of the others is shown below.
+
+    Returns:
+        None
+    """
+    table = Table(
+        show_header=True,
+        header_style="bold green",
+        box=box.ROUNDED,
+        title=heading,
+        title_justify="center",
+        title_style="bold sea_green3",
+    )
+    table.add_column("Title", style="sea_green3", width=30)
+    table.add_column("Tags", justify="left", width=30)
+
+    for note in notes[:limit]:
+        title, _, tags = note.get_display_data()
+        table.add_row(title, " ".join(tags) or "-")
+    if len(notes) > limit:
+        table.caption = f"… and {len(notes) - limit} more"
+
+    console.print(table)
+
+
+# SHOW NOTES WITH SIMILAR CONTENT
+@timed("render.show_related_notes_table")
+def show_related_notes_table(related) -> None:
+    """
+    Display the notes whose content is similar to a note's content.
+
+    Args:
+        related: (note, similarity) pairs, most similar first.
+
+    Returns:
+        None
+    """
+    table = Table(
+        show_header=True,
+        header_style="bold green",
+        box=box.ROUNDED,
+        title="Related notes 🧩",
+        title_justify="center",
+        title_style="bold sea_green3",
+    )
+    table.add_column("Title", style="sea_green3", width=30)
+    table.add_column("Tags", justify="left", width=30)
+    table.add_column("Similarity", justify="right")
+
+    for note, score in related:
+        title, _, tags = note.get_display_data()
+        table.add_row(title, " ".join(tags) or "-", f"{score:.0%}")
+
+    console.print(table)
+
+
+# SHOW CONTACTS MENTIONED IN A NOTE
+@timed("render.show_mentioned_contacts_table")
+def show_mentioned_contacts_table(records, limit: int) -> None:
+    """
+    Display the contacts whose names a note mentions.
+
+    Args:
+        records: The contacts mentioned, in display order.
+        limit (int): Contacts shown; the number of the others is shown below.
+
+    Returns:
+        None
+    """
+    table = Table(
+        show_header=True,
+        header_style="bold green",
+        box=box.ROUNDED,
+        title="Mentioned contacts 👨",
+        title_justify="center",
+        title_style="bold sea_green3",
+    )
+    table.add_column("Name", style="sea_green3", width=20)
+    table.add_column("Phones", justify="left", width=20)
+    table.add_column("Emails", justify="left", width=30)
+
+    for record in records[:limit]:
+        name, phones, emails, _, _ = record.get_display_data()
+        table.add_row(name, "\n".join(phones) or "-", "\n".join(emails) or "-")
+    if len(records) > limit:
+        table.caption = f"… and {len(records) - limit} more"
+
+    console.print(table)
+
+
 # SHOW QUERY OPTIONS
+@timed("render.show_options_for_query")
 def show_options_for_query() -> None:
     """
     Display search query options for contacts in a styled table.
 
-    The options include searching by name, phone number, email, birthday, or address.
+    The options include searching by name, phone number, email, birthday, address,
+    or a name that sounds alike.
 
     Returns:
         None
@@ -163,11 +384,15 @@ def show_options_for_query() -> None:
     table.add_row("4", "Search by [bold cyan]birthday[/]")
     table.add_section()
     table.add_row("5", "Search by [bold cyan]address[/]")
+    table.add_section()
+    table.add_row("6", "Search by how the [bold cyan]name sounds[/]")
+    table.caption = "Wrap the query in slashes for a regex, e.g. /^admin@/"
 
     console.print(table)
 
 
 # SHOW NOTES
+@timed("render.show_notes_in_table")
 def show_notes_in_table(note) -> None:
     """
     Display details of a single note in a formatted table.
@@ -200,6 +425,7 @@ def show_notes_in_table(note) -> None:
 
 
 # SHOW ALL NOTES
+@timed("render.show_all_notes_table")
 def show_all_notes_table(notes) -> None:
     """
     Display all notes in a single styled table.
@@ -239,6 +465,7 @@ def show_all_notes_table(notes) -> None:
 
 
 # SHOW QUERY OPTIONS FOR NOTES
+@timed("render.show_options_for_query_notes")
 def show_options_for_query_notes() -> None:
     """
     Display search query options for notes in a styled table.
@@ -264,5 +491,93 @@ def show_options_for_query_notes() -> None:
     table.add_row("2", "Search by [bold cyan]content[/]")
     table.add_section()
     table.add_row("3", "Search by [bold cyan]tag[/]")
+    table.caption = "Wrap the query in slashes for a regex, e.g. /[A-Z]+-[0-9]+/"
+
+    console.print(table)
+
+
+# SHOW LATENCY STATS
+def show_stats_table(stats) -> None:
+    """
+    Display per-operation latency statistics in a styled table.
+
+    Args:
+        stats: A list of dictionaries as returned by `helpers.metrics.get_stats`.
+
+    Returns:
+        None
+    """
+    if not stats:
+        console.print("[bold red]No measurements recorded yet.[/]")
+        return
+
+    table = Table(
+        show_header=True,
+        header_style="bold green",
+        box=box.ROUNDED,
+        title="Latency Stats, ms ⏱️",
+        title_justify="center",
+        title_style="bold sea_green3",
+    )
+    table.add_column("Operation", style="bold white on green", min_width=24)
+    table.add_column("Calls", justify="right")
+    table.add_column("p50", justify="right")
+    table.add_column("p95", justify="right")
+    table.add_column("p99", justify="right")
+    table.add_column("Max", justify="right")
+    table.add_column("Total", justify="right")
+
+    for item in stats:
+        table.add_row(
+            item["name"],
+            str(item["count"]),
+            f"{item['p50'] * 1000:.3f}",
+            f"{item['p95'] * 1000:.3f}",
+            f"{item['p99'] * 1000:.3f}",
+            f"{item['max'] * 1000:.3f}",
+            f"{item['total'] * 1000:.1f}",
+        )
 
     console.print(table)
+
+
+@timed("render.show_import_times_table")
+def show_import_times_table(imports, limit: int, budget: float) -> None:
+    """
+    Display the slowest imports and the total startup import time in a styled table.
+
+    Args:
+        imports: A list of dictionaries as returned by `helpers.metrics.profile_imports`.
+        limit (int): Number of modules to show, slowest first by their own time.
+        budget (float): Target total import time in seconds.
+
+    Returns:
+        None
+    """
+    table = Table(
+        show_header=True,
+        header_style="bold green",
+        box=box.ROUNDED,
+        title="Startup Imports, ms 🚀",
+        title_justify="center",
+        title_style="bold sea_green3",
+    )
+    table.add_column("Module", style="bold white on green", min_width=24)
+    table.add_column("Self", justify="right")
+    table.add_column("Cumulative", justify="right")
+
+    for item in sorted(imports, key=lambda item: item["self"], reverse=True)[:limit]:
+        table.add_row(
+            item["name"].strip(),
+            f"{item['self'] * 1000:.1f}",
+            f"{item['cumulative'] * 1000:.1f}",
+        )
+    console.print(table)
+
+    total = imports[-1]["cumulative"] if imports else 0.0
+    style = "green" if total <= budget else "bold red"
+    console.print(
+        f"Total import time: {total * 1000:.1f} ms "
+        f"(budget {budget * 1000:.0f} ms)",
+        style=style,
+    )
@@ -1,8 +1,13 @@
+import os
 import pickle
+import threading
 from pathlib import Path
+from helpers.metrics import timed
 
-# Define the directory to store data files
-DATA_DIR = Path(__file__).parent.parent / "data"
+# Define the directory to store data files; CLIPYBOT_DATA_DIR moves it, e.g. for tests
+DATA_DIR = Path(
+    os.environ.get("CLIPYBOT_DATA_DIR") or Path(__file__).parent.parent / "data"
+)
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 
 
@@ -19,6 +24,7 @@ def get_data_path(filename: str) -> Path:
     return DATA_DIR / filename
 
 
+@timed("storage.save_data")
 def save_data(data_object, filename: str) -> None:
     """
     Save data to a file using pickle serialization.
@@ -28,13 +34,24 @@ def save_data(data_object, filename: str) -> None:
         filename (str): The name of the file where the data will be saved.
 
     This function serializes the data object and stores it in the specified file
-    within the data directory.
+    within the data directory. The data is written to a temporary file that
+    then replaces the old one, so an interrupted save never leaves a truncated
+    file behind and concurrent saves of the same file don't interleave.
     """
     file_path = get_data_path(filename)
-    with open(file_path, "wb") as f:
-        pickle.dump(data_object, f)
+    tmp_path = file_path.with_name(
+        f"{file_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+    )
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump(data_object, f)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
 
 
+@timed("storage.load_data")
 def load_data(filename: str, default_factory=None):
     """
     Load data from a file using pickle deserialization.
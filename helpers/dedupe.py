@@ -0,0 +1,144 @@
+import time
+from collections import defaultdict
+from typing import Iterator
+
+from rapidfuzz import fuzz, process, utils
+
+from helpers.phonetic import name_code
+
+NAME_THRESHOLD = 88  # Name similarity (0-100) that makes two contacts duplicates
+SHARED_THRESHOLD = 60  # Name similarity that is enough when a phone or email is shared
+MAX_BLOCK = 200  # Blocks larger than this are compared in a sliding window
+WINDOW = 25  # Neighbours each contact of a large block is compared with
+
+
+def blocking_keys(record, name: str) -> set[str]:
+    """
+    Get the keys of the blocks a contact belongs to.
+
+    Only contacts sharing at least one key are ever compared: the same phone
+    number, the same email local part (so "ivan.p@gmail.com" and
+    "ivanp+work@ukr.net" meet) or the same phonetic name code.
+
+    Args:
+        record (Record): The contact.
+        name (str): The contact's name, preprocessed with `utils.default_process`.
+
+    Returns:
+        set[str]: The blocking keys, prefixed with their kind.
+    """
+    keys = {f"name:{name_code(name)}"}
+    keys.update(f"phone:{phone.value[-9:]}" for phone in record.phones)
+    for email in record.emails:
+        local = email.value.lower().split("@")[0].split("+")[0].replace(".", "")
+        keys.add(f"email:{local}")
+    return keys
+
+
+def candidate_pairs(members: list[int], names: list[str]) -> Iterator[tuple[int, list]]:
+    """
+    Pair every contact of a block with the ones it has to be compared with.
+
+    Small blocks are compared all against all. Large blocks (e.g. a very common
+    surname) are sorted by name and every contact is compared with its next
+    WINDOW neighbours only, which keeps the work linear in the block size.
+
+    Args:
+        members (list[int]): Positions of the contacts in the block.
+        names (list[str]): Preprocessed names of all contacts, by position.
+
+    Yields:
+        tuple[int, list]: A position and the positions to compare it with.
+    """
+    if len(members) > MAX_BLOCK:
+        members = sorted(members, key=names.__getitem__)
+        for i, position in enumerate(members):
+            yield position, members[i + 1 : i + 1 + WINDOW]
+    else:
+        for i, position in enumerate(members):
+            yield position, members[i + 1 :]
+
+
+def find_duplicates(records) -> tuple[list[list], dict]:
+    """
+    Find clusters of contacts that are probably the same person.
+
+    Contacts are grouped into blocks by their blocking keys and compared only
+    within a block, so the work grows with the block sizes instead of the
+    square of the book size. Two contacts are duplicates when their names are
+    at least NAME_THRESHOLD similar, or SHARED_THRESHOLD similar while sharing
+    a phone or email. Duplicates of duplicates end up in the same cluster.
+
+    No set of compared pairs is kept, as it would grow with every comparison:
+    within a block each pair comes up once, and across blocks a pair is skipped
+    once its contacts are in the same cluster. Two different contacts sharing
+    several blocking keys are therefore compared once per shared key.
+
+    Args:
+        records: A sequence of contact records, e.g. `book.snapshot()`.
+
+    Returns:
+        tuple[list[list], dict]: The clusters (lists of records, largest first)
+                                 and statistics: records, blocks, comparisons,
+                                 clusters and seconds.
+    """
+    start = time.perf_counter()
+    names = [utils.default_process(record.name.value) for record in records]
+    contacts = [
+        {phone.value for phone in record.phones}
+        | {email.value.lower() for email in record.emails}
+        for record in records
+    ]
+
+    blocks = defaultdict(list)
+    for position, record in enumerate(records):
+        for key in blocking_keys(record, names[position]):
+            blocks[key].append(position)
+
+    parent = list(range(len(records)))
+
+    def root(position: int) -> int:
+        while parent[position] != position:
+            parent[position] = parent[parent[position]]
+            position = parent[position]
+        return position
+
+    comparisons = 0
+    for members in blocks.values():
+        if len(members) < 2:
+            continue
+        for position, others in candidate_pairs(members, names):
+            # Pairs already in one cluster, e.g. met in an earlier block, are skipped
+            own = root(position)
+            others = [other for other in others if root(other) != own]
+            if not others:
+                continue
+            comparisons += len(others)
+            matches = process.extract(
+                names[position],
+                [names[other] for other in others],
+                scorer=fuzz.token_sort_ratio,
+                processor=None,
+                score_cutoff=SHARED_THRESHOLD,
+                limit=None,
+            )
+            for _, score, index in matches:
+                other = others[index]
+                if score >= NAME_THRESHOLD or contacts[position] & contacts[other]:
+                    parent[root(other)] = root(position)
+
+    clusters = defaultdict(list)
+    for position, record in enumerate(records):
+        clusters[root(position)].append(record)
+    clusters = sorted(
+        (cluster for cluster in clusters.values() if len(cluster) > 1),
+        key=lambda cluster: (-len(cluster), cluster[0].name.value),
+    )
+    stats = {
+        "records": len(records),
+        "blocks": sum(len(members) > 1 for members in blocks.values()),
+        "comparisons": comparisons,
+        "clusters": len(clusters),
+        "seconds": time.perf_counter() - start,
+    }
+    return clusters, stats
@@ -0,0 +1,290 @@
+import io
+import threading
+import time
+from pathlib import Path
+from typing import Iterator
+
+CONTACT_COLUMNS = ["Name", "Phones", "Emails", "Birthday", "Address"]
+NOTE_COLUMNS = ["Title", "Content", "Tags"]
+FORMATS = ["csv", "jsonl", "csv.gz", "jsonl.gz"]
+CHUNK_ROWS = 2000  # Rows encoded in memory before each write to the file
+WRITE_BUFFER = 1024 * 1024  # Size of the file buffer in bytes
+
+
+def contact_to_dict(record) -> dict:
+    """
+    Convert a contact record to a JSON-serializable dictionary.
+
+    Args:
+        record (Record): The contact record to convert.
+
+    Returns:
+        dict: The contact's name, phones, emails, birthday and address.
+    """
+    name, phones, emails, birthday, address = record.get_display_data()
+    return {
+        "name": name,
+        "phones": phones,
+        "emails": emails,
+        "birthday": birthday,
+        "address": address,
+    }
+
+
+def note_to_dict(note) -> dict:
+    """
+    Convert a note to a JSON-serializable dictionary.
+
+    Args:
+        note (Note): The note to convert.
+
+    Returns:
+        dict: The note's title, content and tags.
+    """
+    title, content, tags = note.get_display_data()
+    return {"title": title, "content": content, "tags": tags}
+
+
+def contact_to_row(record) -> list[str]:
+    """
+    Convert a contact record to a CSV row.
+
+    Args:
+        record (Record): The contact record to convert.
+
+    Returns:
+        list[str]: Name, comma separated phones and emails, birthday and address.
+    """
+    return [
+        record.name.value,
+        ", ".join(p.value for p in record.phones),
+        ", ".join(e.value for e in record.emails),
+        record.birthday.value if record.birthday else "",
+        record.address.value if record.address else "",
+    ]
+
+
+def note_to_row(note) -> list[str]:
+    """
+    Convert a note to a CSV row.
+
+    Args:
+        note (Note): The note to convert.
+
+    Returns:
+        list[str]: Title, content and comma separated tags.
+    """
+    return [
+        note.title.value,
+        note.content if note.content else "",
+        ", ".join(t.value for t in note.tags),
+    ]
+
+
+# Columns and converters for every kind of data that can be exported
+EXPORTERS = {
+    "contacts": (CONTACT_COLUMNS, contact_to_row, contact_to_dict),
+    "notes": (NOTE_COLUMNS, note_to_row, note_to_dict),
+}
+
+
+def encode_chunks(items, kind: str, fmt: str) -> Iterator[tuple[str, int]]:
+    """
+    Encode items as CSV or JSON Lines text in chunks of CHUNK_ROWS items.
+
+    Args:
+        items: An iterable of contact records or notes.
+        kind (str): "contacts" or "notes".
+        fmt (str): "csv" or "jsonl".
+
+    Yields:
+        tuple[str, int]: The next chunk of encoded text and the number of
+                         items encoded so far.
+    """
+    columns, to_row, to_dict = EXPORTERS[kind]
+    buffer = io.StringIO()
+    if fmt == "csv":
+        import csv  # deferred: this module is imported at startup
+
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        write = lambda item: writer.writerow(to_row(item))
+    else:
+        import json  # deferred: this module is imported at startup
+
+        write = lambda item: buffer.write(
+            json.dumps(to_dict(item), ensure_ascii=False) + "\n"
+        )
+
+    count = 0
+    for count, item in enumerate(items, 1):
+        write(item)
+        if count % CHUNK_ROWS == 0:
+            yield buffer.getvalue(), count
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell() or not count:
+        yield buffer.getvalue(), count
+
+
+def write_export(
+    items, filepath: Path, kind: str, fmt: str = "csv", progress=None
+) -> int:
+    """
+    Write contacts or notes to a file in large buffered chunks.
+
+    Args:
+        items: An iterable of contact records or notes.
+        filepath (Path): The path of the file to create.
+        kind (str): "contacts" or "notes".
+        fmt (str, optional): One of FORMATS; ".gz" formats are gzip-compressed.
+                             Defaults to "csv".
+        progress (function, optional): Called with the number of items written
+                                       after every chunk.
+
+    Returns:
+        int: The number of exported items.
+
+    Raises:
+        OSError: If the file cannot be written.
+        ValueError: If the format is not supported.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format: {fmt}. Use one of {', '.join(FORMATS)}")
+
+    if fmt.endswith(".gz"):
+        import gzip  # deferred: this module is imported at startup
+
+        file = gzip.open(filepath, "wb", compresslevel=6)
+    else:
+        file = filepath.open("wb", buffering=WRITE_BUFFER)
+
+    count = 0
+    with file:
+        for chunk, count in encode_chunks(items, kind, fmt.removesuffix(".gz")):
+            file.write(chunk.encode("utf-8"))
+            if progress:
+                progress(count)
+    return count
+
+
+class ExportJob:
+    """
+    Class representing an export running in a background thread.
+
+    The job works on a snapshot taken when it is created, so edits made at the
+    prompt while it runs don't change the exported set of items.
+    """
+
+    def __init__(self, items: tuple, filepath: Path, kind: str, fmt: str) -> None:
+        """
+        Initialize an ExportJob object.
+
+        Args:
+            items (tuple): The snapshot of contact records or notes to export.
+            filepath (Path): The path of the file to create.
+            kind (str): "contacts" or "notes".
+            fmt (str): One of FORMATS.
+        """
+        self.items = items
+        self.filepath = filepath
+        self.kind = kind
+        self.fmt = fmt
+        self.total = len(items)
+        self.done = 0
+        self.error = None
+        self.seconds = None
+        self.on_finish = None
+        self.finished = threading.Event()
+        self.thread = threading.Thread(target=self.run, name=f"export-{kind}")
+
+    def start(self, on_finish=None) -> "ExportJob":
+        """
+        Start the export in a background thread.
+
+        Args:
+            on_finish (function, optional): Called with the job when it ends.
+
+        Returns:
+            ExportJob: The started job.
+        """
+        self.on_finish = on_finish
+        _jobs.append(self)
+        self.thread.start()
+        return self
+
+    def run(self) -> None:
+        """
+        Write the export file and record the outcome. Runs in the worker thread.
+        """
+        start = time.perf_counter()
+        try:
+            write_export(self.items, self.filepath, self.kind, self.fmt, self.update)
+        except (OSError, ValueError) as e:
+            self.error = e
+        finally:
+            self.items = ()  # release the snapshot
+            self.seconds = time.perf_counter() - start
+            self.finished.set()
+            if self.on_finish:
+                self.on_finish(self)
+
+    def update(self, done: int) -> None:
+        """
+        Record how many items have been written.
+
+        Args:
+            done (int): The number of items written so far.
+        """
+        self.done = done
+
+    @property
+    def progress(self) -> float:
+        """
+        Get the share of the export that is done.
+
+        Returns:
+            float: Progress from 0.0 to 1.0.
+        """
+        return self.done / self.total if self.total else 1.0
+
+
+_jobs = []
+
+
+def export_jobs() -> list[ExportJob]:
+    """
+    Get all exports started in this session.
+
+    Returns:
+        list[ExportJob]: The jobs, oldest first.
+    """
+    return list(_jobs)
+
+
+def write_contacts_csv(records, filepath: Path) -> None:
+    """
+    Write contact records to a CSV file.
+
+    Args:
+        records: A sequence of contact records.
+        filepath (Path): The path of the CSV file to create.
+
+    Raises:
+        OSError: If the file cannot be written.
+    """
+    write_export(records, filepath, "contacts")
+
+
+def write_notes_csv(notes, filepath: Path) -> None:
+    """
+    Write notes to a CSV file.
+
+    Args:
+        notes: A sequence of notes.
+        filepath (Path): The path of the CSV file to create.
+
+    Raises:
+        OSError: If the file cannot be written.
+    """
+    write_export(notes, filepath, "notes")
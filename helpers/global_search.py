@@ -0,0 +1,138 @@
+import re
+from typing import Iterator, NamedTuple
+
+from helpers.metrics import timer
+
+# Weight of a match in each field; an entry matching in several fields adds them up
+FIELD_WEIGHTS = {
+    "name": 40,
+    "phone": 30,
+    "email": 30,
+    "address": 20,
+    "birthday": 15,
+    "title": 40,
+    "tag": 25,
+    "content": 10,
+}
+EXACT_BONUS = 100  # The name or title is exactly the query
+PREFIX_BONUS = 50  # The name or title starts with the query
+MIN_PHONE_DIGITS = 3  # Fewer digits in the text don't search the phone numbers
+
+
+class FieldResult(NamedTuple):
+    """The entries one field search found: kind is "contact" or "note"."""
+
+    kind: str
+    field: str
+    items: list
+
+
+class Hit(NamedTuple):
+    """An entry of the merged result list with its score and matched fields."""
+
+    item: object
+    score: int
+    fields: list[str]
+
+
+def field_searches(text: str, book, notes) -> list[tuple[str, str, object]]:
+    """
+    Build one search task per field of contacts and notes.
+
+    Phone, email and address searches go through the contact field indexes,
+    the others scan a snapshot. The phone search only runs when the text
+    contains at least MIN_PHONE_DIGITS digits, so "Office 2" doesn't match
+    every number ending in 2; it looks for the digits alone, at both the
+    start and the end of the numbers.
+
+    Args:
+        text (str): The text to look for.
+        book (AddressBook): The contacts.
+        notes (NotesBook): The notes.
+
+    Returns:
+        list[tuple[str, str, function]]: The kind, field and a function
+                                         returning the matches, per field.
+    """
+    tasks = [
+        ("contact", "name", lambda: book.find(text, by_name=True)),
+        ("contact", "email", lambda: book.find_by_email(text)),
+        ("contact", "address", lambda: book.find_by_address(text)),
+        ("contact", "birthday", lambda: book.find(text, by_birthday=True)),
+        ("note", "title", lambda: notes.search(text, by_title=True)),
+        ("note", "tag", lambda: notes.search(text, by_tag=True)),
+        ("note", "content", lambda: notes.search(text, by_content=True)),
+    ]
+    digits = re.sub(r"\D", "", text)
+    if len(digits) >= MIN_PHONE_DIGITS:
+        tasks.insert(1, ("contact", "phone", lambda: book.find_by_phone(digits)))
+    return tasks
+
+
+def search_all(text: str, book, notes) -> Iterator[FieldResult]:
+    """
+    Search every field of the contacts and notes at once.
+
+    Each field is searched in its own thread, and the results are yielded as
+    soon as each field finishes, so index lookups come back first while the
+    scans are still running. The latency of every field is recorded as
+    "search.<kind>.<field>".
+
+    Args:
+        text (str): The text to look for.
+        book (AddressBook): The contacts.
+        notes (NotesBook): The notes.
+
+    Yields:
+        FieldResult: The matches of one field, in the order the fields finish.
+    """
+    # deferred: concurrent.futures pulls in logging, which slows down startup
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    def run(kind: str, field: str, search) -> FieldResult:
+        with timer(f"search.{kind}.{field}"):
+            return FieldResult(kind, field, search() or [])
+
+    tasks = field_searches(text, book, notes)
+    with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+        futures = [executor.submit(run, *task) for task in tasks]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def rank(results: list[FieldResult], text: str) -> dict[str, list[Hit]]:
+    """
+    Merge the field results into one ranked list per kind.
+
+    An entry scores the weights of all fields it matched in, plus a bonus
+    when its name or title is the query or starts with it. Ties are broken
+    alphabetically.
+
+    Args:
+        results (list[FieldResult]): The results of `search_all`.
+        text (str): The text that was searched for.
+
+    Returns:
+        dict[str, list[Hit]]: The hits of "contact" and of "note", best first.
+    """
+    query = text.strip().casefold()
+    merged = {"contact": {}, "note": {}}  # kind -> item ID -> (item, fields)
+    for result in results:
+        for item in result.items:
+            _, fields = merged[result.kind].setdefault(item.id, (item, []))
+            fields.append(result.field)
+
+    ranked = {}
+    for kind, hits in merged.items():
+        entries = []
+        for item, fields in hits.values():
+            label = (item.name if kind == "contact" else item.title).value.casefold()
+            score = sum(FIELD_WEIGHTS[field] for field in fields)
+            if label == query:
+                score += EXACT_BONUS
+            elif label.startswith(query):
+                score += PREFIX_BONUS
+            entries.append((label, Hit(item, score, fields)))
+        entries.sort(key=lambda entry: (-entry[1].score, entry[0]))
+        ranked[kind] = [hit for _, hit in entries]
+    return ranked
@@ -1,6 +1,8 @@
 from models.contact import AddressBook
 from models.note import NotesBook
-from helpers.data_helper import save_data, load_data
+from helpers.data_helper import load_data
+from helpers.persistence import persist
+from helpers.commands import commands_list
 
 
 def parse_input(user_input) -> list[str]:
@@ -14,12 +16,21 @@ def parse_input(user_input) -> list[str]:
         list[str]: A list where the first element is the command (str) and
                 the subsequent elements are the arguments (list of strings).
 
-    This function supports parsing two-word commands (e.g., "add contact") and
-    additional arguments separated by spaces.
+    This function supports parsing two-word commands (e.g., "add contact"),
+    the known three-word commands (e.g., "contacts by city"), known one-word
+    commands followed by arguments (e.g., "search ivan") and additional
+    arguments separated by spaces.
     """
     parts = user_input.strip().split()
 
-    if len(parts) >= 2:
+    three_words = " ".join(parts[:3]).lower()
+    if len(parts) >= 3 and three_words in commands_list:
+        cmd = three_words
+        args = parts[3:]
+    elif parts and parts[0].lower() in commands_list:
+        cmd = parts[0].lower()
+        args = parts[1:]
+    elif len(parts) >= 2:
         cmd = f"{parts[0].lower()} {parts[1].lower()}"  # Support 2-word commands
         args = parts[2:]
     else:
@@ -37,8 +48,9 @@ def save_contacts(book) -> None:
         book (AddressBook): An instance of AddressBook containing contact data.
 
     The data is serialized using pickle and stored in a file named 'contacts.pkl'.
+    In deferred persistence mode the book is only marked dirty and written later.
     """
-    save_data(book, "contacts.pkl")
+    persist(book, "contacts.pkl")
 
 
 def load_contacts() -> AddressBook:
@@ -60,8 +72,9 @@ def save_notes(notes) -> None:
         notes (NotesBook): An instance of NotesBook containing notes data.
 
     The data is serialized using pickle and stored in a file named 'notes.pkl'.
+    In deferred persistence mode the notes are only marked dirty and written later.
     """
-    save_data(notes, "notes.pkl")
+    persist(notes, "notes.pkl")
 
 
 def load_notes() -> NotesBook:
@@ -0,0 +1,225 @@
+import re
+import threading
+from collections import defaultdict
+
+from helpers.aho_corasick import WordAutomaton
+from helpers.metrics import timed
+
+REBUILD_THRESHOLD = 50  # More name changes than this rebuild the automaton
+WORD = re.compile(r"\w+")
+
+
+def words_of(text: str) -> list[str]:
+    """
+    Split a text into case-folded words, in order.
+
+    Args:
+        text (str): The text, e.g. a note's content or a contact's name.
+
+    Returns:
+        list[str]: The words, e.g. ["met", "ivan", "petrenko"].
+    """
+    return WORD.findall(text.casefold())
+
+
+class MentionIndex:
+    """
+    Cross-reference between notes and the contacts whose names they mention.
+
+    The contact names are kept in a word-level Aho–Corasick automaton, so a
+    note's content is scanned once for all names, in time linear in its
+    length. The index watches both books: they report the IDs of the contacts
+    and notes that change, and before answering the index updates only those.
+
+    - A changed note is rescanned, a deleted one dropped.
+    - A renamed or deleted contact is removed from the automaton and from the
+      mentions. A new or renamed contact is added to the automaton, and only
+      the notes containing the first word of its name are rescanned.
+    - On the first use, or after more than REBUILD_THRESHOLD name changes
+      (e.g. after an import), the automaton is rebuilt and every note rescanned.
+    """
+
+    def __init__(self, book, notes) -> None:
+        """
+        Initialize a MentionIndex object.
+
+        Args:
+            book (AddressBook): The contacts.
+            notes (NotesBook): The notes.
+        """
+        self._book = book
+        self._notes = notes
+        self._automaton = WordAutomaton()
+        self._names = {}  # contact ID -> the name in the automaton
+        self._words_in = {}  # note ID -> the case-folded words of its content
+        self._notes_with = defaultdict(set)  # case-folded word -> IDs of notes
+        self._contacts_in = {}  # note ID -> IDs of the contacts it mentions
+        self._notes_about = defaultdict(set)  # contact ID -> IDs of notes
+        self._built = False  # whether the index has been built once
+        self._changed_contacts = set()  # IDs reported since the last refresh
+        self._changed_notes = set()  # the same, for notes
+        self._lock = threading.Lock()
+        # Guards the changed IDs only: the books report changes while holding
+        # their write lock, so reporting must never wait for `_lock`.
+        self._changes_lock = threading.Lock()
+        book.watch(self._contacts_changed)
+        notes.watch(self._notes_changed)
+
+    def _contacts_changed(self, *contact_ids: int) -> None:
+        """
+        Queue contacts that were added, renamed or deleted.
+
+        Args:
+            *contact_ids (int): The IDs of the contacts.
+        """
+        with self._changes_lock:
+            self._changed_contacts.update(contact_ids)
+
+    def _notes_changed(self, *note_ids: int) -> None:
+        """
+        Queue notes that were added, edited or deleted.
+
+        Args:
+            *note_ids (int): The IDs of the notes.
+        """
+        with self._changes_lock:
+            self._changed_notes.update(note_ids)
+
+    def _scan(self, note) -> None:
+        """
+        Find the contacts a note mentions and update both directions.
+
+        Args:
+            note (Note): The note, with the automaton up to date.
+        """
+        self._forget_note(note.id)
+        words = words_of(note.content or "")
+        self._words_in[note.id] = set(words)
+        for word in self._words_in[note.id]:
+            self._notes_with[word].add(note.id)
+        found = self._automaton.find(words)
+        if found:
+            self._contacts_in[note.id] = found
+            for contact_id in found:
+                self._notes_about[contact_id].add(note.id)
+
+    def _forget_note(self, note_id: int) -> None:
+        """
+        Drop the mentions and words of a note.
+
+        Args:
+            note_id (int): The ID of the note.
+        """
+        for word in self._words_in.pop(note_id, ()):
+            self._notes_with[word].discard(note_id)
+            if not self._notes_with[word]:
+                del self._notes_with[word]
+        for contact_id in self._contacts_in.pop(note_id, ()):
+            self._notes_about[contact_id].discard(note_id)
+
+    def _forget_contact(self, contact_id: int) -> None:
+        """
+        Drop a contact from the automaton and from the mentions.
+
+        Args:
+            contact_id (int): The ID of the contact.
+        """
+        name = self._names.pop(contact_id)
+        self._automaton.remove(tuple(words_of(name)), contact_id)
+        for note_id in self._notes_about.pop(contact_id, ()):
+            self._contacts_in[note_id].discard(contact_id)
+
+    def _rebuild(self) -> None:
+        """
+        Build the automaton from all contact names and scan every note.
+        """
+        names = {record.id: record.name.value for record in self._book.snapshot()}
+        self._automaton = WordAutomaton(
+            (tuple(words_of(name)), contact_id) for contact_id, name in names.items()
+        )
+        self._names = names
+        self._words_in.clear()
+        self._notes_with.clear()
+        self._contacts_in.clear()
+        self._notes_about.clear()
+        for note in self._notes.snapshot():
+            self._scan(note)
+        self._built = True
+
+    def _update_names(self, contact_ids: set) -> set:
+        """
+        Bring the automaton up to date with the names of some contacts.
+
+        Args:
+            contact_ids (set): The IDs of the contacts that changed.
+
+        Returns:
+            set: The IDs of the notes that may mention a new or renamed contact.
+        """
+        first_words = set()
+        for contact_id in contact_ids:
+            record = self._book.get(contact_id)
+            name = None if record is None else record.name.value
+            if self._names.get(contact_id) == name:
+                continue
+            if contact_id in self._names:
+                self._forget_contact(contact_id)
+            if name is not None:
+                words = words_of(name)
+                self._automaton.add(tuple(words), contact_id)
+                self._names[contact_id] = name
+                first_words.update(words[:1])
+        # A note can only mention a new name if it contains its first word
+        return set().union(*(self._notes_with.get(word, ()) for word in first_words))
+
+    @timed("mentions.refresh")
+    def _refresh(self) -> None:
+        """
+        Bring the index up to date with the books. Call with the lock held.
+        """
+        with self._changes_lock:
+            contact_ids, self._changed_contacts = self._changed_contacts, set()
+            note_ids, self._changed_notes = self._changed_notes, set()
+        if not self._built or len(contact_ids) > REBUILD_THRESHOLD:
+            self._rebuild()
+            return
+        if contact_ids:
+            note_ids |= self._update_names(contact_ids)
+        for note_id in note_ids:
+            note = self._notes.get(note_id)
+            if note is None:
+                self._forget_note(note_id)
+            else:
+                self._scan(note)
+
+    def notes_mentioning(self, record) -> list:
+        """
+        Get the notes that mention a contact's name.
+
+        Args:
+            record (Record): The contact.
+
+        Returns:
+            list: The notes, in alphabetical order of their titles.
+        """
+        with self._lock:
+            self._refresh()
+            note_ids = list(self._notes_about.get(record.id, ()))
+        found = filter(None, map(self._notes.get, note_ids))
+        return sorted(found, key=lambda note: note.title.value.casefold())
+
+    def contacts_mentioned_in(self, note) -> list:
+        """
+        Get the contacts whose names a note mentions.
+
+        Args:
+            note (Note): The note.
+
+        Returns:
+            list: The contacts, in alphabetical order of their names.
+        """
+        with self._lock:
+            self._refresh()
+            contact_ids = list(self._contacts_in.get(note.id, ()))
+        found = filter(None, map(self._book.get, contact_ids))
+        return sorted(found, key=lambda record: record.name.value.casefold())
@@ -0,0 +1,257 @@
+import math
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Iterator
+
+BUCKET_BASE = 1.2  # Each histogram bucket is 20% wider than the previous one
+MIN_LATENCY = 1e-7  # Latencies are clamped to 0.1 µs before bucketing
+STARTUP_IMPORT_BUDGET = 0.1  # Target for importing main.py, in seconds
+
+_imported_at = time.perf_counter()
+
+
+class Histogram:
+    """
+    Log-scale latency histogram with bounded memory.
+
+    Latencies are counted in buckets whose bounds grow geometrically, so
+    percentiles are accurate to roughly one bucket width (20%) no matter how
+    many samples are recorded.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize a Histogram object.
+        """
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """
+        Add one latency sample.
+
+        Args:
+            seconds (float): The measured latency in seconds.
+        """
+        index = int(math.log(max(seconds, MIN_LATENCY) / MIN_LATENCY, BUCKET_BASE))
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, p: float) -> float:
+        """
+        Estimate a percentile from the histogram.
+
+        Args:
+            p (float): The percentile to estimate, between 0 and 100.
+
+        Returns:
+            float: Upper bound of the bucket containing the percentile, in seconds.
+        """
+        if not self.count:
+            return 0.0
+        rank = math.ceil(self.count * p / 100)
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(MIN_LATENCY * BUCKET_BASE ** (index + 1), self.max)
+        return self.max
+
+
+_histograms = {}
+_lock = threading.Lock()
+
+
+def record(name: str, seconds: float) -> None:
+    """
+    Record a latency sample for an operation.
+
+    Args:
+        name (str): The operation name, e.g. "AddressBook.find".
+        seconds (float): The measured latency in seconds.
+    """
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = Histogram()
+        histogram.record(seconds)
+
+
+@contextmanager
+def timer(name: str) -> Iterator[None]:
+    """
+    Measure the latency of a `with` block and record it under the given name.
+
+    Args:
+        name (str): The operation name.
+
+    Yields:
+        None
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start)
+
+
+def timed(name: str | None = None):
+    """
+    Decorator that records the latency of every call to a function.
+
+    Args:
+        name (str, optional): The operation name. Defaults to the function's
+                              qualified name, e.g. "AddressBook.find".
+
+    Returns:
+        function: A decorator wrapping the target function with timing.
+    """
+
+    def decorator(func):
+        label = name or func.__qualname__
+
+        @wraps(func)
+        def inner(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(label, time.perf_counter() - start)
+
+        return inner
+
+    return decorator
+
+
+def get_stats() -> list[dict]:
+    """
+    Summarize all recorded operations.
+
+    Returns:
+        list[dict]: One dictionary per operation with its name, call count,
+                    p50/p95/p99/max and total latency in seconds,
+                    sorted by total time spent (highest first).
+    """
+    with _lock:
+        stats = [
+            {
+                "name": name,
+                "count": histogram.count,
+                "p50": histogram.percentile(50),
+                "p95": histogram.percentile(95),
+                "p99": histogram.percentile(99),
+                "max": histogram.max,
+                "total": histogram.total,
+            }
+            for name, histogram in _histograms.items()
+        ]
+    return sorted(stats, key=lambda item: item["total"], reverse=True)
+
+
+def reset() -> None:
+    """
+    Discard all recorded latency samples.
+    """
+    with _lock:
+        _histograms.clear()
+
+
+def process_uptime() -> float:
+    """
+    Get the wall-clock time since the process started.
+
+    Reads the process start time from /proc on Linux (10 ms resolution). On
+    other systems it falls back to the time since this module was imported,
+    which leaves out interpreter startup.
+
+    Returns:
+        float: Seconds since the process started.
+    """
+    try:
+        with open("/proc/self/stat") as f:
+            # Fields after the command name; the start time is field 22 overall
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return uptime - int(fields[19]) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return time.perf_counter() - _imported_at
+
+
+def profile_call(func, *args, limit: int = 25, **kwargs) -> tuple[object, str]:
+    """
+    Run a single call under cProfile.
+
+    Args:
+        func (function): The function to profile.
+        *args: Positional arguments for the function.
+        limit (int, optional): Number of entries to include in the report. Defaults to 25.
+        **kwargs: Keyword arguments for the function.
+
+    Returns:
+        tuple[object, str]: The function's return value and the profile report
+                            sorted by cumulative time.
+    """
+    import cProfile, io, pstats  # deferred: only needed when profiling
+
+    profiler = cProfile.Profile()
+    try:
+        result = profiler.runcall(func, *args, **kwargs)
+    finally:
+        report = io.StringIO()
+        pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(
+            limit
+        )
+    return result, report.getvalue()
+
+
+def profile_imports(module: str = "main") -> list[dict]:
+    """
+    Measure the import cost of a module and everything it imports.
+
+    Imports the module in a fresh interpreter with `-X importtime`, so the
+    numbers reflect a cold start rather than modules already loaded here.
+
+    Args:
+        module (str, optional): The module to import. Defaults to "main".
+
+    Returns:
+        list[dict]: One dictionary per imported module with its name, own
+                    ("self") and cumulative import time in seconds, in import
+                    order; the last entry is `module` itself.
+
+    Raises:
+        RuntimeError: If the module fails to import.
+    """
+    import subprocess  # deferred: only needed when profiling
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    if result.returncode:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:") :].split("|")
+        imports.append(
+            {
+                "name": name.strip(),
+                "self": int(own) / 1e6,
+                "cumulative": int(cumulative) / 1e6,
+            }
+        )
+    return imports
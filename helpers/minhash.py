@@ -0,0 +1,220 @@
+import heapq
+import re
+from array import array
+from zlib import crc32
+
+NUM_BINS = 32  # Values in a signature
+BANDS = 16  # LSH bands; NUM_BINS / BANDS values per band
+SHINGLE_WORDS = 3  # Words per shingle
+MIN_SIMILARITY = 0.2  # Lower Jaccard estimates aren't reported as related
+
+_ROWS = NUM_BINS // BANDS
+_BIN_BITS = (NUM_BINS - 1).bit_length()
+_VALUE_BITS = 64 - _BIN_BITS
+_VALUE_MASK = (1 << _VALUE_BITS) - 1
+_MULTIPLIER = 0x9E3779B97F4A7C15  # Spreads the 32-bit CRC over 64 bits
+_MASK = (1 << 64) - 1
+_EMPTY = _MASK  # Larger than any value, so any shingle replaces it
+_WORD = re.compile(r"\w+")
+
+
+def signature(text: str | None) -> array | None:
+    """
+    Compute the MinHash signature of a text from its word shingles.
+
+    Uses one-permutation MinHash: every shingle is hashed once (a stable
+    CRC32, so signatures can be saved), the hash picks one of NUM_BINS bins
+    and the bin keeps its smallest hash. Bins no shingle fell into borrow the
+    value of the next filled bin ("densification by rotation"). Two texts
+    agree in a bin with a probability close to the Jaccard similarity of
+    their shingle sets, like classic MinHash with NUM_BINS hash functions,
+    but in one pass over the shingles.
+
+    Args:
+        text (str): The text, e.g. a note's content.
+
+    Returns:
+        array or None: NUM_BINS unsigned 64-bit values, or None for a text
+                       without words.
+    """
+    words = _WORD.findall((text or "").casefold())
+    if not words:
+        return None
+    shingles = {
+        " ".join(words[start : start + SHINGLE_WORDS])
+        for start in range(max(len(words) - SHINGLE_WORDS + 1, 1))
+    }
+
+    bins = [_EMPTY] * NUM_BINS
+    for shingle in shingles:
+        value = (crc32(shingle.encode()) * _MULTIPLIER) & _MASK
+        index, value = value >> _VALUE_BITS, value & _VALUE_MASK
+        if value < bins[index]:
+            bins[index] = value
+
+    dense = array("Q", bins)
+    for index, value in enumerate(bins):
+        if value == _EMPTY:
+            distance = 1
+            while bins[(index + distance) % NUM_BINS] == _EMPTY:
+                distance += 1
+            borrowed = bins[(index + distance) % NUM_BINS]
+            # The distance is mixed in so a borrowed value never equals a real one
+            dense[index] = borrowed + (distance << _VALUE_BITS)
+    return dense
+
+
+def similarity(first: array, second: array) -> float:
+    """
+    Estimate the Jaccard similarity of two texts from their signatures.
+
+    Args:
+        first (array): The signature of one text.
+        second (array): The signature of the other.
+
+    Returns:
+        float: The share of equal values, from 0.0 to 1.0.
+    """
+    return sum(a == b for a, b in zip(first, second)) / NUM_BINS
+
+
+class LSHIndex:
+    """
+    MinHash signatures bucketed by locality-sensitive hashing (LSH).
+
+    Each signature is cut into BANDS bands and stored in one bucket per band.
+    Texts that share any band become candidates, so similar texts are found
+    by looking up BANDS buckets instead of comparing with every other text:
+    with 2 values per band, texts with a Jaccard similarity of 0.3 share a
+    band with a probability of about 0.8, and at 0.05 of about 0.04.
+
+    Most buckets hold a single key, which is stored as is; a set is only
+    made for buckets shared by several keys, to save memory.
+
+    Save the signatures from `signatures()` and pass them to the constructor
+    to restore the index: the buckets are cheap to rebuild, the signatures
+    are not.
+    """
+
+    def __init__(self, signatures: dict | None = None) -> None:
+        """
+        Initialize an LSHIndex object.
+
+        Args:
+            signatures (dict, optional): key -> signature pairs to add.
+        """
+        self._signatures = {}  # key -> signature
+        self._buckets = [{} for _ in range(BANDS)]  # band hash -> key(s), per band
+        for key, sig in (signatures or {}).items():
+            self.add(key, sig)
+
+    def signatures(self) -> dict:
+        """
+        Get a copy of the signatures, e.g. to save them.
+
+        Returns:
+            dict: key -> signature.
+        """
+        return dict(self._signatures)
+
+    def __contains__(self, key) -> bool:
+        """
+        Check whether a key has a signature in the index.
+
+        Args:
+            key: The key, e.g. a note ID.
+
+        Returns:
+            bool: True if the key is indexed.
+        """
+        return key in self._signatures
+
+    @staticmethod
+    def _bands(sig: array):
+        """
+        Yield the bucket key of every band of a signature.
+
+        Args:
+            sig (array): The signature.
+
+        Yields:
+            tuple[int, int]: The index of the band and the hash of its values.
+        """
+        values = sig.tolist()
+        for band in range(BANDS):
+            yield band, hash(tuple(values[band * _ROWS : (band + 1) * _ROWS]))
+
+    def add(self, key, sig: array) -> None:
+        """
+        Add or replace the signature of a key.
+
+        Args:
+            key: The key, e.g. a note ID.
+            sig (array): Its signature.
+        """
+        old = self._signatures.get(key)
+        if old == sig:
+            return
+        if old is not None:
+            self.discard(key)
+        self._signatures[key] = sig
+        for band, bucket in self._bands(sig):
+            buckets = self._buckets[band]
+            keys = buckets.get(bucket)
+            if keys is None:
+                buckets[bucket] = key
+            elif isinstance(keys, set):
+                keys.add(key)
+            else:
+                buckets[bucket] = {keys, key}
+
+    def discard(self, key) -> None:
+        """
+        Remove the signature of a key, if it has one.
+
+        Args:
+            key: The key, e.g. a note ID.
+        """
+        sig = self._signatures.pop(key, None)
+        if sig is None:
+            return
+        for band, bucket in self._bands(sig):
+            buckets = self._buckets[band]
+            keys = buckets[bucket]
+            if not isinstance(keys, set):
+                del buckets[bucket]
+                continue
+            keys.discard(key)
+            if len(keys) == 1:
+                buckets[bucket] = keys.pop()
+
+    def similar(self, key, limit: int) -> list[tuple[object, float]]:
+        """
+        Find the keys whose signatures are most similar to a key's signature.
+
+        Only the keys sharing a bucket with it are compared, then ranked by
+        the Jaccard estimate; estimates below MIN_SIMILARITY are left out.
+
+        Args:
+            key: The key, e.g. a note ID.
+            limit (int): The maximum number of keys returned.
+
+        Returns:
+            list[tuple]: (key, estimated similarity) pairs, most similar first.
+        """
+        sig = self._signatures.get(key)
+        if sig is None:
+            return []
+        candidates = set()
+        for band, bucket in self._bands(sig):
+            keys = self._buckets[band][bucket]
+            if isinstance(keys, set):
+                candidates |= keys
+            else:
+                candidates.add(keys)
+        candidates.discard(key)
+        scored = (
+            (other, similarity(sig, self._signatures[other])) for other in candidates
+        )
+        related = [(other, score) for other, score in scored if score >= MIN_SIMILARITY]
+        return heapq.nlargest(limit, related, key=lambda pair: pair[1])
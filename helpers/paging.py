@@ -0,0 +1,40 @@
+import heapq
+from itertools import islice
+from typing import Callable, Iterable
+
+PAGE_SIZE = 20  # Results shown per page by the find commands
+
+
+def take_page(
+    matches: Iterable,
+    limit: int | None = None,
+    offset: int = 0,
+    sort_key: Callable | None = None,
+    reverse: bool = False,
+) -> list:
+    """
+    Pick one page of search results without sorting or keeping all of them.
+
+    Without a sort key the matches are consumed lazily, so a scan stops as
+    soon as `offset + limit` results are found. With a sort key only the best
+    `offset + limit` results are kept in a heap while the matches are
+    consumed: O(n log k) time and O(k) memory instead of sorting all n.
+
+    Args:
+        matches (Iterable): The results, e.g. a generator over a snapshot.
+        limit (int, optional): The page size. Defaults to None, all results.
+        offset (int, optional): Results to skip. Defaults to 0.
+        sort_key (function, optional): Orders the results, like `sorted()`.
+        reverse (bool, optional): Largest keys first. Defaults to False.
+
+    Returns:
+        list: The results of the page, in order.
+    """
+    if limit is None:
+        if sort_key is not None:
+            matches = sorted(matches, key=sort_key, reverse=reverse)
+        return list(islice(matches, offset, None))
+    if sort_key is None:
+        return list(islice(matches, offset, offset + limit))
+    select = heapq.nlargest if reverse else heapq.nsmallest
+    return select(offset + limit, matches, key=sort_key)[offset:]
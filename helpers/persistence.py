@@ -0,0 +1,202 @@
+import atexit
+import signal
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from helpers.data_helper import save_data
+
+AUTOSAVE_INTERVAL = 30  # Seconds between background flushes in deferred mode
+
+_stores = {}  # filename -> object, everything that close() must save
+_dirty = {}  # filename -> object changed since it was last written
+_lock = threading.RLock()
+_deferred = threading.Event()
+_autosave = None
+_signal_received = None  # SIGINT or SIGTERM, once one has interrupted the bot
+_signal_deferred = False  # a signal arrived inside `signals_deferred()`
+_local = threading.local()  # depth: nesting of `signals_deferred()` blocks
+
+
+def register_store(filename: str, data_object) -> None:
+    """
+    Register an object that must be saved when the application shuts down.
+
+    Args:
+        filename (str): The data file of the object, e.g. "contacts.pkl".
+        data_object: The object to save, e.g. the AddressBook.
+    """
+    with _lock:
+        _stores[filename] = data_object
+
+
+def persist(data_object, filename: str) -> None:
+    """
+    Save an object now, or mark it dirty when deferred persistence is enabled.
+
+    Args:
+        data_object: The object to save.
+        filename (str): The data file to save it to.
+    """
+    if _deferred.is_set():
+        with _lock:
+            _dirty[filename] = data_object
+        return
+    save_data(data_object, filename)
+    with _lock:
+        _dirty.pop(filename, None)
+
+
+def flush(force: bool = False) -> list[str]:
+    """
+    Write all dirty objects to disk in parallel.
+
+    Args:
+        force (bool, optional): Also write registered objects that are not
+                                dirty. Defaults to False.
+
+    Returns:
+        list[str]: The names of the files that were written.
+
+    Raises:
+        OSError: If a file cannot be written; objects that failed stay dirty.
+    """
+    with _lock:
+        pending = {**_stores, **_dirty} if force else dict(_dirty)
+        _dirty.clear()
+    if not pending:
+        return []
+
+    # deferred: concurrent.futures pulls in logging, which slows down startup
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+        futures = {
+            filename: executor.submit(save_data, data_object, filename)
+            for filename, data_object in pending.items()
+        }
+    errors = []
+    for filename, future in futures.items():
+        if future.exception():
+            errors.append(future.exception())
+            with _lock:
+                _dirty.setdefault(filename, pending[filename])
+    if errors:
+        raise errors[0]
+    return list(pending)
+
+
+def _autosave_loop(interval: float) -> None:
+    """
+    Flush dirty objects every `interval` seconds. Runs in a daemon thread.
+
+    Args:
+        interval (float): Seconds between flushes.
+    """
+    while True:
+        time.sleep(interval)
+        try:
+            flush()
+        except Exception as e:  # keep autosaving after any failure
+            print(f"Autosave failed: {e!r}", file=sys.stderr)
+
+
+def enable_deferred(interval: float | None = AUTOSAVE_INTERVAL) -> None:
+    """
+    Batch writes: saves only mark objects dirty and are flushed later.
+
+    Dirty objects are written by `flush()` on close, at exit and after
+    SIGINT/SIGTERM (see `exit_interrupted()`), and every `interval`
+    seconds in the background.
+
+    Args:
+        interval (float, optional): Seconds between background flushes, or None
+                                    to flush only on shutdown. Defaults to
+                                    AUTOSAVE_INTERVAL.
+    """
+    global _autosave
+    _deferred.set()
+    if interval and _autosave is None:
+        _autosave = threading.Thread(
+            target=_autosave_loop, args=(interval,), name="autosave", daemon=True
+        )
+        _autosave.start()
+
+
+@contextmanager
+def signals_deferred():
+    """
+    Hold back SIGINT/SIGTERM while a block runs, e.g. a commit and its save.
+
+    A signal received inside the block only sets a flag; the interrupt is
+    raised once the outermost such block has finished, so the block is never
+    stopped halfway. Signals are handled in the main thread only, so blocks
+    in other threads are never interrupted anyway.
+
+    Raises:
+        KeyboardInterrupt: After the block, if a signal was held back.
+    """
+    global _signal_deferred
+    depth = getattr(_local, "depth", 0)
+    _local.depth = depth + 1
+    try:
+        yield
+    finally:
+        _local.depth = depth
+        if not depth and _signal_deferred:
+            _signal_deferred = False
+            raise KeyboardInterrupt
+
+
+def _handle_signal(signum, frame) -> None:
+    """
+    Interrupt the main thread when SIGINT or SIGTERM is received.
+
+    Nothing is saved here: the handler may run while the interrupted code
+    holds a book's write lock, and a save needs the read lock. The raised
+    KeyboardInterrupt unwinds the command, releasing its locks, and the main
+    loop then calls `exit_interrupted()`. Inside `signals_deferred()` the
+    interrupt is raised when the block ends instead.
+
+    Args:
+        signum (int): The received signal.
+        frame: The current stack frame (unused).
+
+    Raises:
+        KeyboardInterrupt: Unless the signal is held back.
+    """
+    global _signal_received, _signal_deferred
+    _signal_received = signum
+    if getattr(_local, "depth", 0):
+        _signal_deferred = True
+        return
+    raise KeyboardInterrupt
+
+
+def exit_interrupted() -> None:
+    """
+    Flush dirty objects and exit after SIGINT or SIGTERM (or Ctrl-C).
+
+    Call from the main loop once the interrupted command has unwound. Exits
+    with status 128 + the signal number.
+    """
+    signum = _signal_received or signal.SIGINT
+    name = signal.Signals(signum).name
+    try:
+        flush()
+        print(f"\nInterrupted ({name}), all data saved.")
+    except Exception as e:
+        print(f"\nInterrupted ({name}), saving failed: {e}", file=sys.stderr)
+    sys.exit(128 + signum)
+
+
+def install_shutdown_handlers() -> None:
+    """
+    Flush dirty objects at interpreter exit, and interrupt on SIGINT/SIGTERM.
+
+    Must be called from the main thread.
+    """
+    atexit.register(flush)
+    signal.signal(signal.SIGINT, _handle_signal)
+    signal.signal(signal.SIGTERM, _handle_signal)
@@ -0,0 +1,75 @@
+import re
+
+# Soundex digit for every consonant; vowels, H, W and Y have none
+_SOUNDEX_CODES = {
+    **dict.fromkeys("BFPV", "1"),
+    **dict.fromkeys("CGJKQSXZ", "2"),
+    **dict.fromkeys("DT", "3"),
+    "L": "4",
+    **dict.fromkeys("MN", "5"),
+    "R": "6",
+}
+
+
+def soundex(word: str) -> str:
+    """
+    Encode a word with American Soundex, e.g. "Petrenko" -> "P365".
+
+    Words that sound alike get the same four character code, so spelling
+    variants such as "Petrenko" and "Petrenkoo" or "Smith" and "Smyth" match.
+
+    Args:
+        word (str): The word to encode. Non-letters are ignored.
+
+    Returns:
+        str: The code, or "" if the word has no letters.
+    """
+    letters = re.sub(r"[^A-Z]", "", word.upper())
+    if not letters:
+        return ""
+
+    code = letters[0]
+    last = _SOUNDEX_CODES.get(letters[0], "")
+    for letter in letters[1:]:
+        digit = _SOUNDEX_CODES.get(letter, "")
+        if digit and digit != last:
+            code += digit
+            if len(code) == 4:
+                break
+        if letter not in "HW":  # H and W don't separate equal digits
+            last = digit
+    return code.ljust(4, "0")
+
+
+def word_codes(name: str) -> set[str]:
+    """
+    Get the Soundex codes of the words of a name, for the phonetic index.
+
+    Words made of digits are kept as they are.
+
+    Args:
+        name (str): The name to encode.
+
+    Returns:
+        set[str]: The codes of the words, e.g. {"I150", "P365"}.
+    """
+    codes = (word if word.isdigit() else soundex(word) for word in name.split())
+    return {code for code in codes if code}
+
+
+def name_code(name: str) -> str:
+    """
+    Encode a full name as the sorted Soundex codes of its words.
+
+    Words made of digits are kept as they are, so "Office 2" and "Office 3"
+    stay apart. Word order doesn't matter: "Ivan Petrenko" and
+    "Petrenko Ivan" get the same code.
+
+    Args:
+        name (str): The name to encode.
+
+    Returns:
+        str: The codes separated by spaces, e.g. "I150 P365".
+    """
+    codes = (word if word.isdigit() else soundex(word) for word in name.split())
+    return " ".join(sorted(code for code in codes if code))
@@ -0,0 +1,379 @@
+import re
+import sys
+from functools import lru_cache
+from typing import Callable, Iterable, NamedTuple
+
+PATTERN_CACHE_SIZE = 128  # Compiled and analysed patterns kept by compile_pattern
+REGEX_TIMEOUT = 2.0  # Seconds a regex search may run before it is stopped
+MAX_PATTERN_LENGTH = 300  # Longer patterns are rejected
+MAX_UNBOUNDED_REPEATS = 3  # Patterns with more "*", "+" or "{n,}" are rejected
+MAX_TEXT_LENGTH = 10_000  # Characters of a value the pattern is matched against
+
+_QUANTIFIER = re.compile(r"\{(\d*)(,?)(\d*)\}")
+# Opening of a group whose content is a pattern: (?:, (?>, (?=, (?<!, (?P<name>...
+_GROUP_START = re.compile(
+    r"\?(?:[:>=!]|<[=!]|P?<\w+>|\([^)]*\)|[aiLmsux]*(?:-[imsx]+)?:)"
+)
+# Groups without a pattern inside: comments, backreferences and global flags
+_GROUP_WHOLE = re.compile(r"\?(?:#[^)]*|P=\w+|[aiLmsux]+)\)")
+_CONTROL_ESCAPES = {"a": "\a", "f": "\f", "n": "\n", "r": "\r", "t": "\t", "v": "\v"}
+_HEX_ESCAPES = {"x": 2, "u": 4, "U": 8}
+
+
+class _Repeat(NamedTuple):
+    """A quantifier: `high` is None for an unbounded one, like "*" or "{2,}"."""
+
+    low: int
+    high: int | None
+    possessive: bool
+
+
+class _Atom(NamedTuple):
+    """
+    One item of a scanned pattern.
+
+    `kind` is "literal" (`text` is the character), "start" for "^", "group"
+    (`group` holds its alternatives) or "other" for classes, escapes like
+    "\\d" and anchors.
+    """
+
+    kind: str
+    text: str = ""
+    group: list | None = None
+    repeat: _Repeat | None = None
+
+
+def _escape(pattern: str, pos: int) -> tuple[_Atom, int]:
+    """
+    Scan an escape sequence.
+
+    Args:
+        pattern (str): The pattern.
+        pos (int): The position of the backslash.
+
+    Returns:
+        tuple[_Atom, int]: The atom and the position after the escape.
+    """
+    char = pattern[pos + 1 : pos + 2]
+    pos += 2
+    if not char.isalnum():
+        return _Atom("literal", char), pos
+    if char in _CONTROL_ESCAPES:
+        return _Atom("literal", _CONTROL_ESCAPES[char]), pos
+    if char in _HEX_ESCAPES:
+        end = pos + _HEX_ESCAPES[char]
+        return _Atom("literal", chr(int(pattern[pos:end], 16))), end
+    if char == "N":
+        return _Atom("other"), pattern.index("}", pos) + 1
+    while char.isdigit() and pattern[pos : pos + 1].isdigit():
+        pos += 1  # backreference or octal escape
+    return _Atom("other"), pos
+
+
+def _skip_class(pattern: str, pos: int) -> int:
+    """
+    Skip a character class like "[^a-z\\]]".
+
+    Args:
+        pattern (str): The pattern.
+        pos (int): The position of the "[".
+
+    Returns:
+        int: The position after the closing "]".
+    """
+    pos += 1
+    if pattern[pos : pos + 1] == "^":
+        pos += 1
+    if pattern[pos : pos + 1] == "]":
+        pos += 1
+    while pattern[pos] != "]":
+        pos += 2 if pattern[pos] == "\\" else 1
+    return pos + 1
+
+
+def _quantifier(pattern: str, pos: int) -> tuple[_Repeat | None, int]:
+    """
+    Scan the quantifier after an atom, if there is one.
+
+    Args:
+        pattern (str): The pattern.
+        pos (int): The position after the atom.
+
+    Returns:
+        tuple[_Repeat | None, int]: The quantifier and the position after it.
+    """
+    char = pattern[pos : pos + 1]
+    if char in ("*", "+", "?"):
+        low, high = {"*": (0, None), "+": (1, None), "?": (0, 1)}[char]
+        pos += 1
+    elif match := _QUANTIFIER.match(pattern, pos):
+        low = int(match[1] or 0)
+        high = int(match[3]) if match[3] else (None if match[2] else low)
+        pos = match.end()
+    else:
+        return None, pos
+    suffix = pattern[pos : pos + 1]
+    if suffix in ("?", "+"):
+        pos += 1
+    return _Repeat(low, high, suffix == "+"), pos
+
+
+def _scan(pattern: str, pos: int = 0) -> tuple[list[list[_Atom]], int]:
+    """
+    Scan a valid pattern, or the rest of a group, into its alternatives.
+
+    Only the structure needed to judge the pattern is kept: literal
+    characters, groups and quantifiers.
+
+    Args:
+        pattern (str): The pattern, already accepted by `re.compile`.
+        pos (int, optional): Where to start. Defaults to 0.
+
+    Returns:
+        tuple[list[list[_Atom]], int]: The alternatives, each a list of atoms,
+                                       and the position after the closing ")"
+                                       of the group (or the end).
+    """
+    alternatives = [[]]
+    while pos < len(pattern):
+        char = pattern[pos]
+        if char == ")":
+            return alternatives, pos + 1
+        if char == "|":
+            alternatives.append([])
+            pos += 1
+            continue
+        if char == "(":
+            if match := _GROUP_WHOLE.match(pattern, pos + 1):
+                atom, pos = _Atom("other"), match.end()
+            else:
+                match = _GROUP_START.match(pattern, pos + 1)
+                group, pos = _scan(pattern, match.end() if match else pos + 1)
+                atom = _Atom("group", group=group)
+        elif char == "[":
+            atom, pos = _Atom("other"), _skip_class(pattern, pos)
+        elif char == "\\":
+            atom, pos = _escape(pattern, pos)
+        elif char in ".$":
+            atom, pos = _Atom("other"), pos + 1
+        elif char == "^":
+            atom, pos = _Atom("start"), pos + 1
+        else:
+            atom, pos = _Atom("literal", char), pos + 1
+        repeat, pos = _quantifier(pattern, pos)
+        alternatives[-1].append(atom._replace(repeat=repeat))
+    return alternatives, pos
+
+
+def _may_vary(alternatives: list[list[_Atom]]) -> bool:
+    """
+    Check whether a scanned pattern can match the same text in several ways.
+
+    Args:
+        alternatives (list[list[_Atom]]): The scanned pattern.
+
+    Returns:
+        bool: True if it contains "|" or a repeat like "+", "*" or "{1,3}".
+    """
+    return len(alternatives) > 1 or any(
+        (atom.repeat and atom.repeat.low != atom.repeat.high)
+        or (atom.group and _may_vary(atom.group))
+        for alternative in alternatives
+        for atom in alternative
+    )
+
+
+def _unbounded_repeats(alternatives: list[list[_Atom]]) -> list[_Atom]:
+    """
+    Get the atoms repeated without an upper bound that can backtrack.
+
+    Possessive repeats like "a++" never give characters back, so they don't
+    count.
+
+    Args:
+        alternatives (list[list[_Atom]]): The scanned pattern.
+
+    Returns:
+        list[_Atom]: The repeated atoms, at any depth.
+    """
+    found = []
+    for alternative in alternatives:
+        for atom in alternative:
+            repeat = atom.repeat
+            if repeat and repeat.high is None and not repeat.possessive:
+                found.append(atom)
+            if atom.group:
+                found.extend(_unbounded_repeats(atom.group))
+    return found
+
+
+class RegexQuery(NamedTuple):
+    """
+    A compiled search pattern with the literal text every match must contain.
+
+    `prefix` is the literal text a match starts with when the pattern is
+    anchored with "^" (e.g. "admin@" for "^admin@"), or "". `literals` are the
+    lower-cased runs of literal characters found outside groups, alternatives
+    and optional parts, e.g. ("-",) for "[A-Z]+-\\d+".
+    """
+
+    pattern: re.Pattern
+    prefix: str
+    literals: tuple[str, ...]
+
+    def may_match(self, value: str) -> bool:
+        """
+        Check with plain substring tests whether a value can match at all.
+
+        Args:
+            value (str): The text to match, e.g. a name or an email.
+
+        Returns:
+            bool: False if the value lacks one of the required literals.
+        """
+        lowered = value.lower()
+        return all(literal in lowered for literal in self.literals)
+
+
+@lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def compile_pattern(pattern: str) -> RegexQuery:
+    """
+    Compile and analyse a search pattern, case-insensitively.
+
+    The result is cached, so paging through results or repeating a search
+    doesn't parse the pattern again.
+
+    Args:
+        pattern (str): The regular expression, e.g. "^admin@".
+
+    Returns:
+        RegexQuery: The compiled pattern with its literal prefix and literals.
+
+    Raises:
+        ValueError: If the pattern is invalid, too long, or could make the
+                    search hang: nested repeats like "(a+)+" or "(a|aa)+", or
+                    more than MAX_UNBOUNDED_REPEATS repeats like ".*".
+    """
+    if len(pattern) > MAX_PATTERN_LENGTH:
+        raise ValueError(f"Pattern is longer than {MAX_PATTERN_LENGTH} characters")
+    try:
+        compiled = re.compile(pattern, re.IGNORECASE)
+    except re.error as e:
+        raise ValueError(f"Invalid regular expression: {e}")
+
+    alternatives, _ = _scan(pattern)
+    repeats = _unbounded_repeats(alternatives)
+    if any(atom.group and _may_vary(atom.group) for atom in repeats):
+        raise ValueError(
+            "Repeats of repeats or alternatives like (a+)+ or (a|aa)+ can make "
+            "the search hang; rewrite the pattern, e.g. with a possessive (a+)++"
+        )
+    if len(repeats) > MAX_UNBOUNDED_REPEATS:
+        raise ValueError(
+            f"Patterns with more than {MAX_UNBOUNDED_REPEATS} repeats like .* or "
+            "\\w+ can make the search hang; make the pattern more specific"
+        )
+
+    # Whitespace doesn't count in verbose patterns, so their literals are unknown
+    if len(alternatives) > 1 or compiled.flags & re.VERBOSE:
+        return RegexQuery(compiled, "", ())
+    atoms = alternatives[0]
+    runs, run = [], []
+    for atom in atoms + [_Atom("other")]:  # the sentinel ends the last run
+        if atom.kind == "literal" and atom.repeat is None:
+            run.append(atom.text)
+        elif run:
+            runs.append("".join(run).lower())
+            run = []
+
+    prefix = ""
+    anchored = atoms[:1] == [_Atom("start")]
+    if anchored and not compiled.flags & re.MULTILINE:
+        for atom in atoms[1:]:
+            if atom.kind != "literal" or atom.repeat is not None:
+                break
+            prefix += atom.text
+    return RegexQuery(compiled, prefix, tuple(runs))
+
+
+def match_any(
+    query: RegexQuery,
+    items: Iterable,
+    texts_of: Callable[[object], Iterable[str]],
+    seconds: float = REGEX_TIMEOUT,
+) -> list:
+    """
+    Find the items with a value matching a pattern.
+
+    Values that lack a literal the pattern requires are skipped with a
+    substring test (see `RegexQuery.may_match`); the rest, cut to
+    MAX_TEXT_LENGTH characters, are matched in a worker process. A single
+    match can't be interrupted inside this process, so the worker is killed
+    if it doesn't finish in time.
+
+    Args:
+        query (RegexQuery): The pattern, from `compile_pattern`.
+        items (Iterable): The items to go through, e.g. records.
+        texts_of (function): Returns the values of an item to match.
+        seconds (float, optional): The time limit. Defaults to REGEX_TIMEOUT.
+
+    Returns:
+        list: The matching items, in their order.
+
+    Raises:
+        ValueError: If the time limit is reached or the worker fails.
+    """
+    candidates, batch = [], []
+    for item in items:
+        if item is None:
+            continue
+        texts = [text[:MAX_TEXT_LENGTH] for text in texts_of(item) if text]
+        texts = [text for text in texts if query.may_match(text)]
+        if texts:
+            candidates.append(item)
+            batch.append(texts)
+    if not batch:
+        return []
+
+    # deferred: only regex searches start a worker
+    import pickle
+    import subprocess
+
+    try:
+        worker = subprocess.run(
+            [sys.executable, "-I", __file__],
+            input=pickle.dumps((query.pattern, batch)),
+            capture_output=True,
+            timeout=seconds,
+            check=True,
+        )
+    except subprocess.TimeoutExpired:
+        raise ValueError(
+            f"The search took longer than {seconds:g}s and was stopped; "
+            "make the pattern more specific"
+        )
+    except (OSError, subprocess.CalledProcessError) as e:
+        raise ValueError(f"The regex search failed: {e}")
+    return [candidates[index] for index in pickle.loads(worker.stdout)]
+
+
+def _match_batch() -> None:
+    """
+    Match a pickled (pattern, batch) from stdin, in the worker process.
+
+    Writes the pickled indices of the entries of the batch with a matching
+    value to stdout.
+    """
+    import pickle
+
+    pattern, batch = pickle.load(sys.stdin.buffer)
+    found = [
+        index
+        for index, texts in enumerate(batch)
+        if any(pattern.search(text) for text in texts)
+    ]
+    pickle.dump(found, sys.stdout.buffer)
+
+
+if __name__ == "__main__":
+    _match_batch()
@@ -0,0 +1,83 @@
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class RWLock:
+    """
+    Reader-writer lock allowing many concurrent readers or a single writer.
+
+    Writers are preferred: once a writer is waiting, new readers queue behind it,
+    so a steady stream of readers cannot starve writes. Both sides are reentrant
+    for the thread that already holds the lock, and the writing thread may also
+    take the read lock. Upgrading a read lock to a write lock is not supported.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an RWLock object.
+        """
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None  # ident of the thread holding the write lock
+        self._write_depth = 0
+        self._writers_waiting = 0
+        self._local = threading.local()  # per-thread read lock depth
+
+    @contextmanager
+    def read_lock(self) -> Iterator[None]:
+        """
+        Acquire the lock for reading for the duration of a `with` block.
+
+        Yields:
+            None
+        """
+        me = threading.get_ident()
+        depth = getattr(self._local, "depth", 0)
+        counted = False
+        if depth == 0 and self._writer != me:
+            with self._cond:
+                while self._writer is not None or self._writers_waiting:
+                    self._cond.wait()
+                self._readers += 1
+            counted = True
+        self._local.depth = depth + 1
+        try:
+            yield
+        finally:
+            self._local.depth = depth
+            if counted:
+                with self._cond:
+                    self._readers -= 1
+                    if not self._readers:
+                        self._cond.notify_all()
+
+    @contextmanager
+    def write_lock(self) -> Iterator[None]:
+        """
+        Acquire the lock for writing for the duration of a `with` block.
+
+        Yields:
+            None
+        """
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._write_depth += 1
+            else:
+                self._writers_waiting += 1
+                try:
+                    while self._writer is not None or self._readers:
+                        self._cond.wait()
+                finally:
+                    self._writers_waiting -= 1
+                self._writer = me
+                self._write_depth = 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._write_depth -= 1
+                if not self._write_depth:
+                    self._writer = None
+                    self._cond.notify_all()
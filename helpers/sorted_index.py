@@ -0,0 +1,332 @@
+from bisect import bisect_left, bisect_right
+from itertools import accumulate, chain, count
+
+# Sorts after every real character, so `prefix + _MAX_CHAR` bounds all keys
+# that start with `prefix`.
+_MAX_CHAR = chr(0x10FFFF)
+BATCH_SIZE = 64  # PrefixIndex.update merges batches at least this large in one sort
+CHUNK_SIZE = 1000  # Keys per SortedIndex chunk; chunks are split at twice this size
+_versions = count()  # Unique across all indexes, so a rebuilt index never repeats one
+
+
+class SortedIndex:
+    """
+    String keys kept in sorted order, each mapped to an int value (an ID).
+
+    Backs the numbered selection menus: entry `n` of the menu is
+    `index[start + n - 1]`, and narrowing the menu by a typed prefix is two
+    binary searches instead of a scan over the book.
+
+    Keys are kept in sorted chunks of about CHUNK_SIZE keys, as in
+    sortedcontainers' SortedList, so an insert or delete only shifts one
+    chunk: O(log n + CHUNK_SIZE) instead of O(n) for one flat list. The
+    position of each chunk's first key is recomputed after a change, on the
+    next lookup by position (O(n / CHUNK_SIZE)), and lookups by position then
+    take O(log n).
+
+    `version` changes whenever a key is inserted or removed, i.e. whenever
+    positions found earlier may no longer be valid.
+    """
+
+    def __init__(self, items=()) -> None:
+        """
+        Initialize a SortedIndex object.
+
+        Args:
+            items (iterable, optional): (key, value) pairs with unique keys.
+        """
+        pairs = sorted(items, key=lambda pair: pair[0])
+        self._keys = []  # sorted chunks of keys, none empty
+        self._values = []  # the values, in chunks of the same shape
+        for start in range(0, len(pairs), CHUNK_SIZE):
+            chunk = pairs[start : start + CHUNK_SIZE]
+            self._keys.append([key for key, _ in chunk])
+            self._values.append([value for _, value in chunk])
+        self._maxes = [keys[-1] for keys in self._keys]  # last key of each chunk
+        self._len = len(pairs)
+        self._changed()
+
+    def _changed(self) -> None:
+        """
+        Drop the derived positions and bump `version` after an insert or delete.
+        """
+        self._starts = None  # position of the first key of each chunk
+        self._flat = None  # all keys in one list, built by `keys`
+        self.version = next(_versions)
+
+    def _locate(self, position: int) -> tuple[int, int]:
+        """
+        Find the chunk holding a position.
+
+        Args:
+            position (int): Zero-based position; negative counts from the end.
+
+        Returns:
+            tuple[int, int]: The index of the chunk and the position in it.
+
+        Raises:
+            IndexError: If the position is out of range.
+        """
+        if position < 0:
+            position += self._len
+        if not 0 <= position < self._len:
+            raise IndexError("SortedIndex position out of range")
+        if self._starts is None:
+            self._starts = [0, *accumulate(map(len, self._keys))]
+        chunk = bisect_right(self._starts, position) - 1
+        return chunk, position - self._starts[chunk]
+
+    def _bisect(self, key: str) -> int:
+        """
+        Find the position at which a key is or would be inserted.
+
+        Args:
+            key (str): The key.
+
+        Returns:
+            int: The position of the first key not less than `key`.
+        """
+        chunk = bisect_left(self._maxes, key)
+        if chunk == len(self._maxes):
+            return self._len
+        if self._starts is None:
+            self._starts = [0, *accumulate(map(len, self._keys))]
+        return self._starts[chunk] + bisect_left(self._keys[chunk], key)
+
+    def __len__(self) -> int:
+        """
+        Get the number of keys in the index.
+
+        Returns:
+            int: The number of keys.
+        """
+        return self._len
+
+    def __getitem__(self, position: int) -> int:
+        """
+        Get the value at a position in key order.
+
+        Args:
+            position (int): Zero-based position.
+
+        Returns:
+            int: The value stored with the key at that position.
+
+        Raises:
+            IndexError: If the position is out of range.
+        """
+        chunk, offset = self._locate(position)
+        return self._values[chunk][offset]
+
+    @property
+    def keys(self) -> list[str]:
+        """
+        Get all keys in sorted order, e.g. as choices for fuzzy matching.
+
+        The list is built on the first call after a change and then shared:
+        don't modify it, and hold the owner's lock while using it.
+
+        Returns:
+            list[str]: The keys.
+        """
+        if self._flat is None:
+            self._flat = list(chain.from_iterable(self._keys))
+        return self._flat
+
+    def key_at(self, position: int) -> str:
+        """
+        Get the key at a position in key order.
+
+        Args:
+            position (int): Zero-based position.
+
+        Returns:
+            str: The key at that position.
+
+        Raises:
+            IndexError: If the position is out of range.
+        """
+        chunk, offset = self._locate(position)
+        return self._keys[chunk][offset]
+
+    def get(self, key: str, default=None):
+        """
+        Get the value stored with a key.
+
+        Args:
+            key (str): The key to look up.
+            default (optional): Returned if the key is not present.
+
+        Returns:
+            int: The value, or `default`.
+        """
+        chunk = bisect_left(self._maxes, key)
+        if chunk == len(self._maxes):
+            return default
+        keys = self._keys[chunk]
+        offset = bisect_left(keys, key)
+        if keys[offset] == key:
+            return self._values[chunk][offset]
+        return default
+
+    def add(self, key: str, value: int) -> None:
+        """
+        Insert a key, or replace the value of an existing one.
+
+        Args:
+            key (str): The key to insert.
+            value (int): The value to store with it, e.g. a record ID.
+        """
+        if not self._maxes:
+            self._keys.append([key])
+            self._values.append([value])
+            self._maxes.append(key)
+            self._len = 1
+            self._changed()
+            return
+        chunk = min(bisect_left(self._maxes, key), len(self._maxes) - 1)
+        keys, values = self._keys[chunk], self._values[chunk]
+        offset = bisect_left(keys, key)
+        if offset < len(keys) and keys[offset] == key:
+            values[offset] = value
+            return
+        keys.insert(offset, key)
+        values.insert(offset, value)
+        self._maxes[chunk] = keys[-1]
+        if len(keys) >= 2 * CHUNK_SIZE:  # split in half
+            self._keys.insert(chunk + 1, keys[CHUNK_SIZE:])
+            self._values.insert(chunk + 1, values[CHUNK_SIZE:])
+            del keys[CHUNK_SIZE:], values[CHUNK_SIZE:]
+            self._maxes.insert(chunk, keys[-1])
+        self._len += 1
+        self._changed()
+
+    def discard(self, key: str) -> None:
+        """
+        Remove a key if it is present.
+
+        Args:
+            key (str): The key to remove.
+        """
+        chunk = bisect_left(self._maxes, key)
+        if chunk == len(self._maxes):
+            return
+        keys, values = self._keys[chunk], self._values[chunk]
+        offset = bisect_left(keys, key)
+        if keys[offset] != key:
+            return
+        del keys[offset], values[offset]
+        if keys:
+            self._maxes[chunk] = keys[-1]
+        else:
+            del self._keys[chunk], self._values[chunk], self._maxes[chunk]
+        self._len -= 1
+        self._changed()
+
+    def prefix_range(self, prefix: str, within: range | None = None) -> range:
+        """
+        Find the positions of all keys starting with a prefix.
+
+        Args:
+            prefix (str): The prefix to look for.
+            within (range, optional): Only search these positions, e.g. the
+                                      range found for a shorter prefix.
+
+        Returns:
+            range: The positions of the matching keys, possibly empty.
+        """
+        lo, hi = (within.start, within.stop) if within else (0, self._len)
+        start = min(max(self._bisect(prefix), lo), hi)
+        stop = min(max(self._bisect(prefix + _MAX_CHAR), start), hi)
+        return range(start, stop)
+
+
+class PrefixIndex:
+    """
+    (key, ID) pairs kept in sorted order, where many IDs may share a key.
+
+    Not a real trie, but a sorted list that answers the same queries: all
+    keys starting with a prefix sit next to each other, so a prefix query is
+    two binary searches plus a slice, and costs time proportional to the
+    number of matches rather than to the size of the index. The price is that
+    `add` and `discard` shift the list, O(n) per pair (one memmove, fast in
+    practice up to about a million pairs); `update` adds large batches with
+    one sort instead.
+    """
+
+    def __init__(self, pairs=()) -> None:
+        """
+        Initialize a PrefixIndex object.
+
+        Args:
+            pairs (iterable, optional): (key, ID) pairs.
+        """
+        self._pairs = sorted(set(pairs))
+
+    def __len__(self) -> int:
+        """
+        Get the number of (key, ID) pairs in the index.
+
+        Returns:
+            int: The number of pairs.
+        """
+        return len(self._pairs)
+
+    def add(self, key: str, value: int) -> None:
+        """
+        Add a (key, ID) pair unless it is already present.
+
+        Args:
+            key (str): The key.
+            value (int): The ID stored under it.
+        """
+        pair = (key, value)
+        position = bisect_left(self._pairs, pair)
+        if position == len(self._pairs) or self._pairs[position] != pair:
+            self._pairs.insert(position, pair)
+
+    def update(self, pairs) -> None:
+        """
+        Add many (key, ID) pairs that are not in the index yet.
+
+        Large batches are appended and merged in with one sort: the list is
+        already sorted, so Timsort only merges the new run in, instead of
+        shifting the list once per pair.
+
+        Args:
+            pairs (iterable): The (key, ID) pairs to add.
+        """
+        pairs = sorted(set(pairs))
+        if len(pairs) < BATCH_SIZE:
+            for key, value in pairs:
+                self.add(key, value)
+        else:
+            self._pairs.extend(pairs)
+            self._pairs.sort()
+
+    def discard(self, key: str, value: int) -> None:
+        """
+        Remove a (key, ID) pair if it is present.
+
+        Args:
+            key (str): The key.
+            value (int): The ID stored under it.
+        """
+        pair = (key, value)
+        position = bisect_left(self._pairs, pair)
+        if position < len(self._pairs) and self._pairs[position] == pair:
+            del self._pairs[position]
+
+    def search(self, prefix: str) -> set[int]:
+        """
+        Find the IDs stored under all keys that start with a prefix.
+
+        Args:
+            prefix (str): The prefix to look for.
+
+        Returns:
+            set[int]: The matching IDs.
+        """
+        start = bisect_left(self._pairs, (prefix,))
+        stop = bisect_left(self._pairs, (prefix + _MAX_CHAR,), start)
+        return {value for _, value in self._pairs[start:stop]}
@@ -1,10 +1,10 @@
 import time
-from rich.console import Console
-
-console = Console()
+from helpers.console import console
+from helpers.metrics import timed
 
 
 # MAKE TYPING EFFECT
+@timed("render.typing_effect")
 def typing_effect(text, color="sea_green3", s_style="normal"):
     """Function to mimic typing effect in the console with customizable color and style"""
     for char in text:
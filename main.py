@@ -1,13 +1,35 @@
-from fuzzywuzzy import process
+import argparse
 from services import contacts, notes
 from helpers.helpers import parse_input
 from helpers.commands import commands_list
-from services.shared import show_help, close, hello, goodbye, greeting
+from services.shared import (
+    show_help,
+    close,
+    hello,
+    goodbye,
+    greeting,
+    stats,
+    export_status,
+    search,
+)
 from helpers.typing_effect import typing_input, typing_output
-from rich.console import Console
-
-# Initialize Console for rich output
-console = Console()
+from helpers.metrics import (
+    timer,
+    profile_call,
+    profile_imports,
+    record,
+    process_uptime,
+    STARTUP_IMPORT_BUDGET,
+)
+from helpers.persistence import (
+    AUTOSAVE_INTERVAL,
+    enable_deferred,
+    exit_interrupted,
+    install_shutdown_handlers,
+)
+from data.state import wait_for_data, book, notes as notes_book
+from helpers.completion import install_completion
+from helpers.console import console
 
 
 def suggest_and_execute_command(cmd: str, args: list, func) -> bool:
@@ -25,7 +47,9 @@ def suggest_and_execute_command(cmd: str, args: list, func) -> bool:
     if not cmd or cmd.strip() == "":
         return False
 
-    # Get suggestion using fuzzywuzzy
+    # Get suggestion using fuzzywuzzy (imported here, it is slow to import)
+    from fuzzywuzzy import process
+
     match = process.extractOne(cmd.strip().lower(), commands_list)
 
     if match and match[1] >= 70:  # Only consider matches with score of 70 or higher
@@ -54,6 +78,21 @@ def execute_command(cmd: str, args: list) -> None:
         args (list): Additional arguments for the command.
 
     This function handles both contact-related and note-related commands.
+    The latency of every command is recorded (see the "stats" command).
+    The first command waits for the contacts and notes to finish loading.
+    """
+    wait_for_data()
+    with timer(f"command.{cmd}"):
+        run_command(cmd, args)
+
+
+def run_command(cmd: str, args: list) -> None:
+    """
+    Dispatch a command to its service function.
+
+    Args:
+        cmd (str): The command to execute.
+        args (list): Additional arguments for the command.
     """
     if cmd == "add contact":
         contacts.add()
@@ -65,6 +104,14 @@ def execute_command(cmd: str, args: list) -> None:
         contacts.all_birthdays()
     elif cmd == "export contacts":
         contacts.export_contacts_to_csv()
+    elif cmd == "import contacts":
+        contacts.import_contacts_from_csv()
+    elif cmd == "dedupe contacts":
+        contacts.dedupe_contacts()
+    elif cmd == "email domains":
+        contacts.email_domains()
+    elif cmd == "contacts by city":
+        contacts.contacts_by_city()
     elif cmd == "edit contact":
         contacts.edit_contact()
     elif cmd == "expand contact":
@@ -87,16 +134,105 @@ def execute_command(cmd: str, args: list) -> None:
         notes.display_note()
     elif cmd == "export notes":
         notes.export_notes_to_csv()
+    elif cmd == "export status":
+        export_status()
+    elif cmd == "search":
+        search(*args)
+
+
+def profile_command(user_input: str) -> None:
+    """
+    Run a single command under cProfile and print the hottest functions.
+
+    Args:
+        user_input (str): The command to profile, e.g. "find contact".
+    """
+    cmd, *args = parse_input(user_input)
+    if cmd not in commands_list:
+        console.print(
+            'Usage: profile <command>, e.g. [blue]"profile all contacts"[/]',
+            style="yellow italic",
+        )
+        return
+    _, report = profile_call(execute_command, cmd, args)
+    print("")
+    console.print(f"Profile of [sea_green3]{cmd}[/] (sorted by cumulative time):")
+    print(report)
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parse the command line options of the bot.
+
+    Returns:
+        argparse.Namespace: The parsed options.
+    """
+    parser = argparse.ArgumentParser(description="CliPyBot - contacts and notes")
+    parser.add_argument(
+        "--deferred-save",
+        action="store_true",
+        help="batch writes: save in the background and on exit instead of after "
+        "every change",
+    )
+    parser.add_argument(
+        "--autosave",
+        type=float,
+        default=AUTOSAVE_INTERVAL,
+        help="seconds between background saves with --deferred-save "
+        "(0 saves only on exit)",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="report the import time of every module at startup and exit",
+    )
+    return parser.parse_args()
+
+
+def profile_startup() -> None:
+    """
+    Print the slowest imports of a cold start against the startup budget.
+    """
+    from helpers.create_table import show_import_times_table
+
+    print("")
+    show_import_times_table(profile_imports("main"), 25, STARTUP_IMPORT_BUDGET)
+    print("")
 
 
 def main() -> None:
+    """
+    Run the bot, saving unsaved data and exiting when it is interrupted.
+
+    SIGINT/SIGTERM interrupt the running command; the data is flushed only
+    after the command has unwound and released its locks.
+    """
+    try:
+        run()
+    except KeyboardInterrupt:
+        exit_interrupted()
+
+
+def run() -> None:
     """
     Main function for the assistant bot that interacts with users.
 
     This bot provides functionalities for managing contacts and notes.
     It supports various commands to add, modify, delete, and export data.
+    Unsaved data is flushed on exit and on SIGINT/SIGTERM. Tab completes
+    commands, contact names, note titles and tags.
     """
+    args = parse_args()
+    if args.profile_startup:
+        profile_startup()
+        return
+    install_shutdown_handlers()
+    if args.deferred_save:
+        enable_deferred(args.autosave or None)
+
+    install_completion(book, notes_book, commands_list)
     greeting()
+    record("startup.first_prompt", process_uptime())
 
     while True:
         user_input = typing_input("Enter a command </>: ")
@@ -118,6 +254,10 @@ def main() -> None:
             hello()
         elif cmd == "help":
             show_help()
+        elif cmd == "stats":
+            stats()
+        elif cmd.split()[0] == "profile":
+            profile_command(user_input.strip()[len("profile") :])
         elif cmd == "goodbye":  # to close presentation
             goodbye()
             break
@@ -1,13 +1,24 @@
 import re
+import copy
 import datetime as dt
+from contextlib import contextmanager
+from collections import defaultdict
 from datetime import datetime as dtdt, timedelta
-from decorators.decorators import exception_handler, input_error
+from typing import Iterator
+from decorators.decorators import exception_handler, input_error, raise_errors
 from helpers.validators import (
     validate_and_normalize_phone,
     validate_email_str,
     validate_date_str,
 )
 from helpers.validators import standardize_name
+from helpers.rwlock import RWLock
+from helpers.sorted_index import PrefixIndex, SortedIndex
+from helpers.phonetic import word_codes
+from helpers.metrics import timed
+from helpers.paging import take_page
+from helpers.persistence import signals_deferred
+from helpers.regex_search import compile_pattern, match_any
 
 
 class Field:
@@ -27,6 +38,24 @@ class Field:
         """
         self.value = value
 
+    @classmethod
+    def from_valid(cls, value) -> "Field":
+        """
+        Create a field from a value that has already been validated.
+
+        Skips the validation done in `__init__`, e.g. for values that were
+        checked in a worker process.
+
+        Args:
+            value: The validated value.
+
+        Returns:
+            Field: A field of the calling class holding the value.
+        """
+        field = cls.__new__(cls)
+        field.value = value
+        return field
+
     def __str__(self) -> str:
         """
         Return string representation of the field.
@@ -204,6 +233,32 @@ class Address(Field):
         """
         super().__init__(address)
 
+    @staticmethod
+    def tokenize(text: str) -> set[str]:
+        """
+        Split an address, or a query, into lower-case word tokens.
+
+        Args:
+            text (str): The text to split, e.g. "Kyiv, Khreshchatyk 1, 01001".
+
+        Returns:
+            set[str]: The tokens, e.g. {"kyiv", "khreshchatyk", "1", "01001"}.
+        """
+        return set(re.findall(r"\w+", text.casefold()))
+
+    @staticmethod
+    def city_of(text: str) -> str:
+        """
+        Get the city of an address: the part before the first comma.
+
+        Args:
+            text (str): The address, e.g. "Kyiv, Khreshchatyk 1, 01001".
+
+        Returns:
+            str: The city, e.g. "Kyiv", or "" if the address is empty.
+        """
+        return text.split(",")[0].strip()
+
 
 class Record:
     """
@@ -213,6 +268,8 @@ class Record:
     birthday, and address.
     """
 
+    _owner = None  # The AddressBook holding this record, set by the book
+
     def __init__(self, name: str) -> None:
         """
         Initialize a Record object with a name.
@@ -220,12 +277,34 @@ class Record:
         Args:
             name (str): The name of the contact.
         """
+        self.id = None  # Assigned by the AddressBook the record is added to
         self.name = Name(name)
         self.phones = []
         self.emails = []
         self.birthday = None
         self.address = None
 
+    def __getstate__(self) -> dict:
+        """
+        Prepare the record for pickling and copying, without its address book.
+
+        Copies made with `copy.deepcopy` (e.g. by a Transaction) are therefore
+        detached: editing them doesn't touch the book's indexes.
+
+        Returns:
+            dict: The picklable state of the record.
+        """
+        state = self.__dict__.copy()
+        state.pop("_owner", None)
+        return state
+
+    def _changed(self) -> None:
+        """
+        Let the address book holding this record update its field indexes.
+        """
+        if self._owner is not None:
+            self._owner._reindex(self)
+
     # === PHONE ===
     @exception_handler
     def add_phone(self, phone: str) -> None:
@@ -239,6 +318,7 @@ class Record:
             ValueError: If the phone number format is invalid.
         """
         self.phones.append(Phone(phone))
+        self._changed()
 
     def find_phone(self, phone: str) -> Phone | None:
         """
@@ -270,6 +350,7 @@ class Record:
         for p in self.phones:
             if p.value == phone:
                 p.value = Phone(new_phone).value
+                self._changed()
                 return
         raise ValueError(f"Phone number {phone} is not found")
 
@@ -288,6 +369,7 @@ class Record:
         self.phones = [p for p in self.phones if p.value != phone]
         if len(self.phones) == before:
             raise ValueError(f"Phone number {phone} is not found")
+        self._changed()
 
     def add_email(self, email: str) -> None:
         """
@@ -300,6 +382,7 @@ class Record:
             ValueError: If the email format is invalid.
         """
         self.emails.append(Email(email))
+        self._changed()
 
     @exception_handler
     def change_email(self, old_email: str, new_email: str) -> None:
@@ -316,6 +399,7 @@ class Record:
         for i, email in enumerate(self.emails):
             if email.value == old_email:
                 self.emails[i] = Email(new_email)
+                self._changed()
                 return
         raise ValueError(f"Email '{old_email}' not found.")
 
@@ -334,6 +418,7 @@ class Record:
         self.emails = [e for e in self.emails if e.value != email]
         if len(self.emails) == before:
             raise ValueError(f"Email '{email}' not found.")
+        self._changed()
 
     def add_birthday(self, birthday: str) -> None:
         """
@@ -364,6 +449,7 @@ class Record:
             address (str): The address to add.
         """
         self.address = Address(address)
+        self._changed()
 
     @exception_handler
     def delete_address(self, name: str) -> None:
@@ -374,6 +460,7 @@ class Record:
             name (str): The name parameter (not used in the function).
         """
         self.address = None
+        self._changed()
 
     def __str__(self) -> str:
         """
@@ -402,29 +489,960 @@ class Record:
         address = self.address.value if self.address else None
         return name, phones, emails, birthday, address
 
+    @classmethod
+    def from_display_data(cls, data: tuple) -> "Record":
+        """
+        Rebuild a record from the tuple returned by `get_display_data()`.
+
+        The values are trusted and not validated again.
+
+        Args:
+            data (tuple): Name, phones list, emails list, birthday and address.
+
+        Returns:
+            Record: The rebuilt contact record.
+        """
+        name, phones, emails, birthday, address = data
+        record = cls.__new__(cls)
+        record.id = None
+        record.name = Name.from_valid(name)
+        record.phones = [Phone.from_valid(phone) for phone in phones]
+        record.emails = [Email.from_valid(email) for email in emails]
+        record.birthday = Birthday.from_valid(birthday) if birthday else None
+        record.address = Address.from_valid(address) if address else None
+        return record
+
+
+class RecordExistsError(ValueError):
+    """
+    Exception raised when a transaction creates a contact another change added first.
+    """
+
+
+class Transaction:
+    """
+    Class representing a batch of staged changes to an address book.
+
+    Records are edited as private working copies, so nothing is visible in the
+    book until `commit()` swaps all of them in at once. Discarding the
+    transaction (e.g. on an exception) leaves the book untouched.
+
+    Working copies are keyed by the ID of the record they were copied from
+    (new records by their name), so a copy renamed before the commit still
+    replaces its original instead of being added next to it. They are found
+    by the name they were staged under.
+    """
+
+    def __init__(self, book: "AddressBook") -> None:
+        """
+        Initialize a Transaction object.
+
+        Args:
+            book (AddressBook): The address book the changes will be applied to.
+        """
+        self.book = book
+        self.staged = {}  # record ID (name of a new record) -> working copy
+        self.deleted = set()  # IDs of the records to delete
+        self._keys = {}  # case-folded name at staging -> key in `staged`
+        self._trusted = set()  # keys of copies made only of validated values
+
+    def _is_live(self, record: Record | None) -> bool:
+        """
+        Check whether a record of the book is neither deleted nor staged here.
+
+        Args:
+            record (Record or None): A record found in the book.
+
+        Returns:
+            bool: True if the record exists and the transaction doesn't own it.
+        """
+        return (
+            record is not None
+            and record.id not in self.deleted
+            and record.id not in self.staged
+        )
+
+    def record(self, name: str) -> Record:
+        """
+        Stage a record for editing, creating it if it doesn't exist yet.
+
+        Args:
+            name (str): The name of the contact.
+
+        Returns:
+            Record: The working copy to edit; it becomes the live record on commit.
+
+        Raises:
+            ValueError: If the name format is invalid.
+        """
+        name = Name(name).value
+        key = self._keys.get(name.casefold())
+        if key is None:
+            existing = self.book._by_name(name)
+            if self._is_live(existing):
+                key = existing.id
+                self.staged[key] = copy.deepcopy(existing)
+            else:
+                key = name.casefold()
+                self.staged[key] = Record(name)
+            self._keys[name.casefold()] = key
+        self._trusted.discard(key)  # the caller may assign unvalidated values
+        return self.staged[key]
+
+    def merge(self, record: Record) -> bool:
+        """
+        Stage a validated record, merged into the contact with the same name.
+
+        Phones and emails the contact doesn't have yet are appended, and a
+        birthday or address in `record` replaces the stored one. The values
+        are trusted: unless the copy was also handed out by `record()`,
+        `validate()` doesn't check them again.
+
+        Args:
+            record (Record): The record to merge, e.g. a row validated by an
+                             import worker. A new contact is staged as is.
+
+        Returns:
+            bool: True if the contact is new.
+        """
+        name = record.name.value
+        key = self._keys.get(name.casefold())
+        if key is None:
+            existing = self.book._by_name(name)
+            if not self._is_live(existing):
+                key = self._keys[name.casefold()] = name.casefold()
+                self.staged[key] = record
+                self._trusted.add(key)
+                return True
+            key = self._keys[name.casefold()] = existing.id
+            self.staged[key] = copy.deepcopy(existing)
+            self._trusted.add(key)
+        AddressBook._absorb(self.staged[key], record)
+        return False
+
+    def delete(self, name: str) -> None:
+        """
+        Stage the deletion of a record.
+
+        Args:
+            name (str): The name of the contact to delete.
+
+        Raises:
+            ValueError: If the record is not found.
+        """
+        name = standardize_name(name) or name
+        key = self._keys.pop(name.casefold(), None)
+        if key is not None:
+            del self.staged[key]
+            self._trusted.discard(key)
+            if isinstance(key, int):
+                self.deleted.add(key)
+            return
+        existing = self.book._by_name(name)
+        if not self._is_live(existing):
+            raise ValueError(f"Record {name} is not found")
+        self.deleted.add(existing.id)
+
+    def validate(self) -> None:
+        """
+        Re-validate every field of every staged record.
+
+        Catches values that were assigned directly rather than through the
+        validating `Record` methods, and renames to a name that is taken.
+        Copies made only by `merge()` from validated records are not checked
+        again.
+
+        Raises:
+            ValueError: If any staged field is invalid or two records would
+                        end up with the same name.
+        """
+        names = set()
+        for key, record in self.staged.items():
+            if key not in self._trusted:
+                Name(record.name.value)
+                for phone in record.phones:
+                    Phone(phone.value)
+                for email in record.emails:
+                    Email(email.value)
+                if record.birthday:
+                    Birthday(record.birthday.value)
+
+            name = record.name.value.casefold()
+            renamed_onto = self._is_live(self.book._by_name(name))
+            if name in names or (isinstance(key, int) and renamed_onto):
+                raise ValueError(f"Record {record.name.value} already exists")
+            names.add(name)
+
+    def _remove(self, record_id: int) -> Record | None:
+        """
+        Remove a record of the book by ID. Needs the write lock.
+
+        Args:
+            record_id (int): The ID of the record.
+
+        Returns:
+            Record or None: The removed record, or None if there was none.
+        """
+        record = self.book.data.get(record_id)
+        return None if record is None else self.book._remove(record.name.value)
+
+    def commit(self) -> dict:
+        """
+        Apply all staged changes to the book under a single write lock.
+
+        Edited records replace the live ones under the same ID and position.
+        Deleted and renamed records are taken out first, so a record can take
+        over a name another one gives up in the same transaction.
+
+        Returns:
+            dict: The previous record (or None) for every changed ID, for `rollback()`.
+
+        Raises:
+            RecordExistsError: If a contact this transaction creates was added
+                               to the book since it was staged; nothing is
+                               applied.
+        """
+        with self.book.write_lock():
+            for key, record in self.staged.items():
+                existing = self.book._by_name(record.name.value)
+                if isinstance(key, str) and self._is_live(existing):
+                    raise RecordExistsError(
+                        f"Record {record.name.value} already exists"
+                    )
+            previous = {}
+            for record_id in self.deleted:
+                previous[record_id] = self._remove(record_id)
+            for key, record in self.staged.items():
+                live = self.book.data.get(key)
+                if live is not None and live.name.value != record.name.value:
+                    previous[key] = self._remove(key)
+            for record in self.staged.values():
+                replaced = self.book._put(record, reindex=False)
+                previous.setdefault(record.id, replaced)
+            self.book._reindex(*self.staged.values())
+        return previous
+
+    def rollback(self, previous: dict) -> None:
+        """
+        Undo a commit, restoring the records it replaced.
+
+        Args:
+            previous (dict): The mapping returned by `commit()`.
+        """
+        with self.book.write_lock():
+            for record_id in previous:
+                self._remove(record_id)
+            restored = [record for record in previous.values() if record is not None]
+            for record in restored:
+                self.book._put(record, reindex=False)
+            self.book._reindex(*restored)
+
 
 class AddressBook:
     """
     Class representing an address book containing contact records.
 
     Provides methods for adding, finding, and managing contact records.
+
+    Records are stored by a stable integer ID (`record.id`), assigned when a
+    record is first added and never reused. A separate index maps case-folded
+    names to IDs, so lookups by name are case-insensitive and renames only
+    touch the index.
     """
 
     def __init__(self) -> None:
         """
         Initialize an AddressBook object.
         """
-        self.data = {}
+        self.data = {}  # record ID -> Record, in insertion order
+        self._next_id = 1
+        self._names = {}  # case-folded name -> record ID
+        self._order = SortedIndex()  # the same, in alphabetical order
+        self._sounds = defaultdict(set)  # Soundex code of a name word -> record IDs
+        self._indexed = {}  # record ID -> field values it is indexed under
+        self._phone_prefixes = PrefixIndex()  # phone digits -> record IDs
+        self._phone_suffixes = PrefixIndex()  # reversed phone digits -> record IDs
+        self._email_domains = defaultdict(set)  # lower-cased email domain -> record IDs
+        self._email_locals = defaultdict(set)  # lower-cased email local part -> IDs
+        self._address_tokens = PrefixIndex()  # address word -> record IDs
+        self._cities = defaultdict(set)  # case-folded city of the address -> IDs
+        self._lock = RWLock()
+        self._snapshot = None
+        self._watchers = []  # called with the IDs of added, renamed or deleted records
+
+    def __getstate__(self) -> dict:
+        """
+        Prepare the address book for pickling.
+
+        The lock and the cached snapshot are not picklable/persistent, and the
+        records dict is copied under the read lock so a save running in another
+        thread never sees it change size mid-iteration. The name indexes are
+        rebuilt on load rather than stored.
+
+        Returns:
+            dict: The picklable state of the address book.
+        """
+        with self._lock.read_lock():
+            state = self.__dict__.copy()
+            state["data"] = dict(self.data)
+        del state["_lock"]
+        del state["_snapshot"]
+        del state["_watchers"]
+        del state["_names"]
+        del state["_order"]
+        del state["_sounds"]
+        del state["_indexed"]
+        del state["_phone_prefixes"]
+        del state["_phone_suffixes"]
+        del state["_email_domains"]
+        del state["_email_locals"]
+        del state["_address_tokens"]
+        del state["_cities"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restore the address book from pickled state.
+
+        Also upgrades books saved before locking or record IDs were introduced.
+        A book filled in place keeps its watchers, and they are told about the
+        records it had and has.
+
+        Args:
+            state (dict): The state returned by `__getstate__`.
+        """
+        replaced = list(self.__dict__.get("data", ()))
+        self.__dict__.update(state)
+        self.__dict__.setdefault("_watchers", [])
+        if "_next_id" not in state:  # keyed by name: number records in order
+            self.data = dict(enumerate(self.data.values(), 1))
+            for record_id, record in self.data.items():
+                record.id = record_id
+            self._next_id = len(self.data) + 1
+        self._names = {
+            record.name.value.casefold(): record_id
+            for record_id, record in self.data.items()
+        }
+        self._order = SortedIndex(self._names.items())
+        self._sounds = defaultdict(set)
+        for record_id, record in self.data.items():
+            for code in word_codes(record.name.value):
+                self._sounds[code].add(record_id)
+        self._build_field_indexes()
+        self._lock = RWLock()
+        self._snapshot = None
+        self._notify(*replaced, *self.data)
+
+    def read_lock(self):
+        """
+        Acquire the address book for reading in a `with` block.
+
+        Returns:
+            ContextManager: Context manager holding the shared read lock.
+        """
+        return self._lock.read_lock()
+
+    def write_lock(self):
+        """
+        Acquire the address book for writing in a `with` block.
+
+        Returns:
+            ContextManager: Context manager holding the exclusive write lock.
+        """
+        return self._lock.write_lock()
+
+    def watch(self, callback) -> None:
+        """
+        Have a function called whenever a contact is added, renamed or deleted.
+
+        The function gets the IDs of the records as arguments. It runs with
+        the write lock held, so it must be quick and must not wait for the book.
+
+        Args:
+            callback (function): The function, e.g. a method queueing the IDs.
+        """
+        self._watchers.append(callback)
+
+    def _notify(self, *record_ids: int) -> None:
+        """
+        Tell the watchers that the names of some records changed.
+
+        Args:
+            *record_ids (int): The IDs of the records.
+        """
+        if record_ids:
+            for callback in self._watchers:
+                callback(*record_ids)
+
+    def snapshot(self) -> tuple:
+        """
+        Get a consistent, immutable view of all records.
+
+        The snapshot is built once after each change and shared by every reader
+        until the next write (copy-on-write), so long scans such as export,
+        listing and search can run on it while writers proceed. The snapshot is
+        shallow: it fixes the set of records, not the fields inside them.
+
+        Returns:
+            tuple: All records in insertion order.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock.read_lock():
+                snapshot = self._snapshot = tuple(self.data.values())
+        return snapshot
+
+    def _index_name(self, name: str, record_id: int) -> None:
+        """
+        Add a name to the name, order and phonetic indexes. Needs the write lock.
+
+        Args:
+            name (str): The name of the record.
+            record_id (int): The ID of the record.
+        """
+        key = name.casefold()
+        self._names[key] = record_id
+        self._order.add(key, record_id)
+        for code in word_codes(name):
+            self._sounds[code].add(record_id)
+        self._notify(record_id)
+
+    def _unindex_name(self, name: str) -> int | None:
+        """
+        Remove a name from the name, order and phonetic indexes. Needs the write lock.
+
+        Args:
+            name (str): The name of the record (any case).
+
+        Returns:
+            int or None: The ID the name belonged to, or None if it wasn't indexed.
+        """
+        key = name.casefold()
+        record_id = self._names.pop(key, None)
+        if record_id is None:
+            return None
+        self._order.discard(key)
+        for code in word_codes(name):
+            self._discard_posting(self._sounds, code, record_id)
+        self._notify(record_id)
+        return record_id
+
+    @staticmethod
+    def _field_values(record: Record) -> dict:
+        """
+        Get the values of a record that the field indexes are built from.
+
+        Args:
+            record (Record): The record.
+
+        Returns:
+            dict: The indexed values by field.
+        """
+        return {
+            "phones": tuple(phone.value.lstrip("+") for phone in record.phones),
+            "emails": tuple(email.value.lower() for email in record.emails),
+            "address": record.address.value.casefold() if record.address else "",
+        }
+
+    @staticmethod
+    def _discard_posting(index: dict, key: str, record_id: int) -> None:
+        """
+        Remove a record ID from a hash index, dropping the key once it is empty.
+
+        Args:
+            index (dict): The index, mapping keys to sets of record IDs.
+            key (str): The key.
+            record_id (int): The ID to remove.
+        """
+        ids = index.get(key)
+        if ids is not None:
+            ids.discard(record_id)
+            if not ids:
+                del index[key]
+
+    def _index_postings(self, record_id: int, values: dict) -> None:
+        """
+        Add a record to the hash-based field indexes. Needs the write lock.
+
+        Args:
+            record_id (int): The ID of the record.
+            values (dict): The record's values from `_field_values`.
+        """
+        for email in values["emails"]:
+            local, _, domain = email.rpartition("@")
+            self._email_locals[local].add(record_id)
+            self._email_domains[domain].add(record_id)
+        if values["address"]:
+            self._cities[Address.city_of(values["address"])].add(record_id)
+
+    def _build_field_indexes(self) -> None:
+        """
+        Build the field indexes for all records at once, e.g. after loading.
+
+        Sorting all entries once is much faster than inserting them one by one.
+        """
+        self._indexed = {}
+        self._email_domains = defaultdict(set)
+        self._email_locals = defaultdict(set)
+        self._cities = defaultdict(set)
+        phone_pairs = []
+        token_pairs = []
+        for record_id, record in self.data.items():
+            record._owner = self
+            values = self._indexed[record_id] = self._field_values(record)
+            phone_pairs.extend((digits, record_id) for digits in values["phones"])
+            token_pairs.extend(
+                (token, record_id) for token in Address.tokenize(values["address"])
+            )
+            self._index_postings(record_id, values)
+        self._phone_prefixes = PrefixIndex(phone_pairs)
+        self._phone_suffixes = PrefixIndex(
+            (digits[::-1], record_id) for digits, record_id in phone_pairs
+        )
+        self._address_tokens = PrefixIndex(token_pairs)
+
+    def _unindex_fields(self, record_id: int) -> None:
+        """
+        Remove a record from the field indexes. Needs the write lock.
+
+        Args:
+            record_id (int): The ID of the record.
+        """
+        values = self._indexed.pop(record_id, None)
+        if values is None:
+            return
+        for digits in values["phones"]:
+            self._phone_prefixes.discard(digits, record_id)
+            self._phone_suffixes.discard(digits[::-1], record_id)
+        for email in values["emails"]:
+            local, _, domain = email.rpartition("@")
+            self._discard_posting(self._email_locals, local, record_id)
+            self._discard_posting(self._email_domains, domain, record_id)
+        for token in Address.tokenize(values["address"]):
+            self._address_tokens.discard(token, record_id)
+        if values["address"]:
+            city = Address.city_of(values["address"])
+            self._discard_posting(self._cities, city, record_id)
+
+    def _reindex(self, *records: Record) -> None:
+        """
+        Bring the field indexes up to date with the records' current values.
+
+        Called by `_put`, by batch operations once per batch and by the
+        `Record` methods that change indexed fields of a record in this book.
+
+        Args:
+            *records (Record): The records that changed.
+        """
+        phone_pairs = []
+        token_pairs = []
+        with self._lock.write_lock():
+            for record in records:
+                if self.data.get(record.id) is not record:
+                    continue
+                values = self._field_values(record)
+                if self._indexed.get(record.id) == values:
+                    continue
+                self._unindex_fields(record.id)
+                self._indexed[record.id] = values
+                phone_pairs.extend((digits, record.id) for digits in values["phones"])
+                token_pairs.extend(
+                    (token, record.id) for token in Address.tokenize(values["address"])
+                )
+                self._index_postings(record.id, values)
+            self._phone_prefixes.update(phone_pairs)
+            self._phone_suffixes.update(
+                (digits[::-1], record_id) for digits, record_id in phone_pairs
+            )
+            self._address_tokens.update(token_pairs)
+
+    def _put(self, record: Record, reindex: bool = True) -> Record | None:
+        """
+        Insert a record, replacing the one with the same name. Needs the write lock.
+
+        A replacing record takes over the ID and position of the old one; a new
+        record keeps an ID it already has (e.g. when a rollback restores it) or
+        gets the next free one.
+
+        Args:
+            record (Record): The record to store.
+            reindex (bool, optional): Update the field indexes right away. Batch
+                                      operations pass False and call `_reindex`
+                                      once at the end. Defaults to True.
+
+        Returns:
+            Record or None: The replaced record, if any.
+        """
+        key = record.name.value.casefold()
+        record_id = self._names.get(key)
+        previous = self.data.get(record_id)
+        if record_id is None:
+            record_id = getattr(record, "id", None)
+            if record_id is None or record_id in self.data:
+                record_id = self._next_id
+            self._next_id = max(self._next_id, record_id + 1)
+            self._index_name(record.name.value, record_id)
+        if previous is not None and previous is not record:
+            previous._owner = None
+        record.id = record_id
+        record._owner = self
+        self.data[record_id] = record
+        if reindex:
+            self._reindex(record)
+        self._snapshot = None
+        return previous
+
+    def _remove(self, name: str) -> Record | None:
+        """
+        Remove a record by name. Needs the write lock.
+
+        Args:
+            name (str): The name of the record (any case).
+
+        Returns:
+            Record or None: The removed record, or None if there was none.
+        """
+        record_id = self._unindex_name(name)
+        if record_id is None:
+            return None
+        self._unindex_fields(record_id)
+        self._snapshot = None
+        record = self.data.pop(record_id)
+        record._owner = None
+        return record
 
     def add_record(self, record: Record) -> None:
         """
         Add a record to the address book.
 
+        A record with the same name (in any case) is replaced and its ID is kept.
+
         Args:
             record (Record): The record to add.
         """
-        self.data[record.name.value] = record
+        with self._lock.write_lock():
+            self._put(record)
+
+    def get(self, record_id: int) -> Record | None:
+        """
+        Find a record by its ID.
+
+        Args:
+            record_id (int): The ID of the record.
+
+        Returns:
+            Record or None: The record if found, None otherwise.
+        """
+        return self.data.get(record_id)
+
+    def prefix_range(self, prefix: str = "", within: range | None = None) -> range:
+        """
+        Find the positions of contacts whose name starts with a prefix, ignoring case.
+
+        Positions refer to contacts in alphabetical order and stay valid until
+        the book changes. Pass the range found for a shorter prefix as `within`
+        to narrow it as the user types.
+
+        Args:
+            prefix (str, optional): The start of the name. Defaults to "", all contacts.
+            within (range, optional): Only search these positions.
+
+        Returns:
+            range: The matching positions, possibly empty.
+        """
+        with self._lock.read_lock():
+            return self._order.prefix_range(prefix.casefold(), within)
+
+    def at(self, position: int) -> Record | None:
+        """
+        Get the record at a position in alphabetical order.
+
+        Args:
+            position (int): Zero-based position, e.g. from `prefix_range()`.
+
+        Returns:
+            Record or None: The record, or None if the position is out of range.
+        """
+        with self._lock.read_lock():
+            if 0 <= position < len(self._order):
+                return self.data[self._order[position]]
+        return None
+
+    def order_version(self) -> int:
+        """
+        Get the version of the alphabetical name order.
+
+        Positions from `prefix_range()` stay valid while it doesn't change.
+
+        Returns:
+            int: The version.
+        """
+        return self._order.version
+
+    @exception_handler
+    def rename(self, name: str, new_name: str) -> Record:
+        """
+        Rename a contact. Only the name index changes; the ID stays the same.
+
+        Args:
+            name (str): The current name of the contact.
+            new_name (str): The new name.
+
+        Returns:
+            Record: The renamed record.
+
+        Raises:
+            ValueError: If the contact is not found, the new name is invalid or
+                        another contact already has it.
+        """
+        new = Name(new_name)
+        with self._lock.write_lock():
+            record = self.data.get(self._names.get(name.casefold()))
+            if record is None:
+                raise ValueError(f"Record {name} is not found")
+            key, new_key = record.name.value.casefold(), new.value.casefold()
+            if new_key != key and new_key in self._names:
+                raise ValueError(f"Record {new.value} already exists")
+            self._unindex_name(record.name.value)
+            self._index_name(new.value, record.id)
+            record.name = new
+        return record
+
+    @staticmethod
+    def _absorb(existing: Record, record: Record, replace: bool = True) -> None:
+        """
+        Copy the phones and emails `existing` doesn't have yet from `record`.
+
+        Args:
+            existing (Record): The record to update.
+            record (Record): The record to take the values from.
+            replace (bool, optional): Let a birthday or address in `record`
+                                      replace the one in `existing`; otherwise
+                                      they only fill in missing values.
+                                      Defaults to True.
+        """
+        phones = {phone.value for phone in existing.phones}
+        existing.phones.extend(
+            phone for phone in record.phones if phone.value not in phones
+        )
+        emails = {email.value for email in existing.emails}
+        existing.emails.extend(
+            email for email in record.emails if email.value not in emails
+        )
+        if replace:
+            existing.birthday = record.birthday or existing.birthday
+            existing.address = record.address or existing.address
+        else:
+            existing.birthday = existing.birthday or record.birthday
+            existing.address = existing.address or record.address
 
+    @exception_handler
+    def merge_contacts(self, name: str, duplicate_names: list[str]) -> Record:
+        """
+        Merge duplicate contacts into one and delete the duplicates.
+
+        The kept contact gets every phone and email of the duplicates, and
+        their birthday or address where it has none.
+
+        Args:
+            name (str): The name of the contact to keep.
+            duplicate_names (list[str]): The names of the contacts to merge into it.
+
+        Returns:
+            Record: The merged contact.
+
+        Raises:
+            ValueError: If the contact to keep is not found.
+        """
+        with self._lock.write_lock():
+            keep = self.find_by_name(name)
+            if keep is None:
+                raise ValueError(f"Record {name} is not found")
+            for duplicate_name in duplicate_names:
+                duplicate = self.find_by_name(duplicate_name)
+                if duplicate is None or duplicate is keep:
+                    continue
+                self._absorb(keep, duplicate, replace=False)
+                self._remove(duplicate_name)
+            self._reindex(keep)
+        return keep
+
+    @contextmanager
+    def transaction(self, persist=None) -> Iterator[Transaction]:
+        """
+        Stage changes to one or more records and apply them atomically.
+
+        Usage:
+            with book.transaction(persist=save_contacts) as tx:
+                record = tx.record("Ivan Petrenko")
+                record.add_phone("0671234567")
+                record.add_email("ivan@example.com")
+
+        Inside the block, validation errors from `Record` methods are raised
+        instead of being printed and swallowed. If the block raises, nothing is
+        applied. Otherwise all staged records are validated, swapped in at once
+        and `persist(book)` is called a single time; if persisting fails, the
+        changes are rolled back and the error is re-raised. SIGINT/SIGTERM are
+        held back from the commit until it has been saved or rolled back.
+
+        Args:
+            persist (callable, optional): Function that saves the book, e.g. `save_contacts`.
+
+        Yields:
+            Transaction: The transaction to stage changes in.
+        """
+        transaction = Transaction(self)
+        with raise_errors():
+            yield transaction
+            transaction.validate()
+        with signals_deferred():
+            previous = transaction.commit()
+            if persist:
+                try:
+                    persist(self)
+                except Exception:
+                    transaction.rollback(previous)
+                    raise
+
+    @timed("AddressBook.find_by_phone")
+    def find_by_phone(self, query: str) -> list[Record]:
+        """
+        Find contacts by the digits of a phone number.
+
+        "+38067*", "38067..." and "067*" (local format) match numbers starting
+        with +38067, and nothing else. Other digits, e.g. "4567" or "067",
+        match numbers ending in them, starting with them (also in local
+        format) or containing them anywhere. Numbers that start or end with the
+        digits come first: they are range lookups in the sorted phone indexes.
+        The numbers that only contain the digits are found by scanning all
+        contacts and come after them.
+
+        Args:
+            query (str): Digits of the number, or a prefix starting with "+"
+                         or ending with "*", "..." or "…".
+
+        Returns:
+            list[Record]: The matching records, starting or ending with the
+                          digits first, oldest first within each group.
+        """
+        query = re.sub(r"[\s()-]", "", query)
+        by_prefix = query.startswith("+") or query.endswith(("*", "...", "…"))
+        digits = re.sub(r"\D", "", query)
+        if not digits:
+            return []
+        # local format, e.g. 067...
+        prefix = "38" + digits if digits.startswith("0") else digits
+        with self._lock.read_lock():
+            ids = self._phone_prefixes.search(prefix)
+            if not by_prefix:
+                ids |= self._phone_suffixes.search(digits[::-1])
+            matches = [self.data[record_id] for record_id in sorted(ids)]
+        if by_prefix:
+            return matches
+        return matches + [
+            record
+            for record in self.snapshot()
+            if record.id not in ids
+            and any(digits in phone.value for phone in record.phones)
+        ]
+
+    @timed("AddressBook.find_by_email")
+    def find_by_email(self, query: str) -> list[Record]:
+        """
+        Find contacts by email domain, local part, full address or substring.
+
+        "@example.com" matches every address at that domain, "ivan@" every
+        address with that local part and "ivan@example.com" that exact
+        address; these are looked up in the email indexes without touching
+        other records. Any other text, and a query with "@" the indexes don't
+        find (e.g. a partial domain like "@gmail"), is matched as a substring
+        of the addresses, scanning all contacts.
+
+        Args:
+            query (str): The search query, case-insensitive.
+
+        Returns:
+            list[Record]: The matching records, oldest first.
+        """
+        query = query.strip().lower()
+        if "@" in query:
+            local, _, domain = query.rpartition("@")
+            with self._lock.read_lock():
+                if local and domain:
+                    ids = self._email_locals.get(local, set())
+                    ids = ids & self._email_domains.get(domain, set())
+                elif domain:
+                    ids = self._email_domains.get(domain, set())
+                else:
+                    ids = self._email_locals.get(local, set())
+                if ids:
+                    return [self.data[record_id] for record_id in sorted(ids)]
+        return [
+            record
+            for record in self.snapshot()
+            if any(query in email.value.lower() for email in record.emails)
+        ]
+
+    def email_domains(self) -> list[tuple[str, int]]:
+        """
+        Count the contacts that have an email address at each domain.
+
+        Computed from the domain index alone, without reading any record.
+
+        Returns:
+            list[tuple[str, int]]: Domains and contact counts, most common first.
+        """
+        with self._lock.read_lock():
+            counts = [(domain, len(ids)) for domain, ids in self._email_domains.items()]
+        return sorted(counts, key=lambda item: (-item[1], item[0]))
+
+    @timed("AddressBook.find_by_address")
+    def find_by_address(self, query: str) -> list[Record]:
+        """
+        Find contacts whose address contains all words of the query.
+
+        Every query word matches address words starting with it, in any order:
+        "Kyiv Khresh" finds "Kyiv, Khreshchatyk 1". Each word is a range
+        lookup in the address word index, and the ID sets are intersected
+        starting with the smallest.
+
+        Args:
+            query (str): Words of the address, e.g. a street, city or postal code.
+
+        Returns:
+            list[Record]: The matching records, oldest first.
+        """
+        tokens = Address.tokenize(query)
+        if not tokens:
+            return []
+        with self._lock.read_lock():
+            posting_lists = sorted(
+                (self._address_tokens.search(token) for token in tokens), key=len
+            )
+            ids = posting_lists[0]
+            for posting_list in posting_lists[1:]:
+                ids &= posting_list
+            return [self.data[record_id] for record_id in sorted(ids)]
+
+    def contacts_by_city(self) -> list[tuple[str, list[Record]]]:
+        """
+        Group the contacts that have an address by its city.
+
+        The city is the part of the address before the first comma (see
+        `Address.city_of`); the groups come straight from the city index.
+
+        Returns:
+            list[tuple[str, list[Record]]]: Cities and their contacts, the
+                                            largest groups first.
+        """
+        with self._lock.read_lock():
+            groups = [
+                (city.title(), [self.data[record_id] for record_id in sorted(ids)])
+                for city, ids in self._cities.items()
+            ]
+        return sorted(groups, key=lambda group: (-len(group[1]), group[0]))
+
+    @timed("AddressBook.find")
     @exception_handler
     def find(
         self,
@@ -434,10 +1452,21 @@ class AddressBook:
         by_email=False,
         by_birthday=False,
         by_address=False,
+        limit: int | None = None,
+        offset: int = 0,
+        sort_key=None,
+        regex=False,
     ) -> list:
         """
         Find records matching a query in the address book.
 
+        A search by phone, email or address alone uses the field indexes (see
+        `find_by_phone`, `find_by_email` and `find_by_address`). Other searches
+        scan the records lazily: with a `limit` and no `sort_key` the scan
+        stops once the page is full, and with a `sort_key` only the best
+        `offset + limit` records are kept (see `take_page`). With `regex` the
+        query is a regular expression (see `find_by_regex`).
+
         Args:
             query (str): The search query.
             by_name (bool, optional): Search by name. Defaults to False.
@@ -445,39 +1474,219 @@ class AddressBook:
             by_email (bool, optional): Search by email. Defaults to False.
             by_birthday (bool, optional): Search by birthday. Defaults to False.
             by_address (bool, optional): Search by address. Defaults to False.
+            limit (int, optional): Most records to return. Defaults to None, all.
+            offset (int, optional): Matching records to skip. Defaults to 0.
+            sort_key (function, optional): Orders the records, e.g.
+                                           `lambda record: record.name.value`.
+                                           Defaults to None, oldest first.
+            regex (bool, optional): The query is a regular expression.
+                                    Defaults to False.
 
         Returns:
             list: List of matching records.
-        """
+
+        Raises:
+            ValueError: If `regex` is set and the pattern is invalid or too slow
+                        (reported by the exception handler).
+        """
+        if regex:
+            fields = [
+                field
+                for field, wanted in (
+                    ("name", by_name),
+                    ("phone", by_phone),
+                    ("email", by_email),
+                    ("birthday", by_birthday),
+                    ("address", by_address),
+                )
+                if wanted
+            ]
+            matches = self.find_by_regex(query.strip(), fields)
+            return take_page(matches, limit, offset, sort_key)
+
         query = query.strip().lower()
-        results = []
-
-        for key, record in self.data.items():
-            if by_name and query in key.strip().lower():
-                results.append(record)
-            elif by_phone and any(
-                query in phone.value.lower() for phone in record.phones
-            ):
-                results.append(record)
-            elif by_email and any(
-                query in email.value.lower() for email in record.emails
-            ):
-                results.append(record)
-            elif (
-                by_birthday
-                and record.birthday
-                and query in record.birthday.value.lower()
-            ):
-                results.append(record)
-            elif (
-                by_address and record.address and query in record.address.value.lower()
-            ):
-                results.append(record)
-        return results
+        if by_phone and not (by_name or by_email or by_birthday or by_address):
+            matches = self.find_by_phone(query)
+        elif by_email and not (by_name or by_phone or by_birthday or by_address):
+            matches = self.find_by_email(query)
+        elif by_address and not (by_name or by_phone or by_email or by_birthday):
+            matches = self.find_by_address(query)
+        else:
+
+            def matches_query(record: Record) -> bool:
+                return bool(
+                    (by_name and query in record.name.value.strip().lower())
+                    or (
+                        by_phone
+                        and any(query in phone.value.lower() for phone in record.phones)
+                    )
+                    or (
+                        by_email
+                        and any(query in email.value.lower() for email in record.emails)
+                    )
+                    or (
+                        by_birthday
+                        and record.birthday
+                        and query in record.birthday.value.lower()
+                    )
+                    or (
+                        by_address
+                        and record.address
+                        and query in record.address.value.lower()
+                    )
+                )
+
+            matches = filter(matches_query, self.snapshot())
+        return take_page(matches, limit, offset, sort_key)
 
+    @staticmethod
+    def _field_texts(record: Record, field: str) -> list[str]:
+        """
+        Get the values of a field of a record as text, for regex matching.
+
+        Args:
+            record (Record): The record.
+            field (str): "name", "phone", "email", "birthday" or "address".
+
+        Returns:
+            list[str]: The values; empty if the field is not set.
+        """
+        if field == "name":
+            return [record.name.value]
+        if field == "phone":
+            return [phone.value for phone in record.phones]
+        if field == "email":
+            return [email.value for email in record.emails]
+        value = getattr(record, field)
+        return [value.value] if value else []
+
+    def find_by_regex(self, pattern: str, fields: list[str]) -> list[Record]:
+        """
+        Find records with a field matching a regular expression, ignoring case.
+
+        A pattern anchored with a literal start, like "^Iva" on names,
+        "^\\+38067" on phones or "^admin@" on emails, only visits the records
+        found through the name, phone or email index. Other values are first
+        checked for the literal text the pattern requires, then matched in a
+        worker process that is stopped after REGEX_TIMEOUT seconds (see
+        `match_any`).
+
+        Args:
+            pattern (str): The regular expression, e.g. "^admin@".
+            fields (list[str]): The fields to match, e.g. ["email"].
+
+        Returns:
+            list[Record]: The matching records.
+
+        Raises:
+            ValueError: If the pattern is invalid, could make the search hang,
+                        or the search takes too long.
+        """
+        regex = compile_pattern(pattern)
+        candidates = self.snapshot()
+        if fields == ["name"] and regex.prefix:
+            positions = self.prefix_range(regex.prefix)
+            candidates = (self.at(position) for position in positions)
+        elif fields == ["phone"] and regex.prefix.lstrip("+").isdigit():
+            with self._lock.read_lock():
+                ids = self._phone_prefixes.search(regex.prefix.lstrip("+"))
+                candidates = [self.data[record_id] for record_id in sorted(ids)]
+        elif fields == ["email"] and regex.prefix:
+            local, at, _ = regex.prefix.lower().partition("@")
+            with self._lock.read_lock():
+                if at:  # the whole local part is known
+                    ids = set(self._email_locals.get(local, ()))
+                else:
+                    ids = set().union(
+                        *(
+                            posting
+                            for key, posting in self._email_locals.items()
+                            if key.startswith(local)
+                        )
+                    )
+                candidates = [self.data[record_id] for record_id in sorted(ids)]
+
+        return match_any(
+            regex,
+            candidates,
+            lambda record: [
+                text for field in fields for text in self._field_texts(record, field)
+            ],
+        )
+
+    @timed("AddressBook.find_similar")
+    def find_similar(
+        self, name: str, limit: int = 5, score_cutoff: float = 60
+    ) -> list[tuple[Record, float]]:
+        """
+        Find the contacts whose names are closest to a possibly misspelled name.
+
+        The case-folded names kept by the sorted name index serve as the
+        pre-processed choices, so a query is one RapidFuzz pass over an
+        existing list, without building anything per call.
+
+        Args:
+            name (str): The name, or part of it, to search for.
+            limit (int, optional): Maximum number of results. Defaults to 5.
+            score_cutoff (float, optional): Minimum similarity, 0-100.
+                                            Defaults to 60.
+
+        Returns:
+            list[tuple[Record, float]]: The records and their scores, best first.
+        """
+        # Deferred: importing RapidFuzz takes longer than the rest of startup
+        from rapidfuzz import fuzz, process, utils
+
+        query = utils.default_process(name)
+        if not query:
+            return []
+        with self._lock.read_lock():
+            matches = process.extract(
+                query,
+                self._order.keys,
+                scorer=fuzz.WRatio,
+                processor=None,
+                limit=limit,
+                score_cutoff=score_cutoff,
+            )
+            return [
+                (self.data[self._order[position]], score)
+                for _, score, position in matches
+            ]
+
+    @timed("AddressBook.find_sounds_like")
+    def find_sounds_like(self, name: str) -> list[Record]:
+        """
+        Find contacts whose name sounds like the given one, e.g. "Smyth" -> "Smith".
+
+        Every word of the query must sound like a word of the name (Soundex);
+        word order and extra words in the name don't matter. Each query word is
+        a hash lookup in the phonetic index, and only the records of the rarest
+        word are checked against the others.
+
+        Args:
+            name (str): The name, or some of its words, to search for.
+
+        Returns:
+            list[Record]: The matching records, sorted by name.
+        """
+        codes = word_codes(name)
+        if not codes:
+            return []
+        with self._lock.read_lock():
+            posting_lists = sorted(
+                (self._sounds.get(code, set()) for code in codes), key=len
+            )
+            ids = set(posting_lists[0])
+            for posting_list in posting_lists[1:]:
+                ids &= posting_list
+            records = [self.data[record_id] for record_id in ids]
+        return sorted(records, key=lambda record: record.name.value.casefold())
+
+    @timed("AddressBook.find_by_name")
     def find_by_name(self, name: str) -> Record | None:
         """
-        Find a record by exact name match.
+        Find a record by exact name match, ignoring case.
 
         Args:
             name (str): The name to search for.
@@ -485,9 +1694,21 @@ class AddressBook:
         Returns:
             Record or None: The matching record if found, None otherwise.
         """
-        if name in self.data:
-            return self.data[name]
-        return None
+        return self._by_name(name)
+
+    def _by_name(self, name: str) -> Record | None:
+        """
+        Find a record by name like `find_by_name`, without timing the lookup.
+
+        Used by transactions, which look up every record they stage.
+
+        Args:
+            name (str): The name to search for.
+
+        Returns:
+            Record or None: The matching record if found, None otherwise.
+        """
+        return self.data.get(self._names.get(name.casefold()))
 
     @exception_handler
     def delete(self, name: str) -> None:
@@ -500,11 +1721,11 @@ class AddressBook:
         Raises:
             ValueError: If the record is not found.
         """
-        if name in self.data:
-            del self.data[name]
-        else:
-            raise ValueError(f"Record {name} is not found")
+        with self._lock.write_lock():
+            if self._remove(name) is None:
+                raise ValueError(f"Record {name} is not found")
 
+    @timed("AddressBook.get_birthday_in_days")
     @exception_handler
     def get_birthday_in_days(self, days: int) -> list:
         """
@@ -524,7 +1745,7 @@ class AddressBook:
         current_year = today.year
         given_date = today + timedelta(days=days)
 
-        for record in self.data.values():
+        for record in self.snapshot():
             if not record.birthday:
                 continue
             try:
@@ -558,4 +1779,4 @@ class AddressBook:
         Returns:
             str: String representation of all records in the address book.
         """
-        return "\n".join(str(record) for record in self.data.values())
+        return "\n".join(str(record) for record in self.snapshot())
@@ -1,5 +1,33 @@
 from decorators.decorators import input_error
+from helpers.rwlock import RWLock
+from helpers.sorted_index import SortedIndex
+from helpers.metrics import timed
+from helpers.paging import take_page
+from helpers.regex_search import compile_pattern, match_any
+from helpers.minhash import LSHIndex, signature
+from collections import Counter
+from itertools import count
 from typing import Iterator
+import re
+
+_versions = count()  # Notes book versions, unique so a reloaded book never repeats one
+LINK = re.compile(r"\[\[([^\[\]\n]+)\]\]")  # [[Note Title]]
+
+
+def title_key(title: str) -> str:
+    """
+    Normalize a note title for lookups, ignoring case and surrounding spaces.
+
+    The title index and the [[Note Title]] links are both keyed with it, so
+    a link finds its note however it is spaced or capitalized.
+
+    Args:
+        title (str): The title, e.g. " Weekly Plan".
+
+    Returns:
+        str: The key, e.g. "weekly plan".
+    """
+    return title.strip().casefold()
 
 
 class Field:
@@ -62,6 +90,21 @@ class Content(Field):
         """
         super().__init__(content)
 
+    @staticmethod
+    def links(text: str | None) -> set[str]:
+        """
+        Find the titles of the notes a text links to with [[Note Title]].
+
+        Args:
+            text (str): The content, e.g. "See [[Weekly Plan]] and [[Budget]]".
+
+        Returns:
+            set[str]: The case-folded titles, e.g. {"weekly plan", "budget"}.
+        """
+        if not text or "[[" not in text:
+            return set()
+        return {title_key(title) for title in LINK.findall(text)}
+
 
 class Tag(Field):
     """
@@ -102,6 +145,8 @@ class Note:
     Provides methods for managing note contents and tags.
     """
 
+    _owner = None  # The NotesBook holding this note, set by the book
+
     def __init__(self, title: str) -> None:
         """
         Initialize a Note object with a title.
@@ -109,10 +154,29 @@ class Note:
         Args:
             title (str): The title of the note.
         """
+        self.id = None  # Assigned by the NotesBook the note is added to
         self.title = Title(title)
         self.content = None
         self.tags = []
 
+    def __getstate__(self) -> dict:
+        """
+        Prepare the note for pickling and copying, without its notes book.
+
+        Returns:
+            dict: The picklable state of the note.
+        """
+        state = self.__dict__.copy()
+        state.pop("_owner", None)
+        return state
+
+    def _changed(self) -> None:
+        """
+        Let the notes book holding this note update its indexes.
+        """
+        if self._owner is not None:
+            self._owner._reindex(self)
+
     @input_error
     def add_tag(self, tag: str) -> None:
         """
@@ -126,6 +190,7 @@ class Note:
         """
         if len(self.tags) < 10 and len(tag) <= 25:
             self.tags.append(Tag(tag))
+            self._changed()
         else:
             raise ValueError("Maximum tags limit exceeded or tag length is invalid.")
 
@@ -145,6 +210,7 @@ class Note:
         for t in self.tags:
             if t.value == tag:
                 self.tags.remove(t)
+                self._changed()
                 return True
         raise ValueError(f"Tag '{tag}' not found.")
 
@@ -163,9 +229,17 @@ class Note:
         for i, tag in enumerate(self.tags):
             if tag.value == old_tag:
                 self.tags[i] = Tag(new_tag)
+                self._changed()
                 return
         raise ValueError(f"Tag '{old_tag}' not found.")
 
+    def clear_tags(self) -> None:
+        """
+        Remove all tags from the note.
+        """
+        self.tags = []
+        self._changed()
+
     @input_error
     def find_tag(self, tag: str) -> Tag | None:
         """
@@ -195,6 +269,7 @@ class Note:
         """
         if len(new_content) <= 20000:
             self.content = new_content
+            self._changed()
         else:
             raise ValueError("Content length should not exceed 20000 characters.")
 
@@ -210,18 +285,23 @@ class Note:
             ValueError: If content format is invalid.
         """
         self.content = Content(content).value
+        self._changed()
 
     def delete_content(self) -> None:
         """
         Delete the content of the note.
         """
         self.content = ""
+        self._changed()
 
     @input_error
     def edit_title(self, new_title: str) -> None:
         """
         Edit the title of the note.
 
+        For a note stored in a NotesBook use `NotesBook.rename_note()`, which
+        also updates the title index.
+
         Args:
             new_title (str): The new title.
 
@@ -229,7 +309,7 @@ class Note:
             ValueError: If title length exceeds 1000 characters.
         """
         if len(new_title) <= 1000:
-            self.title = new_title
+            self.title = Title(new_title)
         else:
             raise ValueError("Title length should not exceed 1000 characters.")
 
@@ -263,13 +343,164 @@ class NotesBook:
     Class representing a collection of notes.
 
     Provides methods for adding, finding, and managing notes.
+
+    Notes are stored by a stable integer ID (`note.id`); a separate index maps
+    case-folded titles to IDs for case-insensitive lookup and O(1) renames.
+    The distinct tags are kept in alphabetical order too, for completion.
+    [[Note Title]] links in the content are indexed in both directions: the
+    titles each note links to, and the notes linking to each title. Links are
+    kept by title, so a link to a note that doesn't exist yet is found once
+    the note is added. The MinHash signatures of the contents are kept in LSH
+    buckets to find related notes without comparing with every note; they are
+    saved with the book. Notes report tag and content changes to the book (see
+    `Note._changed`), and `version()` changes with every change to the notes.
     """
 
     def __init__(self) -> None:
         """
         Initialize a NotesBook object.
         """
-        self.data = {}
+        self.data = {}  # note ID -> Note, in insertion order
+        self._next_id = 1
+        self._titles = {}  # case-folded title -> note ID
+        self._order = SortedIndex()  # the same, in alphabetical order
+        self._tag_order = SortedIndex()  # case-folded tag -> number of notes with it
+        self._indexed_tags = {}  # note ID -> the case-folded tags in _tag_order
+        self._links = {}  # note ID -> case-folded titles it links to
+        self._backlinks = {}  # case-folded title -> IDs of the notes linking to it
+        self._similar = LSHIndex()  # note ID -> MinHash signature of its content
+        self._version = next(_versions)
+        self._lock = RWLock()
+        self._snapshot = None
+        self._watchers = []  # called with the IDs of added, edited or deleted notes
+
+    def __getstate__(self) -> dict:
+        """
+        Prepare the notes book for pickling.
+
+        The lock, the cached snapshot and the title indexes are left out, and the
+        notes dict is copied under the read lock so a concurrent save sees a
+        stable dict.
+
+        Returns:
+            dict: The picklable state of the notes book.
+        """
+        with self._lock.read_lock():
+            state = self.__dict__.copy()
+            state["data"] = dict(self.data)
+            state["_signatures"] = self._similar.signatures()
+        del state["_similar"]
+        del state["_lock"]
+        del state["_snapshot"]
+        del state["_watchers"]
+        del state["_titles"]
+        del state["_order"]
+        del state["_tag_order"]
+        del state["_indexed_tags"]
+        del state["_links"]
+        del state["_backlinks"]
+        del state["_version"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restore the notes book from pickled state.
+
+        Also upgrades notes books saved before locking or note IDs were introduced.
+        A book filled in place keeps its watchers, and they are told about the
+        notes it had and has.
+
+        Args:
+            state (dict): The state returned by `__getstate__`.
+        """
+        replaced = list(self.__dict__.get("data", ()))
+        self.__dict__.update(state)
+        self.__dict__.setdefault("_watchers", [])
+        self._similar = LSHIndex(self.__dict__.pop("_signatures", None))
+        if "_next_id" not in state:  # keyed by title: number notes in order
+            self.data = dict(enumerate(self.data.values(), 1))
+            for note_id, note in self.data.items():
+                note.id = note_id
+                if isinstance(note.title, str):  # saved by the old edit_title
+                    note.title = Title(note.title)
+            self._next_id = len(self.data) + 1
+        self._titles = {
+            title_key(note.title.value): note_id for note_id, note in self.data.items()
+        }
+        self._order = SortedIndex(self._titles.items())
+        self._indexed_tags = {}
+        for note_id, note in self.data.items():
+            note._owner = self
+            self._indexed_tags[note_id] = {tag.value.casefold() for tag in note.tags}
+        self._tag_order = SortedIndex(
+            Counter(tag for tags in self._indexed_tags.values() for tag in tags).items()
+        )
+        self._links, self._backlinks = {}, {}
+        for note in self.data.values():
+            self._index_links(note)
+            if note.id not in self._similar:  # saved before signatures were
+                self._index_similar(note)
+        self._version = next(_versions)
+        self._lock = RWLock()
+        self._snapshot = None
+        self._notify(*replaced, *self.data)
+
+    def read_lock(self):
+        """
+        Acquire the notes book for reading in a `with` block.
+
+        Returns:
+            ContextManager: Context manager holding the shared read lock.
+        """
+        return self._lock.read_lock()
+
+    def write_lock(self):
+        """
+        Acquire the notes book for writing in a `with` block.
+
+        Returns:
+            ContextManager: Context manager holding the exclusive write lock.
+        """
+        return self._lock.write_lock()
+
+    def watch(self, callback) -> None:
+        """
+        Have a function called whenever a note is added, edited or deleted.
+
+        The function gets the IDs of the notes as arguments. It runs with the
+        write lock held, so it must be quick and must not wait for the book.
+
+        Args:
+            callback (function): The function, e.g. a method queueing the IDs.
+        """
+        self._watchers.append(callback)
+
+    def _notify(self, *note_ids: int) -> None:
+        """
+        Tell the watchers that some notes changed.
+
+        Args:
+            *note_ids (int): The IDs of the notes.
+        """
+        if note_ids:
+            for callback in self._watchers:
+                callback(*note_ids)
+
+    def snapshot(self) -> tuple:
+        """
+        Get a consistent, immutable view of all notes.
+
+        Built lazily after each change and shared by all readers until the next
+        write (copy-on-write). The snapshot is shallow.
+
+        Returns:
+            tuple: All notes in insertion order.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock.read_lock():
+                snapshot = self._snapshot = tuple(self.data.values())
+        return snapshot
 
     def __str__(self) -> str:
         """
@@ -278,34 +509,396 @@ class NotesBook:
         Returns:
             str: String representation of all notes in the book.
         """
-        return "\n".join(str(note) for note in self.data.values())
+        return "\n".join(str(note) for note in self.snapshot())
 
     def __iter__(self) -> Iterator:
         """
         Make the NotesBook iterable.
 
+        Iterates over a snapshot, so the book may be modified during iteration.
+
         Returns:
             iterator: Iterator over the notes in the book.
         """
-        return iter(self.data.values())
+        return iter(self.snapshot())
+
+    def _index_tags(self, note: Note) -> None:
+        """
+        Bring the tag index up to date with the tags of a note.
+
+        Only the tags that were added or removed since the last call are
+        touched. Call with the write lock held.
+
+        Args:
+            note (Note): The note, stored in this book.
+        """
+        old = self._indexed_tags.get(note.id, set())
+        new = self._indexed_tags[note.id] = {tag.value.casefold() for tag in note.tags}
+        for tag in old - new:
+            self._count_tag(tag, -1)
+        for tag in new - old:
+            self._count_tag(tag, 1)
+
+    def _unindex_tags(self, note_id: int) -> None:
+        """
+        Remove the tags of a note from the tag index. Call with the write lock held.
+
+        Args:
+            note_id (int): The ID of the note.
+        """
+        for tag in self._indexed_tags.pop(note_id, ()):
+            self._count_tag(tag, -1)
+
+    def _count_tag(self, tag: str, delta: int) -> None:
+        """
+        Change the number of notes with a tag, dropping tags no note has.
+
+        Args:
+            tag (str): The case-folded tag.
+            delta (int): 1 or -1.
+        """
+        count = self._tag_order.get(tag, 0) + delta
+        if count > 0:
+            self._tag_order.add(tag, count)
+        else:
+            self._tag_order.discard(tag)
+
+    def _index_links(self, note: Note) -> None:
+        """
+        Bring the link indexes up to date with the content of a note.
+
+        Only the links that were added or removed since the last call are
+        touched. Call with the write lock held.
+
+        Args:
+            note (Note): The note, stored in this book.
+        """
+        old = self._links.get(note.id, set())
+        new = Content.links(note.content)
+        if new:
+            self._links[note.id] = new
+        else:
+            self._links.pop(note.id, None)
+        for title in old - new:
+            self._unlink(title, note.id)
+        for title in new - old:
+            self._backlinks.setdefault(title, set()).add(note.id)
+
+    def _unindex_links(self, note_id: int) -> None:
+        """
+        Remove the links of a note from the link indexes. Call with the write lock held.
+
+        Args:
+            note_id (int): The ID of the note.
+        """
+        for title in self._links.pop(note_id, ()):
+            self._unlink(title, note_id)
+
+    def _index_similar(self, note: Note) -> None:
+        """
+        Update the MinHash signature of a note. Call with the write lock held.
+
+        Args:
+            note (Note): The note, stored in this book.
+        """
+        sig = signature(note.content)
+        if sig is None:
+            self._similar.discard(note.id)
+        else:
+            self._similar.add(note.id, sig)
+
+    def _unlink(self, title: str, note_id: int) -> None:
+        """
+        Remove one link from the backlinks, dropping titles nothing links to.
+
+        Args:
+            title (str): The case-folded title linked to.
+            note_id (int): The ID of the linking note.
+        """
+        linking = self._backlinks[title]
+        linking.discard(note_id)
+        if not linking:
+            del self._backlinks[title]
+
+    def _move_links(self, key: str, new_title: str) -> list[Note]:
+        """
+        Point the links to a renamed note at its new title.
+
+        Only the notes linking to the old title are touched, so a rename costs
+        O(links) instead of a scan of all notes. Call with the write lock held.
+
+        Args:
+            key (str): The `title_key` of the old title.
+            new_title (str): The new title.
+
+        Returns:
+            list[Note]: The notes whose content was rewritten.
+        """
+        linking = self._backlinks.pop(key, None)
+        if not linking:
+            return []
+        new_key = title_key(new_title)
+
+        def retitle(match: re.Match) -> str:
+            if title_key(match.group(1)) == key:
+                return f"[[{new_title.strip()}]]"
+            return match.group(0)
+
+        for note_id in linking:
+            note = self.data[note_id]
+            note.content = LINK.sub(retitle, note.content)
+            self._index_similar(note)
+            self._notify(note_id)
+            self._links[note_id].discard(key)
+            self._links[note_id].add(new_key)
+        self._backlinks.setdefault(new_key, set()).update(linking)
+        return [self.data[note_id] for note_id in linking]
+
+    def _reindex(self, note: Note) -> None:
+        """
+        Update the indexes after a note in this book changed.
+
+        Called by `Note._changed`; copies of notes (e.g. detached ones) are ignored.
+
+        Args:
+            note (Note): The note that changed.
+        """
+        with self._lock.write_lock():
+            if self.data.get(note.id) is note:
+                self._index_tags(note)
+                self._index_links(note)
+                self._index_similar(note)
+                self._version = next(_versions)
+                self._notify(note.id)
 
     @input_error
     def add_note(self, note: Note) -> None:
         """
         Add a note to the notes book.
 
+        A note with the same title (in any case) is replaced and its ID is kept.
+
         Args:
             note (Note): The note to add.
 
         Raises:
             ValueError: If the note format is invalid.
         """
-        self.data[note.title.value] = note
+        with self._lock.write_lock():
+            key = title_key(note.title.value)
+            note_id = self._titles.get(key)
+            if note_id is None:
+                note_id = self._titles[key] = self._next_id
+                self._next_id += 1
+                self._order.add(key, note_id)
+            previous = self.data.get(note_id)
+            if previous is not None and previous is not note:
+                previous._owner = None
+            note.id = note_id
+            note._owner = self
+            self.data[note_id] = note
+            self._index_tags(note)
+            self._index_links(note)
+            self._index_similar(note)
+            self._version = next(_versions)
+            self._snapshot = None
+            self._notify(note_id)
+
+    def get(self, note_id: int) -> Note | None:
+        """
+        Find a note by its ID.
+
+        Args:
+            note_id (int): The ID of the note.
+
+        Returns:
+            Note or None: The note if found, None otherwise.
+        """
+        return self.data.get(note_id)
+
+    def prefix_range(self, prefix: str = "", within: range | None = None) -> range:
+        """
+        Find the positions of notes whose title starts with a prefix, ignoring case.
+
+        Positions refer to notes in alphabetical order and stay valid until
+        the book changes. Pass the range found for a shorter prefix as `within`
+        to narrow it as the user types.
+
+        Args:
+            prefix (str, optional): The start of the title. Defaults to "", all notes.
+            within (range, optional): Only search these positions.
+
+        Returns:
+            range: The matching positions, possibly empty.
+        """
+        with self._lock.read_lock():
+            return self._order.prefix_range(prefix.casefold(), within)
+
+    def at(self, position: int) -> Note | None:
+        """
+        Get the note at a position in alphabetical order.
+
+        Args:
+            position (int): Zero-based position, e.g. from `prefix_range()`.
+
+        Returns:
+            Note or None: The note, or None if the position is out of range.
+        """
+        with self._lock.read_lock():
+            if 0 <= position < len(self._order):
+                return self.data[self._order[position]]
+        return None
+
+    def tag_prefix_range(self, prefix: str = "", within: range | None = None) -> range:
+        """
+        Find the positions of the distinct tags that start with a prefix, ignoring case.
+
+        Works like `prefix_range`, over the tags of all notes in alphabetical order.
+
+        Args:
+            prefix (str, optional): The start of the tag, e.g. "#wo". Defaults
+                                    to "", all tags.
+            within (range, optional): Only search these positions.
+
+        Returns:
+            range: The matching positions, possibly empty.
+        """
+        with self._lock.read_lock():
+            return self._tag_order.prefix_range(prefix.casefold(), within)
+
+    def tag_at(self, position: int) -> str | None:
+        """
+        Get the tag at a position in alphabetical order.
+
+        Args:
+            position (int): Zero-based position, e.g. from `tag_prefix_range()`.
+
+        Returns:
+            str or None: The case-folded tag, or None if the position is out of range.
+        """
+        with self._lock.read_lock():
+            if 0 <= position < len(self._tag_order):
+                return self._tag_order.key_at(position)
+        return None
+
+    def order_version(self) -> int:
+        """
+        Get the version of the alphabetical title order.
+
+        Positions from `prefix_range()` stay valid while it doesn't change.
+
+        Returns:
+            int: The version.
+        """
+        return self._order.version
+
+    def tag_order_version(self) -> int:
+        """
+        Get the version of the alphabetical tag order.
+
+        Positions from `tag_prefix_range()` stay valid while it doesn't change.
+
+        Returns:
+            int: The version.
+        """
+        return self._tag_order.version
+
+    def version(self) -> int:
+        """
+        Get the version of the notes.
+
+        It changes whenever a note is added, deleted, renamed or edited.
+
+        Returns:
+            int: The version.
+        """
+        return self._version
+
+    def backlinks(self, note: Note) -> list:
+        """
+        Get the notes that link to a note with [[Note Title]].
+
+        Args:
+            note (Note): The note linked to.
+
+        Returns:
+            list: The linking notes, in alphabetical order of their titles.
+        """
+        with self._lock.read_lock():
+            linking = self._backlinks.get(title_key(note.title.value), ())
+            found = [self.data[note_id] for note_id in linking if note_id != note.id]
+        return sorted(found, key=lambda other: other.title.value.casefold())
+
+    def related(self, note: Note, limit: int) -> list[tuple[Note, float]]:
+        """
+        Find the notes whose content is most similar to a note's content.
+
+        Only the notes sharing an LSH bucket with it are compared, so the cost
+        depends on the number of similar notes, not on the size of the book.
+
+        Args:
+            note (Note): The note.
+            limit (int): The maximum number of notes returned.
+
+        Returns:
+            list[tuple[Note, float]]: The notes with their estimated Jaccard
+                                      similarity, most similar first.
+        """
+        with self._lock.read_lock():
+            return [
+                (self.data[note_id], score)
+                for note_id, score in self._similar.similar(note.id, limit)
+            ]
+
+    @input_error
+    def rename_note(
+        self, title: str, new_title: str, update_links: bool = False
+    ) -> list[Note]:
+        """
+        Change the title of a note. The ID stays the same.
+
+        [[Old Title]] links in other notes are left alone unless `update_links`
+        is set: then they are rewritten to the new title, so they keep pointing
+        to the note. `backlinks()` lists the notes that would be rewritten.
+
+        Args:
+            title (str): The current title of the note.
+            new_title (str): The new title.
+            update_links (bool, optional): Rewrite the links to the note.
+                                           Defaults to False.
+
+        Returns:
+            list[Note]: The notes whose links were rewritten, in alphabetical
+                        order of their titles; empty unless `update_links`.
 
+        Raises:
+            ValueError: If the note is not found, the new title is too long or
+                        another note already has it.
+        """
+        with self._lock.write_lock():
+            note = self.data.get(self._titles.get(title_key(title)))
+            if note is None:
+                raise ValueError(f"Note {title} is not found")
+            key, new_key = title_key(note.title.value), title_key(new_title)
+            if new_key != key and new_key in self._titles:
+                raise ValueError(f"Note {new_title} already exists")
+            if len(new_title) > 1000:
+                raise ValueError("Title length should not exceed 1000 characters.")
+            note.edit_title(new_title)
+            del self._titles[key]
+            self._titles[new_key] = note.id
+            self._order.discard(key)
+            self._order.add(new_key, note.id)
+            rewritten = self._move_links(key, new_title) if update_links else []
+            self._version = next(_versions)
+            self._notify(note.id)
+        return sorted(rewritten, key=lambda other: other.title.value.casefold())
+
+    @timed("NotesBook.find_note")
     @input_error
     def find_note(self, title: str) -> Note | None:
         """
-        Find a note by title.
+        Find a note by title, ignoring case.
 
         Args:
             title (str): The title to search for.
@@ -316,9 +909,7 @@ class NotesBook:
         Raises:
             ValueError: If the title format is invalid.
         """
-        if title in self.data:
-            return self.data[title]
-        return None
+        return self.data.get(self._titles.get(title_key(title)))
 
     @input_error
     def delete_note(self, title: str) -> None:
@@ -331,48 +922,92 @@ class NotesBook:
         Raises:
             ValueError: If the note is not found.
         """
-        if title in self.data:
-            del self.data[title]
-        else:
-            raise ValueError(f"Record {title} is not found")
-
+        with self._lock.write_lock():
+            note_id = self._titles.pop(title_key(title), None)
+            if note_id is None:
+                raise ValueError(f"Record {title} is not found")
+            self._order.discard(title_key(title))
+            self._unindex_tags(note_id)
+            self._unindex_links(note_id)
+            self._similar.discard(note_id)
+            self.data.pop(note_id)._owner = None
+            self._version = next(_versions)
+            self._snapshot = None
+            self._notify(note_id)
+
+    @timed("NotesBook.search")
     @input_error
     def search(
-        self, query: str, by_title=False, by_tag=False, by_content=False
+        self,
+        query: str,
+        by_title=False,
+        by_tag=False,
+        by_content=False,
+        limit: int | None = None,
+        offset: int = 0,
+        sort_key=None,
+        regex=False,
     ) -> list:
         """
         Search for notes matching a query.
 
+        The notes are scanned lazily: with a `limit` and no `sort_key` the scan
+        stops once the page is full, and with a `sort_key` only the best
+        `offset + limit` notes are kept (see `take_page`). With `regex` the
+        query is a regular expression, matched ignoring case.
+
+        A regex search checks the literal text the pattern requires before
+        running it, only visits the matching range of the title index for a
+        title pattern with a literal start like "^Meeting", and runs in a
+        worker process that is stopped after REGEX_TIMEOUT seconds (see
+        `match_any`).
+
         Args:
             query (str): The search query.
             by_title (bool, optional): Search by title. Defaults to False.
             by_tag (bool, optional): Search by tag. Defaults to False.
             by_content (bool, optional): Search by content. Defaults to False.
+            limit (int, optional): Most notes to return. Defaults to None, all.
+            offset (int, optional): Matching notes to skip. Defaults to 0.
+            sort_key (function, optional): Orders the notes, e.g.
+                                           `lambda note: note.title.value`.
+                                           Defaults to None, oldest first.
+            regex (bool, optional): The query is a regular expression.
+                                    Defaults to False.
 
         Returns:
             list: List of matching notes.
 
         Raises:
-            ValueError: If the query format is invalid.
-        """
-        query = query.strip().lower()
-        results = []
+            ValueError: If the query format is invalid, or the pattern is invalid
+                        or too slow.
+        """
+        if regex:
+            pattern = compile_pattern(query.strip())
+            candidates = self.snapshot()
+            if by_title and not (by_tag or by_content) and pattern.prefix:
+                positions = self.prefix_range(pattern.prefix)
+                candidates = (self.at(position) for position in positions)
+
+            def texts_of(note: Note) -> list[str]:
+                texts = [note.title.value] if by_title else []
+                if by_tag:
+                    texts.extend(tag.value for tag in note.tags)
+                if by_content and note.content:
+                    texts.append(note.content)
+                return texts
+
+            matches = match_any(pattern, candidates, texts_of)
+            return take_page(matches, limit, offset, sort_key)
 
-        for key, note in self.data.items():
-            if by_title and query in key.strip().lower():
-                results.append(note)
-            elif by_tag and any(query in tag.value.lower() for tag in note.tags):
-                results.append(note)
-            elif by_content and note.content and query in note.content.lower():
-                results.append(note)
+        query = query.strip().lower()
 
-        return results
+        def matches_query(note: Note) -> bool:
+            return bool(
+                (by_title and query in note.title.value.strip().lower())
+                or (by_tag and any(query in tag.value.lower() for tag in note.tags))
+                or (by_content and note.content and query in note.content.lower())
+            )
 
-    def __str__(self) -> str:
-        """
-        Return string representation of the notes book.
-
-        Returns:
-            str: String representation of all notes in the book.
-        """
-        return "\n".join(str(note) for note in self.data)
+        matches = filter(matches_query, self.snapshot())
+        return take_page(matches, limit, offset, sort_key)
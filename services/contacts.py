@@ -1,5 +1,5 @@
-import csv
 from typing import Literal
+from functools import partial
 from pathlib import Path
 import datetime as dt
 from datetime import datetime as dtdt
@@ -9,24 +9,35 @@ from helpers.validators import (
     validate_email_str,
     validate_date_str,
 )
-from models.contact import Record
+from models.contact import Record, Name
 from helpers.helpers import save_contacts
-from rich.console import Console
+from services.shared import (
+    RELATED_LIMIT,
+    choose_export_format,
+    select_entry,
+    show_pages,
+    split_regex,
+    start_export,
+)
+from helpers.console import console
 from helpers.create_table import (
     show_contact_in_table,
     show_all_contacts_table,
     show_birthdays_table,
     show_options_for_query,
+    show_email_domains_table,
+    show_cities_table,
+    show_note_list_table,
 )
 from helpers.typing_effect import typing_output, typing_input
-from data.state import book
+from data.state import book, mentions
 
-console = Console()
+FUZZY_LIMIT = 10  # Closest names shown by a name search
 
 
 def no_record_message(name: str) -> None:
     """
-    Display a message when a contact is not found.
+    Display a message when a contact is not found, with the closest names.
 
     Args:
         name (str): Name of the contact that was not found.
@@ -35,6 +46,10 @@ def no_record_message(name: str) -> None:
         None
     """
     typing_output(f'Contact "{name}" not found.❗', color="yellow")
+    suggestions = book.find_similar(name, limit=3)
+    if suggestions:
+        names = ", ".join(record.name.value for record, _ in suggestions)
+        typing_output(f"Did you mean: {names}?", color="yellow")
     return
 
 
@@ -67,6 +82,7 @@ def add() -> Literal[1, 0]:
 
     This function interactively prompts the user for contact information and validates the input.
     If a contact with the provided name already exists, it updates that contact.
+    All details are staged in a transaction and saved with a single write at the end.
 
     Returns:
         int: 0 for success, 1 for failure
@@ -76,71 +92,64 @@ def add() -> Literal[1, 0]:
         console.print("Name is required to create a contact. ❗", style="red")
         return 1
 
-    record = book.find_by_name(name)
-    if not record:
-        record = Record(name)
-        book.add_record(record)
-        typing_output("New contact created.")
-    else:
-        typing_output("Contact already exists.")
-        typing_output("Updating details...")
+    with book.transaction(persist=save_contacts) as tx:
+        exists = book.find_by_name(Name(name).value) is not None
+        record = tx.record(name)
+        if not exists:
+            typing_output("New contact created.")
+        else:
+            typing_output("Contact already exists.")
+            typing_output("Updating details...")
 
-    # Loop for phone
-    while True:
-        phone = typing_input("Contact phone (press Enter to skip): (num) ").strip()
-        if not phone:
-            break
-        try:
-            if not validate_and_normalize_phone(phone):
-                raise Exception
-            record.add_phone(phone)
-            # typing_output(f"Phone {phone} added successfully. ✅", color="green")
-            break
-        except Exception as e:
-            console.print("Invalid phone ❗ ", style="red")
-            typing_output("Please try again. ", color="yellow")
+        # Loop for phone
+        while True:
+            phone = typing_input("Contact phone (press Enter to skip): (num) ").strip()
+            if not phone:
+                break
+            try:
+                record.add_phone(phone)
+                break
+            except ValueError:
+                console.print("Invalid phone ❗ ", style="red")
+                typing_output("Please try again. ", color="yellow")
 
-    # Loop for email
-    while True:
-        email = typing_input("Contact email (press Enter to skip): (str): ").strip()
-        if not email:
-            break
-        try:
-            record.add_email(email)
-            break
-        except Exception as e:
-            console.print("Invalid email ❗ ", style="red")
-            typing_output("Please try again. ", color="yellow")
+        # Loop for email
+        while True:
+            email = typing_input("Contact email (press Enter to skip): (str): ").strip()
+            if not email:
+                break
+            try:
+                record.add_email(email)
+                break
+            except ValueError:
+                console.print("Invalid email ❗ ", style="red")
+                typing_output("Please try again. ", color="yellow")
 
-    # Loop for birthday
-    while True:
-        birthday = typing_input(
-            "Contact birthday (dd.mm.yyyy, press Enter to skip): (str) "
-        ).strip()
-        if not birthday:
-            break
-        try:
-            record.add_birthday(birthday)
-            break
-        except Exception as e:
-            console.print("Invalid birthday format.❗ ", style="red")
-            typing_output("Please use the format dd.mm.yyyy. ", color="yellow")
+        # Loop for birthday
+        while True:
+            birthday = typing_input(
+                "Contact birthday (dd.mm.yyyy, press Enter to skip): (str) "
+            ).strip()
+            if not birthday:
+                break
+            try:
+                record.add_birthday(birthday)
+                break
+            except ValueError:
+                console.print("Invalid birthday format.❗ ", style="red")
+                typing_output("Please use the format dd.mm.yyyy. ", color="yellow")
 
-    # Loop for address
-    while True:
-        address = typing_input("Contact address (press Enter to skip): (str) ").strip()
-        if not address:
-            break
-        try:
+        # Loop for address
+        while True:
+            address = typing_input(
+                "Contact address (press Enter to skip): (str) "
+            ).strip()
+            if not address:
+                break
             record.add_address(address)
             break
-        except Exception as e:
-            console.print("Invalid address format.❗ ", style="red")
-            typing_output(f"Please use the format dd.mm.yyyy. ", color="yellow")
 
-    save_contacts(book)
-
-    typing_output(f'Contact "{name}" saved successfully. ✅', color="green")
+    typing_output(f'Contact "{record.name.value}" saved successfully. ✅', color="green")
     show_contact(record)  # show contact details in table
     return 0
 
@@ -151,8 +160,12 @@ def find() -> Literal[1, 0]:
     """
     Find contacts based on various search criteria.
 
-    Allows searching for contacts by name, phone, email, birthday, or address.
-    Displays search options and prompts the user for search parameters.
+    Allows searching for contacts by name, phone, email, birthday, address, or
+    by how the name sounds.
+    Displays search options and prompts the user for search parameters. The
+    name search tolerates typos and shows the closest names with their scores;
+    the other searches show the matches a page at a time. A query wrapped in
+    slashes, like /^admin@/, is a regular expression.
 
     Returns:
         int: 0 for success, 1 for failure or no results
@@ -176,9 +189,9 @@ def find() -> Literal[1, 0]:
             typing_output("You can enter any other command")
             return 1
 
-        if query not in ["1", "2", "3", "4", "5"]:
+        if query not in ["1", "2", "3", "4", "5", "6"]:
             typing_output(
-                "Invalid option. Please enter a number between 1 and 5. ❗",
+                "Invalid option. Please enter a number between 1 and 6. ❗",
                 color="yellow",
             )
             continue
@@ -188,16 +201,22 @@ def find() -> Literal[1, 0]:
     if query == "1":  # search by name
         args = typing_input("Enter the name of the contact: (str): ").strip().split()
     elif query == "2":
-        args = typing_input("Enter the phone number: (num): ").strip().split()
+        args = (
+            typing_input("Enter the last digits or the start (e.g. +38067*): (num): ")
+            .strip()
+            .split()
+        )
     elif query == "3":
-        args = typing_input("Enter the email address: (str): ").strip().split()
+        args = typing_input("Email, @domain or name@: (str): ").strip().split()
     elif query == "4":
         args = typing_input("Enter the birthday (dd.mm.yyyy): (str): ").strip().split()
     elif query == "5":
-        args = typing_input("Enter the address: (str): ").strip().split()
+        args = typing_input("Address words (street, city, code): (str): ").strip().split()
+    elif query == "6":
+        args = typing_input("Enter the name as it sounds: (str): ").strip().split()
     else:
         typing_output(
-            "Invalid option. Please enter a number between 1 and 5. ❗", color="yellow"
+            "Invalid option. Please enter a number between 1 and 6. ❗", color="yellow"
         )
         return 1
     if not args:
@@ -207,22 +226,38 @@ def find() -> Literal[1, 0]:
         return 1
 
     # Call the find method with the appropriate arguments
-    if query == "1":  # search by name
-        result = book.find(" ".join(args), by_name=True)
+    text, regex = split_regex(" ".join(args))
+    scores = {}
+    fetch = None  # Searches by a field are shown a page at a time
+    if query in ("1", "6") and regex:  # a pattern is matched against the names
+        fetch = partial(book.find, text, by_name=True, regex=True)
+    elif query == "1":  # search by name, tolerating typos
+        matches = book.find_similar(" ".join(args), limit=FUZZY_LIMIT)
+        result = [record for record, _ in matches]
+        scores = {record.name.value: score for record, score in matches}
     elif query == "2":  # search by phone
-        result = book.find(" ".join(args), by_phone=True)
+        fetch = partial(book.find, text, by_phone=True, regex=regex)
     elif query == "3":  # search by email
-        result = book.find(" ".join(args), by_email=True)
+        fetch = partial(book.find, text, by_email=True, regex=regex)
     elif query == "4":  # search by birthday
-        result = book.find(" ".join(args), by_birthday=True)
+        fetch = partial(book.find, text, by_birthday=True, regex=regex)
     elif query == "5":
-        result = book.find(" ".join(args), by_address=True)
+        fetch = partial(book.find, text, by_address=True, regex=regex)
+    elif query == "6":  # search by how the name sounds
+        result = book.find_sounds_like(" ".join(args))
     else:
         typing_output(
-            "Invalid option. Please enter a number between 1 and 5. ❗", color="yellow"
+            "Invalid option. Please enter a number between 1 and 6. ❗", color="yellow"
         )
         return 1
 
+    if fetch:
+        if not show_pages(fetch, show_all_contacts_table):
+            typing_output("No record found. ❗", color="yellow")
+            return 1
+        print("")
+        return 0
+
     if not result:
         typing_output("No record found. ❗", color="yellow")
         return 1
@@ -231,6 +266,8 @@ def find() -> Literal[1, 0]:
     print("")
     typing_output("Contact found:")
     show_all_contacts_table(result)  # show contacts details in table
+    for name, score in scores.items():
+        typing_output(f"{name}: {score:.0f}% match", color="sea_green3")
     print("")
     return 0
 
@@ -249,7 +286,7 @@ def all() -> Literal[1, 0]:
         return 1
 
     print("")
-    records = book.data.values()
+    records = book.snapshot()
     show_all_contacts_table(records)
     print("")
 
@@ -649,38 +686,6 @@ def all_birthdays() -> Literal[1, 0] | None:
     return 0
 
 
-# UPDATE BIRTHDAY
-@check_arguments(2)
-@input_error
-def update_birthday(*args: tuple) -> Literal[1, 0]:
-    """
-    Update the birthday for an existing contact.
-
-    Args:
-        *args (tuple): Variable length argument list containing the name of the contact
-                    and the new birthday (in dd.mm.yyyy format).
-
-    Returns:
-        int: 0 for success, 1 for failure
-    """
-    *name_parts, new_birthday = args
-    name = " ".join(name_parts)
-
-    record = book.find_by_name(name)
-
-    if not record:
-        no_record_message(name)
-        typing_output("Cannot update birthday. ⛔", color="yellow")
-        return 1
-
-    record.add_birthday(new_birthday)
-    save_contacts(book)
-
-    typing_output(f"Birthday updated for {name} ✅")
-    typing_output(f"New birthday 🍰: {record.birthday.value}")
-    return 0
-
-
 # =================
 # === ADDRESS ===
 # =================
@@ -718,38 +723,6 @@ def add_address(*args: tuple) -> Literal[1, 0]:
     return 0
 
 
-# UPDATE ADDRESS
-@check_arguments(2)
-@input_error
-def update_address(*args: tuple) -> Literal[1, 0]:
-    """
-    Update the address for an existing contact.
-
-    Args:
-        *args (tuple): Variable length argument list containing the name of the contact
-                    and the new address.
-
-    Returns:
-        int: 0 for success, 1 for failure
-    """
-    *name_parts, new_address = args
-    name = " ".join(name_parts)
-
-    record = book.find_by_name(name)
-
-    if not record:
-        no_record_message(name)
-        typing_output("Cannot update address. ⛔", color="yellow")
-        return 1
-
-    record.add_address(new_address)
-    save_contacts(book)
-
-    typing_output(f"Address updated for {name} ✅")
-    typing_output(f"New Address: {record.address.value}")
-    return 0
-
-
 def delete_address(*args: tuple) -> Literal[1, 0]:
     """
     Delete an address from a specified contact.
@@ -781,21 +754,26 @@ def delete_address(*args: tuple) -> Literal[1, 0]:
 # ================
 
 
-# EXPORT TO CSV
+# EXPORT
 @input_error
 def export_contacts_to_csv() -> None:
     """
-    Export all contacts to a CSV file.
+    Export all contacts to a CSV or JSON Lines file, optionally gzip-compressed.
 
-    Prompts the user for the directory path to save the CSV file and creates
-    a file with the current date in the filename. Uses a default path if the
-    user doesn't specify one.
+    Prompts the user for the directory path and the format, and creates a file
+    with the current date in the filename. Uses a default path if the user
+    doesn't specify one. The export runs in the background on a snapshot of
+    the address book, so the prompt comes back immediately.
 
     Returns:
         None
     """
+    fmt = choose_export_format()
+    if not fmt:
+        return
+
     today = dtdt.now().strftime("%d.%m.%Y")
-    filename = f"contacts_{today}.csv"
+    filename = f"contacts_{today}.{fmt}"
 
     STORAGE_DIR = Path(__file__).parent.parent / "storage"
     STORAGE_DIR.mkdir(parents=True, exist_ok=True)
@@ -803,7 +781,7 @@ def export_contacts_to_csv() -> None:
     default_path = STORAGE_DIR / filename
 
     dir_path = typing_input(
-        f"Enter the path to save the CSV file (press Enter for default save) 🗄️: "
+        f"Enter the path to save the file (press Enter for default save) 🗄️: "
     ).strip()
     if dir_path:
         filepath = Path(dir_path) / filename
@@ -830,60 +808,172 @@ def export_contacts_to_csv() -> None:
             typing_output("Aborting export. ⛔", color="red")
             return
 
-    # Check if the file is writable (optional, we just try opening it for writing)
-    try:
-        with filepath.open("w", newline="", encoding="utf-8") as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow(["Name", "Phones", "Emails", "Birthday", "Address"])
-            for record in book.data.values():
-                writer.writerow(
-                    [
-                        record.name.value,
-                        ", ".join(p.value for p in record.phones),
-                        ", ".join(e.value for e in record.emails),
-                        record.birthday.value if record.birthday else "",
-                        record.address.value if record.address else "",
-                    ]
-                )
-        typing_output(f"Contacts saved to: {filepath} 💾")
+    # Write errors are reported when the background export finishes
+    start_export(book.snapshot(), filepath, "contacts", fmt)
 
-    except (OSError, IOError) as e:
-        console.print(f"Error writing to file: {e} 🚨 ", style="red")
 
+# ================
+# === IMPORT ===
+# ================
 
+
+# IMPORT FROM CSV
 @input_error
-def edit_contact() -> None:
+def import_contacts_from_csv() -> None:
     """
-    Edit details of an existing contact.
+    Import contacts from a CSV file in the export format.
 
-    Displays all contacts, prompts the user to select one, and then allows
-    editing of different contact fields (email, phone, birthday, address).
+    Rows are validated in parallel and merged into the address book: new
+    contacts are added, existing ones get the new phones and emails. Invalid
+    rows are written to a "<file>_rejected.csv" file next to the source, and
+    the address book is saved once at the end. If the import fails, the
+    address book is left as it was.
 
     Returns:
         None
     """
-    all()  # enumerate?
-    name = (
-        typing_input("For whom do you want to change info? (name): ").title().strip()
-    )  # all names starts with Upper?
-    record = book.find_by_name(name)
-    if not record:
-        typing_output(f"Contact {name} not found. ❗", color="yellow")
+    # Deferred: the process pool machinery is only needed for imports
+    from helpers.bulk_import import import_contacts_csv
+
+    file_path = typing_input("Enter the path to the CSV file to import 📥: ").strip()
+    filepath = Path(file_path)
+    if not filepath.is_file():
+        typing_output(f"Error: The file '{filepath}' does not exist. 🚨", color="red")
         return
 
-    what_change = (
-        typing_input(
-            "What info do you want to change? (email, phone, birthday, address): "
+    reject_path = filepath.with_name(f"{filepath.stem}_rejected.csv")
+    typing_output("Importing... Please wait... ⏳")
+    try:
+        result = import_contacts_csv(book, filepath, reject_path, persist=save_contacts)
+    except (OSError, IOError) as e:
+        console.print(f"Error reading the file: {e} 🚨 ", style="red")
+        return
+
+    typing_output(
+        f"Imported {result['rows']} rows in {result['seconds']:.2f}s "
+        f"({result['rows_per_sec']:,.0f} rows/sec) ✅",
+        color="green",
+    )
+    typing_output(f"Added: {result['added']}, updated: {result['updated']}")
+    if result["rejected"]:
+        typing_output(
+            f"Rejected: {result['rejected']} rows, see {reject_path} ⚠️",
+            color="yellow",
         )
-        .lower()
-        .strip()
+
+
+def email_domains() -> None:
+    """
+    Display how many contacts have an email address at each domain.
+
+    Returns:
+        None
+    """
+    domains = book.email_domains()
+    print("")
+    show_email_domains_table(domains)
+    if domains:
+        typing_output(
+            'Use "find contact" with "@domain" to list the contacts of a domain.'
+        )
+    print("")
+
+
+def contacts_by_city() -> None:
+    """
+    Display the contacts grouped by the city of their address.
+
+    Returns:
+        None
+    """
+    print("")
+    show_cities_table(book.contacts_by_city())
+    print("")
+
+
+def dedupe_contacts() -> None:
+    """
+    Find contacts that are probably duplicates and offer to merge them.
+
+    Contacts are compared only with others that share a phone, an email local
+    part or a phonetic name code (see `helpers.dedupe`). For every cluster
+    found, the user picks the contact to keep; the others are merged into it
+    and deleted. The address book is saved once at the end.
+
+    Returns:
+        None
+    """
+    # Deferred: RapidFuzz is only needed for deduplication
+    from helpers.dedupe import find_duplicates
+
+    if not book.data:
+        typing_output("The contact book is empty ", color="yellow")
+        return
+
+    typing_output("Looking for duplicates... Please wait... ⏳")
+    clusters, stats = find_duplicates(book.snapshot())
+    typing_output(
+        f"Checked {stats['records']} contacts in {stats['seconds']:.2f}s "
+        f"({stats['comparisons']} comparisons in {stats['blocks']} blocks)"
+    )
+    if not clusters:
+        typing_output("No duplicates found ✅", color="green")
+        return
+    typing_output(
+        f"Found {len(clusters)} groups of possible duplicates", color="yellow"
     )
 
+    merged = 0
+    for number, cluster in enumerate(clusters, 1):
+        print("")
+        typing_output(f"Group {number} of {len(clusters)}:")
+        show_all_contacts_table(cluster)
+        for index, record in enumerate(cluster, 1):
+            typing_output(f"{index}. {record.name.value}")
+        choice = (
+            typing_input(
+                "Number of the contact to keep and merge the others into "
+                "(Enter to skip, q to stop): "
+            )
+            .strip()
+            .lower()
+        )
+        if choice == "q":
+            break
+        if not choice.isdigit() or not 1 <= int(choice) <= len(cluster):
+            typing_output("Group skipped", color="yellow")
+            continue
+        keep = cluster[int(choice) - 1]
+        others = [record.name.value for record in cluster if record is not keep]
+        record = book.merge_contacts(keep.name.value, others)
+        if record:
+            merged += len(others)
+            show_contact(record)
+
+    if merged:
+        save_contacts(book)
+        typing_output(f"Merged {merged} duplicate contacts ✅", color="green")
+
+
+def edit_record_field(record: Record, what_change: str) -> bool:
+    """
+    Interactively change one field (email, phone, birthday or address) of a record.
+
+    Meant to be called on a record staged in a transaction: invalid values raise
+    ValueError, which discards the whole transaction.
+
+    Args:
+        record (Record): The (staged) record to edit.
+        what_change (str): The field to change.
+
+    Returns:
+        bool: True if the field was changed, False if the edit was cancelled.
+    """
     if what_change == "email":
         emails = [email.value for email in record.emails]
         if not emails:
             typing_output("No email to edit for that contact. ❗", color="yellow")
-            return
+            return False
 
         for index, email in enumerate(emails, 1):
             typing_output(f"{index}. {email}")
@@ -894,7 +984,7 @@ def edit_contact() -> None:
             ).strip()
             if not email_index:
                 typing_output("Email edit cancelled.", color="yellow")
-                return
+                return False
 
             if email_index.isdigit() and 1 <= int(email_index) <= len(emails):
                 old_email = emails[int(email_index) - 1]
@@ -903,12 +993,12 @@ def edit_contact() -> None:
                 ).strip()
                 if not new_email:
                     typing_output("No changes were made to the email.", color="yellow")
-                    return
+                    return False
                 if not validate_email_str(new_email):
                     typing_output("Invalid email format.", color="red")
-                    return
-                change_email(name, old_email, new_email)
-                break
+                    return False
+                record.change_email(old_email, new_email)
+                return True
             else:
                 typing_output("Invalid index. Please try again.", color="yellow")
 
@@ -916,7 +1006,7 @@ def edit_contact() -> None:
         phones = [phone.value for phone in record.phones]
         if not phones:
             typing_output("No phone to edit for that contact. ❗", color="yellow")
-            return
+            return False
 
         for index, phone in enumerate(phones, 1):
             typing_output(f"{index}. {phone}")
@@ -927,7 +1017,7 @@ def edit_contact() -> None:
             ).strip()
             if not phone_index:
                 typing_output("Phone edit cancelled.", color="yellow")
-                return
+                return False
 
             if phone_index.isdigit() and 1 <= int(phone_index) <= len(phones):
                 old_phone = phones[int(phone_index) - 1]
@@ -936,7 +1026,7 @@ def edit_contact() -> None:
                 ).strip()
                 if not new_phone:
                     typing_output("No changes were made to the phone.", color="yellow")
-                    return
+                    return False
 
                 normalized_phone = validate_and_normalize_phone(new_phone)
                 if not normalized_phone:
@@ -944,10 +1034,10 @@ def edit_contact() -> None:
                         f"Invalid phone number: {new_phone}. Phone must be exactly 10 digits 🚨",
                         color="red",
                     )
-                    return
+                    return False
 
-                change_phone(name, old_phone, new_phone)
-                break
+                record.change_phone(old_phone, new_phone)
+                return True
             else:
                 typing_output("Invalid index. Please try again.", color="yellow")
 
@@ -958,19 +1048,16 @@ def edit_contact() -> None:
                 "This contact doesn't have a birthday set. Use 'expand contact' instead.",
                 color="yellow",
             )
-            return
+            return False
 
         new_birthday = typing_input(
             f"Enter new birthday (current: '{birthday}') or press Enter to cancel: "
         ).strip()
         if not new_birthday:
             typing_output("Birthday has not been changed.", color="yellow")
-            return
-        if not validate_date_str(new_birthday):
-            typing_output("Invalid birthday format.", color="red")
-            return
-        update_birthday(name, new_birthday)
-        show_contact(record)
+            return False
+        record.add_birthday(new_birthday)
+        return True
 
     elif what_change == "address":
         address = record.address
@@ -979,21 +1066,69 @@ def edit_contact() -> None:
                 "This contact doesn't have a address set. Use 'expand contact' instead.",
                 color="yellow",
             )
-            return
+            return False
 
         new_address = typing_input(
             f"Enter new address (current: '{address}') or press Enter to cancel: "
         ).strip()
         if not new_address:
             typing_output("Address has not been changed.", color="yellow")
-            return
-        update_address(name, new_address)
+            return False
+        record.add_address(new_address)
+        return True
+
+    typing_output(
+        f"Invalid option: {what_change}. Choose from: email, phone, birthday, address",
+        color="yellow",
+    )
+    return False
+
+
+@input_error
+def edit_contact() -> None:
+    """
+    Edit details of an existing contact.
+
+    Displays all contacts, prompts the user to select one, and then allows
+    editing of different contact fields (email, phone, birthday, address).
+    Several fields can be edited in one go; all edits are applied together
+    with a single save, and an invalid value discards them all.
+
+    Returns:
+        None
+    """
+    all()  # enumerate?
+    name = typing_input("For whom do you want to change info? (name): ").strip()
+    record = book.find_by_name(name)
+    if not record:
+        no_record_message(name)
+        return
+    name = record.name.value
+
+    changed = False
+    with book.transaction(persist=save_contacts) as tx:
+        record = tx.record(name)
+        while True:
+            what_change = (
+                typing_input(
+                    "What info do you want to change? (email, phone, birthday, address): "
+                )
+                .lower()
+                .strip()
+            )
+            changed = edit_record_field(record, what_change) or changed
+
+            more = (
+                typing_input("Do you want to change anything else? (y/n): ")
+                .lower()
+                .strip()
+            )
+            if more != "y":
+                break
+
+    if changed:
+        typing_output(f"Contact updated ✅")
         show_contact(record)
-    else:
-        typing_output(
-            f"Invalid option: {what_change}. Choose from: email, phone, birthday, address",
-            color="yellow",
-        )
 
 
 @input_error
@@ -1009,11 +1144,12 @@ def expand_contact() -> None:
         None
     """
     all()
-    name = typing_input("What contact do you want to expand? (name): ").title().strip()
+    name = typing_input("What contact do you want to expand? (name): ").strip()
     record = book.find_by_name(name)
     if not record:
-        typing_output(f"Contact {name} not found. ❗", color="yellow")
+        no_record_message(name)
         return
+    name = record.name.value
 
     what_add = (
         typing_input(
@@ -1123,11 +1259,12 @@ def delete_contact() -> None:
         None
     """
     all()
-    name = typing_input("What contact do you want to modify? (name): ").title().strip()
+    name = typing_input("What contact do you want to modify? (name): ").strip()
     record = book.find_by_name(name)
     if not record:
-        typing_output(f"Contact {name} not found. ❗", color="yellow")
+        no_record_message(name)
         return
+    name = record.name.value
 
     what_to_delete = (
         typing_input(
@@ -1147,7 +1284,7 @@ def delete_contact() -> None:
             book.delete(name)
             save_contacts(book)
             typing_output(f"Contact {name} has been deleted. ✅", color="green")
-            show_all_contacts_table(book.data.values())
+            show_all_contacts_table(book.snapshot())
         else:
             typing_output("Deletion cancelled.", color="yellow")
 
@@ -1266,9 +1403,10 @@ def display_contact() -> None:
     """
     Displays the details of a contact selected by the user.
 
-    Shows all available contacts and prompts the user to select one
-    by entering its index. If an invalid or empty selection is made,
-    the user is prompted again.
+    Lists the contacts in alphabetical order and prompts the user to select
+    one by number. Large books are narrowed by typing the first letters of
+    the name until the list is short enough to show. The notes that mention
+    the contact's name are listed below it.
 
     Returns:
         None
@@ -1277,31 +1415,11 @@ def display_contact() -> None:
         typing_output("The contact book is empty ", color="yellow")
         return
 
-    for index, name in enumerate(book.data.keys(), 1):
-        typing_output(f"{index}. {name}")
-    while True:
-        what_contact = typing_input(
-            "Enter number of contact you want to show (int): "
-        ).strip()
-        if not what_contact:
-            typing_output(f"You did not choose any contact", color="yellow")
-            try_again = (
-                typing_input("Would you like to try again? (y/n): ").lower().strip()
-            )
-            if try_again != "y":
-                console.print("Exiting contact selection.", style="red")
-                return
-        elif not what_contact.isdigit():  # Check if the input is not a number
-            typing_output("Invalid input! Please enter a valid number.", color="yellow")
-        else:
-            selected_index = int(what_contact) - 1
-            if 0 <= selected_index < len(book.data):
-                selected_name = list(book.data.keys())[selected_index]
-                show_contact(book.find_by_name(selected_name))
-                break
-            else:
-                typing_output(
-                    "Invalid contact number. Please select from the list",
-                    color="yellow",
-                )
-                return
+    record = select_entry(book, "contact", lambda record: record.name.value)
+    if record:
+        show_contact(record)
+        mentioning = mentions.notes_mentioning(record)
+        if mentioning:
+            heading = f"Notes mentioning {record.name.value} 📝"
+            show_note_list_table(heading, mentioning, RELATED_LIMIT)
+            print("")
@@ -1,21 +1,30 @@
-from data.state import notes
+from data.state import notes, mentions
 from decorators.decorators import input_error, check_arguments
 from models.note import Note
 from helpers.helpers import save_notes
+from services.shared import (
+    RELATED_LIMIT,
+    choose_export_format,
+    select_entry,
+    show_pages,
+    split_regex,
+    start_export,
+)
 from helpers.typing_effect import typing_output, typing_input
-from rich.console import Console
+from helpers.console import console
 from helpers.create_table import (
     show_notes_in_table,
     show_all_notes_table,
     show_options_for_query_notes,
+    show_mentioned_contacts_table,
+    show_note_list_table,
+    show_related_notes_table,
 )
 from pathlib import Path
 import datetime as dt
 from datetime import datetime as dtdt
-import csv
 from typing import Literal
-
-console = Console()
+from functools import partial
 
 
 def show_note(note) -> None:
@@ -72,7 +81,7 @@ def all() -> Literal[1, 0]:
         return 1
 
     print("")
-    all_notes = notes.data.values()
+    all_notes = notes.snapshot()
     show_all_notes_table(all_notes)
     print("")
 
@@ -141,10 +150,11 @@ def add() -> Literal[1, 0]:
 @input_error
 def change_note() -> bool:
     """
-    Edit an existing note's content or tags.
+    Edit an existing note's content, tags or title.
 
-    Displays all available notes and allows the user to select one for editing.
-    The user can choose to edit either the content or tags of the selected note.
+    Lets the user select a note by number (see `select_entry`) for editing.
+    The user can choose to edit the content, the tags or the title of the
+    selected note. Renaming a note also updates the [[Title]] links to it.
 
     Returns:
         bool: True if the note was successfully edited, False otherwise.
@@ -155,46 +165,21 @@ def change_note() -> bool:
             print("No notes found!")
             return False
 
-        # Display all notes with numbers for reference
+        # Let the user pick the note by number, narrowing long lists by title
         typing_output("\nAvailable notes:")
-        titles = list(notes.data.keys())
-        for i, title in enumerate(titles, 1):  # Enumerate note titles
-            typing_output(f"{i}. {title}")
-
-        # Prompt user to select a note by number
-        while True:
-            user_choice = typing_input(
-                "Enter the number of the note you want to edit (int): "
-            ).strip()
-            if not user_choice.isdigit():  # Check if input is a valid number
-                typing_output(
-                    "Invalid input! Please enter a valid number.", color="yellow"
-                )
-                continue
-
-            note_index = int(user_choice) - 1  # Convert to zero-based index
-            if 0 <= note_index < len(titles):
-                title = titles[note_index]  # Get the selected note title
-                break
-            else:
-                typing_output(
-                    "Invalid number! Please choose a number from the list.",
-                    color="yellow",
-                )
-                return False
-
-        # Find the selected note
-        note = notes.find_note(title)
+        note = select_entry(notes, "note", lambda note: note.title.value)
         if not note:
-            console.print(f"Note '{title}' not found! ", style="red")
             return False
+        title = note.title.value
 
         # Show current note details
         show_note(note)
 
         # Prompt user to choose what to edit
         edit_choice = (
-            typing_input("\nWhat do you want to edit? (content/tags): ").lower().strip()
+            typing_input("\nWhat do you want to edit? (content/tags/title): ")
+            .lower()
+            .strip()
         )
         if edit_choice == "content":
             # Handle content editing
@@ -335,8 +320,37 @@ def change_note() -> bool:
                 print("Invalid tag action!")
                 return False
 
+        elif edit_choice == "title":
+            new_title = typing_input("Enter new title: ").strip()
+            if not new_title:
+                console.print("Title update skipped!", style="red")
+                return False
+            update_links = False
+            linking = notes.backlinks(note)
+            if linking:
+                typing_output(
+                    "Linked from: " + ", ".join(other.title.value for other in linking)
+                )
+                answer = typing_input(
+                    f"Point the links in these {len(linking)} note(s) to the new "
+                    "title? (y/n): "
+                )
+                update_links = answer.lower().strip() == "y"
+            rewritten = notes.rename_note(title, new_title, update_links)
+            if rewritten is None:
+                return False  # the error was reported by rename_note
+            save_notes(notes)
+            show_note(note)
+            if rewritten:
+                typing_output(
+                    "Links updated in: "
+                    + ", ".join(other.title.value for other in rewritten)
+                    + " ✓",
+                    color="green",
+                )
+
         else:
-            print("Invalid choice! Please enter 'content' or 'tags'.")
+            print("Invalid choice! Please enter 'content', 'tags' or 'title'.")
             return False
 
         # Confirm the update
@@ -353,7 +367,7 @@ def delete_note() -> bool:
     """
     Delete a note, its content, or its tags.
 
-    Displays all available notes and allows the user to select one for deletion.
+    Lets the user select a note by number (see `select_entry`) for deletion.
     The user can choose to delete the entire note, only its content, or specific tags.
 
     Returns:
@@ -365,40 +379,12 @@ def delete_note() -> bool:
             console.print("No notes found!", style="red")
             return False
 
-        # Display all notes with numbers for reference
-        all()
+        # Let the user pick the note by number, narrowing long lists by title
         typing_output("\nAvailable notes:")
-        titles = list(notes.data.keys())
-        for i, title in enumerate(titles, 1):
-            typing_output(f"{i}. {title}")
-
-        # Prompt user to select a note by number
-        while True:
-            user_choice = typing_input(
-                "Enter the number of the note you want to delete (int): "
-            ).strip()
-            if not user_choice.isdigit():  # Check if input is numeric
-                typing_output(
-                    "Invalid input! Please enter a valid number.", color="yellow"
-                )
-                continue
-
-            note_index = int(user_choice) - 1  # Convert to zero-based index
-            if 0 <= note_index < len(titles):
-                title = titles[note_index]  # Retrieve the selected note title
-                break
-            else:
-                typing_output(
-                    "Invalid number! Please choose a number from the list.",
-                    color="yellow",
-                )
-                return False
-
-        # Find the selected note
-        note = notes.find_note(title)
+        note = select_entry(notes, "note", lambda note: note.title.value)
         if not note:
-            console.print(f"Note '{title}' not found!", style="red")
             return False
+        title = note.title.value
 
         # Prompt user to choose what to delete
         delete_choice = typing_input(
@@ -425,7 +411,7 @@ def delete_note() -> bool:
                 "Delete (all) tags or a (specific) tag? "
             ).strip()
             if tag_delete_mode == "all":
-                note.tags = []  # Clear all tags
+                note.clear_tags()
                 save_notes(notes)
                 show_note(note)
                 typing_output(
@@ -465,17 +451,22 @@ def delete_note() -> bool:
 @input_error
 def export_notes_to_csv() -> None:
     """
-    Export all notes to a CSV file.
+    Export all notes to a CSV or JSON Lines file, optionally gzip-compressed.
 
-    Prompts the user for a directory path to save the CSV file. If no path is provided,
-    saves the file to a default location in the 'storage' directory. The CSV file includes
-    columns for title, content, and tags of each note.
+    Prompts the user for a directory path and the format. If no path is provided,
+    saves the file to a default location in the 'storage' directory. The file includes
+    the title, content, and tags of each note. The export runs in the background on a
+    snapshot of the notes, so the prompt comes back immediately.
 
     Returns:
         None
     """
+    fmt = choose_export_format()
+    if not fmt:
+        return
+
     today = dtdt.now().strftime("%d.%m.%Y")
-    filename = f"notes_{today}.csv"
+    filename = f"notes_{today}.{fmt}"
 
     STORAGE_DIR = Path(__file__).parent.parent / "storage"
     STORAGE_DIR.mkdir(parents=True, exist_ok=True)
@@ -483,7 +474,7 @@ def export_notes_to_csv() -> None:
     default_path = STORAGE_DIR / filename
 
     dir_path = typing_input(
-        f"Enter the path to save the CSV file (press Enter for default save) 🗄️: "
+        f"Enter the path to save the file (press Enter for default save) 🗄️: "
     ).strip()
     if dir_path:
         filepath = Path(dir_path) / filename
@@ -510,23 +501,8 @@ def export_notes_to_csv() -> None:
             console.print("Aborting export. ⛔", style="red")
             return
 
-    # Check if the file is writable (optional, we just try opening it for writing)
-    try:
-        with filepath.open("w", newline="", encoding="utf-8") as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow(["Title", "Content", "Tags"])
-            for note in notes.data.values():
-                writer.writerow(
-                    [
-                        note.title,
-                        note.content if note.content else "",
-                        ", ".join(t.value for t in note.tags),
-                    ]
-                )
-        typing_output(f"Contacts saved to: {filepath} 💾")
-
-    except (OSError, IOError) as e:
-        console.print(f"Error writing to file: {e} 🚨 ", style="red")
+    # Write errors are reported when the background export finishes
+    start_export(notes.snapshot(), filepath, "notes", fmt)
 
 
 @input_error
@@ -535,7 +511,9 @@ def find() -> Literal[1, 0]:
     Search for notes by title, content, or tag.
 
     Displays options for searching notes and prompts the user to choose a search field
-    (title, content, or tag) and enter a search query. Displays all matching notes.
+    (title, content, or tag) and enter a search query. Displays the matching
+    notes a page at a time. A query wrapped in slashes, like /[A-Z]+-[0-9]+/, is
+    a regular expression.
 
     Returns:
         int: 0 for success, 1 for failure or if no notes were found.
@@ -586,26 +564,23 @@ def find() -> Literal[1, 0]:
         return 1
 
     # Call the find method with the appropriate arguments
+    text, regex = split_regex(" ".join(args))
     if query == "1":  # search by title
-        result = notes.search(" ".join(args), by_title=True)
+        fetch = partial(notes.search, text, by_title=True, regex=regex)
     elif query == "2":  # search by content
-        result = notes.search(" ".join(args), by_content=True)
+        fetch = partial(notes.search, text, by_content=True, regex=regex)
     elif query == "3":  # search by tag
-        result = notes.search(" ".join(args), by_tag=True)
+        fetch = partial(notes.search, text, by_tag=True, regex=regex)
     else:
         typing_output(
             "Invalid option. Please enter a number between 1 and 3. ❗", color="yellow"
         )
         return 1
 
-    if not result:
+    # Show the notes found a page at a time
+    if not show_pages(fetch, show_all_notes_table):
         typing_output("No note found. ❗", color="yellow")
         return 1
-    # If a note is found, show the contact details
-
-    print("")
-    typing_output("Note found:")
-    show_all_notes_table(result)  # show notes details in table
     print("")
     return 0
 
@@ -615,7 +590,11 @@ def display_note() -> None:
     """
     Display a specific note selected by the user.
 
-    Lists all available notes and allows the user to select one to display by number.
+    Lists the notes in alphabetical order and allows the user to select one to
+    display by number. Many notes are narrowed by typing the first letters of
+    the title until the list is short enough to show. The notes linking to
+    it with [[Title]], the notes with similar content and the contacts whose
+    names it mentions are listed below it.
 
     Returns:
         None
@@ -624,26 +603,18 @@ def display_note() -> None:
         typing_output("The contact book is empty ", color="yellow")
         return
 
-    for index, title in enumerate(notes.data.keys(), 1):
-        typing_output(f"{index}. {title}")
-    while True:
-        what_contact = typing_input("Enter number of contact you want to show (int): ")
-        if not what_contact:
-            typing_output(f"You did not chose any note", color="yellow")  # ??
-            try_again = typing_input("Would you like to try again? (y/n): ").strip()
-            if try_again != "y":
-                print("Exiting note selection.")
-                return
-        elif not what_contact.isdigit():  # Check if the input is not a number
-            typing_output("Invalid input! Please enter a valid number.", color="yellow")
-        else:
-            selected_index = int(what_contact) - 1
-            if 0 <= selected_index < len(notes.data):
-                selected_name = list(notes.data.keys())[selected_index]
-                show_note(notes.find_note(selected_name))
-                break
-            else:
-                typing_output(
-                    "Invalid note number. Please select from the list", color="yellow"
-                )
-                return
+    note = select_entry(notes, "note", lambda note: note.title.value)
+    if note:
+        show_note(note)
+        linking = notes.backlinks(note)
+        if linking:
+            show_note_list_table("Linked from 🔗", linking, RELATED_LIMIT)
+            print("")
+        related = notes.related(note, RELATED_LIMIT)
+        if related:
+            show_related_notes_table(related)
+            print("")
+        mentioned = mentions.contacts_mentioned_in(note)
+        if mentioned:
+            show_mentioned_contacts_table(mentioned, RELATED_LIMIT)
+            print("")
@@ -1,13 +1,20 @@
-from helpers.typing_effect import typing_output
-from helpers.helpers import save_contacts
-from rich.console import Console
+from helpers.typing_effect import typing_output, typing_input
+from helpers.persistence import flush
+from helpers.console import console
 from rich.table import Table
 from rich import box
-from data.state import book
 import time
-from helpers.matrix_effect import matrix_drop
+from helpers.metrics import get_stats
+from helpers.create_table import show_stats_table, show_search_results_table
+from helpers.global_search import search_all, rank
+from helpers.paging import PAGE_SIZE
+from data.state import book, notes
+from helpers.export import FORMATS, ExportJob, export_jobs
 
-console = Console()  # Initialize Console for rich output
+MENU_SIZE = 15  # Most entries a selection menu lists at once
+STREAM_LIMIT = 5  # First hits printed while the slower fields are still searched
+SEARCH_LIMIT = 20  # Hits of each type shown in the ranked results
+RELATED_LIMIT = 10  # Mentions, links or related notes shown with a contact or note
 
 
 # GREETING
@@ -16,7 +23,8 @@ def greeting() -> None:
     Display a welcome message to the user when starting the application.
 
     Provides an introduction to the Assistant Bot and informs new users
-    how to access the help command for available options.
+    how to access the help command for available options. The contacts and
+    notes load in the background while the greeting is shown.
 
     Returns:
         None
@@ -90,7 +98,11 @@ def show_help() -> None:
         "delete contact": "Delete existing contact",
         "expand contact": "Add info to existing contact",
         "show contact": "Show info for existing contact",
-        "export contacts": "Exports all contacts to a CSV file",
+        "export contacts": "Exports all contacts to CSV/JSONL (optionally gzip)",
+        "import contacts": "Imports contacts from a CSV file",
+        "dedupe contacts": "Finds duplicate contacts and merges them",
+        "email domains": "Shows how many contacts use each email domain",
+        "contacts by city": "Groups contacts by the city of their address",
     }
 
     for command, description in contact_commands.items():
@@ -119,7 +131,7 @@ def show_help() -> None:
         "find note": "To find some note with keyword",
         "change note": "Updates an existing note",
         "delete note": "Removes an existing note",
-        "export notes": "Exports all contacts to a CSV file",
+        "export notes": "Exports all notes to CSV/JSONL (optionally gzip)",
         "show note": "Shows a specific note",
     }
     for command, description in notes_commands.items():
@@ -143,6 +155,10 @@ def show_help() -> None:
     general_commands = {
         "hello": "Greets the user",
         "help": "Shows the list of available commands",
+        "search <text>": "Searches all contact and note fields at once",
+        "stats": "Shows p50/p95/p99 latency and call counts per operation",
+        "export status": "Shows the progress of background exports",
+        "profile <command>": "Runs a single command under cProfile",
         "close/exit/quit": "Closes the bot",
         "goodbye": "Closes the bot with some special effect",
     }
@@ -153,18 +169,263 @@ def show_help() -> None:
     console.print("\n")
 
 
+# STATS
+def stats() -> None:
+    """
+    Display latency statistics for commands, model methods, storage and rendering.
+
+    Returns:
+        None
+    """
+    print("")
+    show_stats_table(get_stats())
+    print("")
+
+
+# SEARCH
+def search(*args: str) -> None:
+    """
+    Search all fields of the contacts and notes for a text at once.
+
+    The fields are searched in parallel. The first hits are printed as soon as
+    the field that found them finishes, then all hits are shown in one table,
+    ranked and grouped into contacts and notes.
+
+    Args:
+        *args (str): The words to search for; asked for if not given.
+
+    Returns:
+        None
+    """
+    text = " ".join(args).strip() or typing_input("What are you looking for? ").strip()
+    if not text:
+        typing_output("No input provided❗", color="yellow")
+        return
+
+    print("")
+    results, streamed = [], set()
+    for result in search_all(text, book, notes):
+        results.append(result)
+        for item in result.items:
+            if len(streamed) == STREAM_LIMIT:
+                break
+            if (result.kind, item.id) not in streamed:
+                streamed.add((result.kind, item.id))
+                if result.kind == "contact":
+                    label = f"👤 {item.name.value}"
+                else:
+                    label = f"📝 {item.title.value}"
+                console.print(f"{label} [dim]({result.field})[/]")
+
+    ranked = rank(results, text)
+    if not any(ranked.values()):
+        typing_output(f"Nothing matches '{text}' ❗", color="yellow")
+        return
+    print("")
+    show_search_results_table(ranked, SEARCH_LIMIT)
+    print("")
+
+
+# PAGES
+def show_pages(fetch, show_table) -> int:
+    """
+    Show search results a page at a time, asking before each next page.
+
+    Every page asks `fetch` for one result more than it shows, only to learn
+    whether there is a next page, so a broad query shows its first page
+    without finding all of its matches.
+
+    Args:
+        fetch (function): Called with `limit` and `offset`, returns the results,
+                          e.g. a partial of `AddressBook.find`.
+        show_table (function): Displays a list of results.
+
+    Returns:
+        int: The number of results shown.
+    """
+    shown = 0
+    while True:
+        page = fetch(limit=PAGE_SIZE + 1, offset=shown)
+        if not isinstance(page, list) or not page:  # errors are already reported
+            return shown
+        print("")
+        show_table(page[:PAGE_SIZE])
+        shown += len(page[:PAGE_SIZE])
+        if len(page) <= PAGE_SIZE:
+            return shown
+        answer = typing_input(f"Shown {shown}. Show the next page? (y/n): ")
+        if answer.strip().lower() not in ("y", "yes"):
+            return shown
+
+
+def split_regex(query: str) -> tuple[str, bool]:
+    """
+    Tell a regular expression query, written between slashes, from plain text.
+
+    Args:
+        query (str): The query as typed, e.g. "/^admin@/" or "ivan".
+
+    Returns:
+        tuple[str, bool]: The pattern without the slashes and True, or the
+                          query unchanged and False.
+    """
+    if len(query) > 2 and query.startswith("/") and query.endswith("/"):
+        return query[1:-1], True
+    return query, False
+
+
+# SELECT
+def select_entry(book, noun: str, label):
+    """
+    Let the user pick a contact or note by number, typing to narrow the list.
+
+    At most MENU_SIZE entries are listed, in alphabetical order. While more
+    match, the user types the start of the name or title instead; a longer
+    prefix narrows the previous range with a binary search on the book's
+    sorted index, so the book is never scanned or printed in full.
+
+    Args:
+        book (AddressBook | NotesBook): The book to choose from.
+        noun (str): What is being chosen, e.g. "contact" or "note".
+        label (function): Returns the text to list for an entry.
+
+    Returns:
+        Record | Note | None: The chosen entry, or None if the user cancelled.
+    """
+    prefix = ""
+    matches = book.prefix_range()
+    while True:
+        listed = len(matches) <= MENU_SIZE
+        if listed:
+            for number, position in enumerate(matches, 1):
+                typing_output(f"{number}. {label(book.at(position))}")
+            question = f"Enter number of the {noun} (int) or its first letters: "
+        else:
+            typing_output(
+                f"{len(matches)} {noun}s match. Type the first letters to narrow "
+                "the list.",
+                color="yellow",
+            )
+            question = f"First letters of the {noun} (Enter to cancel): "
+
+        answer = typing_input(question).strip()
+        if not answer:
+            typing_output(f"You did not choose any {noun}", color="yellow")
+            return None
+        if listed and answer.isdigit():
+            if 1 <= int(answer) <= len(matches):
+                return book.at(matches[int(answer) - 1])
+            typing_output(
+                f"Invalid {noun} number. Please select from the list", color="yellow"
+            )
+            continue
+
+        # A longer version of the last prefix only needs to search its range
+        within = matches if answer.casefold().startswith(prefix.casefold()) else None
+        narrowed = book.prefix_range(answer, within)
+        if not narrowed:
+            typing_output(f"No {noun} starts with '{answer}' ❗", color="yellow")
+            continue
+        prefix, matches = answer, narrowed
+
+
+# EXPORT
+def choose_export_format() -> str | None:
+    """
+    Ask the user for the export file format.
+
+    Returns:
+        str | None: One of FORMATS ("csv" by default), or None if the answer
+                    is not a supported format.
+    """
+    fmt = (
+        typing_input(f"Choose the format ({', '.join(FORMATS)}, Enter for csv) 🗂️: ")
+        .strip()
+        .lower()
+    )
+    if not fmt:
+        return "csv"
+    if fmt not in FORMATS:
+        typing_output(f"Unsupported format: {fmt} ❗", color="yellow")
+        return None
+    return fmt
+
+
+def report_export(job: ExportJob) -> None:
+    """
+    Print the outcome of a finished background export.
+
+    Args:
+        job (ExportJob): The finished export job.
+    """
+    if job.error:
+        console.print(f"\nExport to {job.filepath} failed: {job.error} 🚨", style="red")
+    else:
+        console.print(
+            f"\nExport finished: {job.done} {job.kind} saved to {job.filepath} "
+            f"in {job.seconds:.2f}s 💾",
+            style="green",
+        )
+
+
+def start_export(items: tuple, filepath, kind: str, fmt: str) -> ExportJob:
+    """
+    Start exporting a snapshot in the background and return to the prompt.
+
+    Args:
+        items (tuple): The snapshot of contact records or notes to export.
+        filepath (Path): The path of the file to create.
+        kind (str): "contacts" or "notes".
+        fmt (str): One of FORMATS.
+
+    Returns:
+        ExportJob: The started job.
+    """
+    job = ExportJob(items, filepath, kind, fmt).start(on_finish=report_export)
+    typing_output(f"Exporting {job.total} {kind} to {filepath} in the background ⏳")
+    typing_output('Type "export status" to see the progress.')
+    return job
+
+
+def export_status() -> None:
+    """
+    Display the progress of the exports started in this session.
+
+    Returns:
+        None
+    """
+    jobs = export_jobs()
+    if not jobs:
+        typing_output("No exports have been started yet.", color="yellow")
+        return
+    print("")
+    for job in jobs:
+        if job.error:
+            status = f"[red]failed: {job.error}[/]"
+        elif job.finished.is_set():
+            status = f"[green]done in {job.seconds:.2f}s[/]"
+        else:
+            status = f"[yellow]{job.progress:.0%} ({job.done}/{job.total})[/]"
+        console.print(f"{job.kind} → {job.filepath}: {status}")
+    print("")
+
+
 # CLOSE
 def close() -> int:
     """
     Save all data and exit the application.
 
-    Saves all contact information to persistent storage and displays
+    Saves the contacts and notes to persistent storage in parallel and displays
     a goodbye message to the user confirming that data has been saved.
 
     Returns:
-        int: 0 as a success code to indicate clean exit
+        int: 0 as a success code to indicate clean exit, 1 if saving failed
     """
-    save_contacts(book)
+    try:
+        flush(force=True)
+    except Exception as e:
+        console.print(f"Error saving data: {e} 🚨", style="red")
+        return 1
     typing_output("Goodbye 🐇")
     typing_output("All data saved! 💾")
     return 0
@@ -181,6 +442,8 @@ def goodbye() -> None:
     Returns:
         None
     """
+    from helpers.matrix_effect import matrix_drop  # deferred: pulls in colorama
+
     typing_output("Goodbye, Neo...  ")
     close()
     time.sleep(2)
@@ -0,0 +1,53 @@
+from models.contact import AddressBook, Record
+
+
+def make_book() -> AddressBook:
+    book = AddressBook()
+    for name, phone, email in (
+        ("Ivan Petrenko", "0506712345", "ivan@example.com"),
+        ("Olena Koval", "0671234567", "olena@gmail.com"),
+    ):
+        record = Record(name)
+        record.add_phone(phone)
+        record.add_email(email)
+        book.add_record(record)
+    return book
+
+
+def names(records) -> list[str]:
+    return [record.name.value for record in records]
+
+
+def test_phone_suffix_and_prefix():
+    book = make_book()
+    assert names(book.find_by_phone("4567")) == ["Olena Koval"]
+    assert names(book.find_by_phone("067*")) == ["Olena Koval"]
+
+
+def test_phone_returns_every_mode_edges_first():
+    book = make_book()
+    # +380671234567 starts with them, +380506712345 only contains them
+    assert names(book.find_by_phone("067")) == ["Olena Koval", "Ivan Petrenko"]
+    assert names(book.find_by_phone("2345")) == ["Ivan Petrenko", "Olena Koval"]
+
+
+def test_phone_middle_digits_fall_back_to_substring():
+    book = make_book()
+    assert names(book.find_by_phone("5067123")) == ["Ivan Petrenko"]
+    assert names(book.find_by_phone("671234")) == ["Ivan Petrenko", "Olena Koval"]
+    assert book.find_by_phone("999999") == []
+
+
+def test_email_index_lookups():
+    book = make_book()
+    assert names(book.find_by_email("@gmail.com")) == ["Olena Koval"]
+    assert names(book.find_by_email("ivan@")) == ["Ivan Petrenko"]
+    assert names(book.find_by_email("IVAN@example.com")) == ["Ivan Petrenko"]
+
+
+def test_partial_email_with_at_falls_back_to_substring():
+    book = make_book()
+    assert names(book.find_by_email("ivan@exa")) == ["Ivan Petrenko"]
+    assert names(book.find_by_email("@gmail")) == ["Olena Koval"]
+    assert names(book.find_by_email("@exam")) == ["Ivan Petrenko"]
+    assert book.find_by_email("@nowhere") == []
@@ -0,0 +1,71 @@
+from helpers.mentions import MentionIndex
+from models.contact import AddressBook, Record
+from models.note import Note, NotesBook
+
+
+def make_books():
+    book = AddressBook()
+    for name in ("Ivan Petrenko", "Olena Koval"):
+        book.add_record(Record(name))
+    notes = NotesBook()
+    for title, content in (
+        ("Call", "Call Ivan Petrenko about the lease"),
+        ("Lunch", "Lunch with Olena Koval and Taras Shevchuk"),
+        ("Shopping", "Milk, bread"),
+    ):
+        note = Note(title)
+        note.edit_content(content)
+        notes.add_note(note)
+    return book, notes
+
+
+def titles(found) -> list[str]:
+    return [note.title.value for note in found]
+
+
+def test_follows_contact_and_note_changes():
+    book, notes = make_books()
+    mentions = MentionIndex(book, notes)
+    ivan = book.find_by_name("Ivan Petrenko")
+    assert titles(mentions.notes_mentioning(ivan)) == ["Call"]
+
+    taras = book.rename("Ivan Petrenko", "Taras Shevchuk")
+    assert titles(mentions.notes_mentioning(taras)) == ["Lunch"]
+
+    notes.find_note("Shopping").edit_content("Ask Taras Shevchuk for milk")
+    assert titles(mentions.notes_mentioning(taras)) == ["Lunch", "Shopping"]
+
+    notes.delete_note("Lunch")
+    book.delete("Olena Koval")
+    assert titles(mentions.notes_mentioning(taras)) == ["Shopping"]
+
+
+def test_a_new_name_rescans_only_notes_with_its_first_word(monkeypatch):
+    book, notes = make_books()
+    mentions = MentionIndex(book, notes)
+    mentions.notes_mentioning(book.find_by_name("Olena Koval"))
+
+    scanned = []
+    scan = mentions._scan
+
+    def counting_scan(note):
+        scanned.append(note.title.value)
+        scan(note)
+
+    monkeypatch.setattr(mentions, "_scan", counting_scan)
+    book.add_record(Record("Taras Shevchuk"))
+    taras = book.find_by_name("Taras Shevchuk")
+    assert titles(mentions.notes_mentioning(taras)) == ["Lunch"]
+    assert scanned == ["Lunch"]
+
+
+def test_books_filled_in_place_are_reported():
+    book, notes = AddressBook(), NotesBook()
+    mentions = MentionIndex(book, notes)
+    assert mentions.notes_mentioning(Record("Ivan Petrenko")) == []
+
+    loaded_book, loaded_notes = make_books()
+    book.__setstate__(loaded_book.__getstate__())
+    notes.__setstate__(loaded_notes.__getstate__())
+    ivan = book.find_by_name("Ivan Petrenko")
+    assert titles(mentions.notes_mentioning(ivan)) == ["Call"]
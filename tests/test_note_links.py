@@ -0,0 +1,30 @@
+from models.note import Note, NotesBook
+
+
+def make_notes() -> NotesBook:
+    notes = NotesBook()
+    for title, content in (
+        ("Budget", "Numbers"),
+        ("Plan", "See [[ budget ]] first"),
+        ("Ideas", "Nothing linked"),
+    ):
+        note = Note(title)
+        note.edit_content(content)
+        notes.add_note(note)
+    return notes
+
+
+def test_rename_leaves_links_alone_by_default():
+    notes = make_notes()
+    assert notes.rename_note("Budget", "Costs") == []
+    assert notes.find_note("Plan").content == "See [[ budget ]] first"
+    assert notes.backlinks(notes.find_note("Costs")) == []
+
+
+def test_rename_with_update_links_reports_the_rewritten_notes():
+    notes = make_notes()
+    plan = notes.find_note("Plan")
+    assert notes.backlinks(notes.find_note("Budget")) == [plan]
+    assert notes.rename_note("Budget", "Costs", update_links=True) == [plan]
+    assert plan.content == "See [[Costs]] first"
+    assert notes.backlinks(notes.find_note(" costs ")) == [plan]
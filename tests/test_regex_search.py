@@ -0,0 +1,66 @@
+import time
+
+import pytest
+
+from helpers.regex_search import compile_pattern, match_any
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    ["(a|aa)+$", "(a+)+$", "(?:x|xy)*z", "(a*)*b", ".*a.*a.*a.*a.*b"],
+)
+def test_rejects_patterns_that_backtrack_badly(pattern):
+    with pytest.raises(ValueError):
+        compile_pattern(pattern)
+
+
+def test_alternation_pattern_does_not_hang():
+    start = time.monotonic()
+    with pytest.raises(ValueError):
+        compile_pattern("(a|aa)+$")
+    assert time.monotonic() - start < 1
+
+
+@pytest.mark.parametrize(
+    "pattern", ["^admin@", "[A-Z]+-[0-9]+", "(a|aa)++$", "ab|cd", r"\x41{2}"]
+)
+def test_accepts_safe_patterns(pattern):
+    compile_pattern(pattern)
+
+
+def test_literal_prefix_and_prefilter():
+    query = compile_pattern("^Admin@ex")
+    assert query.prefix == "Admin@ex"
+    assert query.literals == ("admin@ex",)
+    assert query.may_match("admin@example.com")
+    assert not query.may_match("root@example.com")
+
+
+@pytest.mark.parametrize(
+    "pattern, literals",
+    [
+        (r"[A-Z]+-\d+", ("-",)),
+        (r"ab?c\.d", ("a", "c.d")),
+        ("a|b", ()),
+        (r"\x41b", ("ab",)),
+    ],
+)
+def test_literals(pattern, literals):
+    assert compile_pattern(pattern).literals == literals
+
+
+def test_match_any_returns_matching_items_in_order():
+    items = ["admin@example.com", "root@example.com", None, "ADMIN@test.org"]
+    query = compile_pattern("^admin@")
+    assert match_any(query, items, lambda text: [text]) == [
+        "admin@example.com",
+        "ADMIN@test.org",
+    ]
+
+
+def test_one_long_record_trips_the_time_limit():
+    query = compile_pattern(".*a.*a.*b")
+    start = time.monotonic()
+    with pytest.raises(ValueError, match="longer than"):
+        match_any(query, ["b" + "a" * 5000], lambda text: [text], seconds=0.5)
+    assert time.monotonic() - start < 3
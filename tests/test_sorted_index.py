@@ -0,0 +1,41 @@
+import random
+
+from helpers import sorted_index
+from helpers.sorted_index import SortedIndex
+
+
+def test_matches_a_sorted_dict_across_chunk_splits(monkeypatch):
+    monkeypatch.setattr(sorted_index, "CHUNK_SIZE", 4)
+    rng = random.Random(7)
+    words = [f"{rng.choice('abc')}{rng.randrange(100):02d}" for _ in range(300)]
+    expected = {word: n for n, word in enumerate(words[:50])}
+    index = SortedIndex(expected.items())
+    for n, word in enumerate(words[50:], 50):
+        if rng.random() < 0.4:
+            index.discard(word)
+            expected.pop(word, None)
+        else:
+            index.add(word, n)
+            expected[word] = n
+
+        keys = sorted(expected)
+        assert len(index) == len(keys)
+        assert index.keys == keys
+        assert [index[i] for i in range(len(keys))] == [expected[k] for k in keys]
+        assert index.get(word) == expected.get(word)
+        found = index.prefix_range("b")
+        assert [index.key_at(i) for i in found] == [k for k in keys if k[0] == "b"]
+        narrowed = index.prefix_range("b1", found)
+        assert [index.key_at(i) for i in narrowed] == [
+            k for k in keys if k.startswith("b1")
+        ]
+
+
+def test_version_changes_only_when_keys_do():
+    index = SortedIndex([("ivan", 1)])
+    version = index.version
+    index.add("ivan", 2)
+    assert index.version == version and index[0] == 2
+    index.add("olena", 3)
+    assert index.version != version
+    assert index[-1] == 3
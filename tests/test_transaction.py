@@ -0,0 +1,121 @@
+import os
+import signal
+
+import pytest
+
+from helpers import persistence
+from models.contact import AddressBook, Name, Phone, Record, RecordExistsError
+
+
+def make_book() -> AddressBook:
+    book = AddressBook()
+    for name in ("Ivan Petrenko", "Olena Koval"):
+        book.add_record(Record(name))
+    return book
+
+
+def names(book: AddressBook) -> list[str]:
+    return sorted(record.name.value for record in book.snapshot())
+
+
+def test_renamed_copy_replaces_its_original():
+    book = make_book()
+    ivan_id = book.find_by_name("Ivan Petrenko").id
+    with book.transaction() as tx:
+        record = tx.record("Ivan Petrenko")
+        record.name = Name("Ivan Shevchenko")
+        record.add_phone("0506712345")
+
+    assert names(book) == ["Ivan Shevchenko", "Olena Koval"]
+    renamed = book.find_by_name("Ivan Shevchenko")
+    assert renamed.id == ivan_id
+    assert book.find_by_phone("0506712345") == [renamed]
+    assert book.find_by_name("Ivan Petrenko") is None
+
+
+def test_rename_onto_existing_name_is_rejected():
+    book = make_book()
+    try:
+        with book.transaction() as tx:
+            record = tx.record("Ivan Petrenko")
+            record.name = Name("Olena Koval")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("the rename should have been rejected")
+    assert names(book) == ["Ivan Petrenko", "Olena Koval"]
+
+
+def test_delete_standardizes_the_name():
+    book = make_book()
+    with book.transaction() as tx:
+        tx.delete("  ivan petrenko ")
+    assert names(book) == ["Olena Koval"]
+
+
+def test_rollback_restores_renamed_and_deleted_records():
+    book = make_book()
+
+    def fail(_):
+        raise OSError("disk full")
+
+    try:
+        with book.transaction(persist=fail) as tx:
+            record = tx.record("Ivan Petrenko")
+            record.name = Name("Ivan Shevchenko")
+            tx.delete("olena koval")
+            tx.record("Taras Bondar")
+    except OSError:
+        pass
+    assert names(book) == ["Ivan Petrenko", "Olena Koval"]
+
+
+def test_merge_is_applied_on_commit_only():
+    book = make_book()
+    incoming = Record("ivan petrenko")
+    incoming.add_phone("0671234567")
+    with book.transaction() as tx:
+        assert tx.merge(incoming) is False
+        assert tx.merge(Record("Taras Bondar")) is True
+        assert tx.merge(Record("Taras Bondar")) is False
+        assert names(book) == ["Ivan Petrenko", "Olena Koval"]
+
+    assert names(book) == ["Ivan Petrenko", "Olena Koval", "Taras Bondar"]
+    assert book.find_by_phone("0671234567") == [book.find_by_name("Ivan Petrenko")]
+
+
+def test_creating_a_contact_added_meanwhile_conflicts():
+    book = make_book()
+    with pytest.raises(RecordExistsError):
+        with book.transaction() as tx:
+            tx.record("Taras Bondar").add_phone("0671234567")
+            book.add_record(Record("Taras Bondar"))
+    assert book.find_by_name("Taras Bondar").phones == []
+
+
+def test_merged_copy_handed_out_by_record_is_validated_again():
+    book = make_book()
+    with pytest.raises(ValueError):
+        with book.transaction() as tx:
+            tx.merge(Record("Taras Bondar"))
+            tx.record("Taras Bondar").phones.append(Phone.from_valid("12"))
+    assert book.find_by_name("Taras Bondar") is None
+
+
+def test_sigterm_during_a_commit_interrupts_after_the_save():
+    book = make_book()
+    saved = []
+
+    def persist(book):
+        os.kill(os.getpid(), signal.SIGTERM)
+        saved.append(book.find_by_name("Taras Bondar") is not None)
+
+    previous = signal.signal(signal.SIGTERM, persistence._handle_signal)
+    try:
+        with pytest.raises(KeyboardInterrupt):
+            with book.transaction(persist=persist) as tx:
+                tx.record("Taras Bondar")
+    finally:
+        signal.signal(signal.SIGTERM, previous)
+    assert saved == [True]
+    assert book.find_by_name("Taras Bondar") is not None